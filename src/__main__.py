@@ -1,5 +1,66 @@
-from src import TerminalApplication
+from src						import TerminalApplication
+from src.training.distributed	import EvaluationWorker, load_key
 
+import sys
+from argparse	import ArgumentParser, Namespace
+from pathlib	import Path
 
-app = TerminalApplication()
-app.main()
\ No newline at end of file
+
+def parse_arguments(argv: list[str]) -> Namespace:
+	parser = ArgumentParser(prog="python -m src", description="Run the training sweep and generate its graphs.")
+	subparsers = parser.add_subparsers(dest="command")
+
+	run_parser = subparsers.add_parser("run", help="run the whole sweep on this machine (the default)")
+	shard_parser = subparsers.add_parser("shard", help="run one deterministic slice of the sweep's trainings")
+	merge_parser = subparsers.add_parser("merge", help="build performance.json and the graphs from saved_data")
+	worker_parser = subparsers.add_parser("worker", help="evaluate genomes for a training run with --evaluation-port")
+	for subparser in (run_parser, shard_parser, merge_parser):
+		subparser.add_argument("--params", default="saved_parameters/default_params.json", help="parameter file")
+		subparser.add_argument("--workers", type=int, default=1, help="number of tasks run in parallel")
+	for subparser in (run_parser, shard_parser):
+		subparser.add_argument("--no-resume", action="store_true", help="ignore the saved task state")
+		subparser.add_argument("--force", action="store_true", help="retrain runs whose results are up to date")
+		subparser.add_argument("--evaluation-port", type=int, help="farm genome evaluation out to remote workers on this port")
+		subparser.add_argument("--evaluation-host", default="127.0.0.1", help="address the evaluation server listens on")
+		subparser.add_argument(
+			"--evaluation-key", default="evaluation.key", help="key file shared with the workers, created if missing"
+		)
+		subparser.add_argument("--quiet", action="store_true", help="do not print per generation training summaries")
+	shard_parser.add_argument("--shard-index", type=int, required=True, help="index of this shard, from 0")
+	shard_parser.add_argument("--shard-count", type=int, required=True, help="total number of shards")
+	for subparser in (shard_parser, merge_parser):
+		subparser.add_argument("--training", action="append", help="only this training (repeatable)")
+		subparser.add_argument("--config", action="append", help="only this config (repeatable)")
+		subparser.add_argument("--eating-number", type=int, action="append", help="only this eating number (repeatable)")
+	worker_parser.add_argument("--host", required=True, help="address of the evaluation server")
+	worker_parser.add_argument("--port", type=int, required=True, help="port of the evaluation server")
+	worker_parser.add_argument("--name", help="name reported to the server, defaults to the host name")
+	worker_parser.add_argument("--key", default="evaluation.key", help="copy of the server's key file")
+	return parser.parse_args(argv)
+
+
+args = parse_arguments(sys.argv[1:])
+if args.command == None:
+	app = TerminalApplication()
+	app.main()
+elif args.command in ("run", "shard"):
+	app = TerminalApplication(args.params)
+	app.quiet = args.quiet
+	if args.evaluation_port != None:
+		app.start_evaluation_server(args.evaluation_port, args.evaluation_host, Path(args.evaluation_key))
+	try:
+		if args.command == "run":
+			app.main(args.workers, not args.no_resume, args.force)
+		else:
+			app.run_shard(
+				args.shard_index, args.shard_count, args.workers, not args.no_resume, args.force,
+				args.training, args.config, args.eating_number
+			)
+	finally:
+		app.stop_evaluation_server()
+elif args.command == "merge":
+	app = TerminalApplication(args.params)
+	app.merge_and_graph(args.workers, args.training, args.config, args.eating_number)
+elif args.command == "worker":
+	worker = EvaluationWorker(load_key(Path(args.key)), args.host, args.port, args.name)
+	worker.run()
@@ -2,35 +2,25 @@ from src.agent.agent					import Agent
 from src.agent.default_agent			import DefaultAgent
 from src.agent.stopped_by_walls_agent	import StoppedByWallsAgent
 from src.agent.sound_agent				import SoundAgent
+from src.utils							import CreatableFromParameters
 
 from typing import Any
 
+CreatableFromParameters.register("agent", "default-agent", DefaultAgent)
+CreatableFromParameters.register("agent", "stopped-by-walls-agent", StoppedByWallsAgent)
+CreatableFromParameters.register("agent", "sound-agent", SoundAgent)
 
-def create_agent(agent_type: str, params: dict[str, Any]) -> Agent:
-	try:
-		if agent_type == "default-agent":
-			return DefaultAgent.create_from_parameters(params)
-		if agent_type == "stopped-by-walls-agent":
-			return StoppedByWallsAgent.create_from_parameters(params)
-		if agent_type == "sound-agent":
-			return SoundAgent.create_from_parameters(params)
-		else:
-			raise Exception(f"Invalid agent type: {agent_type}")
-	except Exception as e: raise
+
+def create_agent(agent_type: str, params: dict[str, Any], trusted: bool = False) -> Agent:
+	# Trusted parameters were already checked with validate_parameters, usually once for many objects
+	creatable = CreatableFromParameters.get_registered_class("agent", agent_type)
+	return creatable.create_trusted(params) if trusted else creatable.create_from_parameters(params)
+
+def validate_agent_parameters(agent_type: str, params: dict[str, Any]) -> None:
+	CreatableFromParameters.get_registered_class("agent", agent_type).validate_parameters(params)
 
 def get_agent_parameters(agent_type: str) -> tuple[tuple[str, type], ...]:
-	if agent_type == "default-agent":
-		return DefaultAgent.get_parameters()
-	if agent_type == "stopped-by-walls-agent":
-		return StoppedByWallsAgent.get_parameters()
-	if agent_type == "sound-agent":
-		return SoundAgent.get_parameters()
-	else:
-		raise Exception(f"Invalid agent type: {agent_type}")
+	return CreatableFromParameters.get_registered_class("agent", agent_type).get_schema()
 
 def get_agent_types() -> list[str]:
-	return [
-		"default-agent",
-		"stopped-by-walls-agent",
-		"sound-agent"
-	]
\ No newline at end of file
+	return CreatableFromParameters.get_registered_types("agent")
\ No newline at end of file
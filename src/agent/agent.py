@@ -42,6 +42,13 @@ class Agent(CreatableFromParameters):
 	def end_lifespan(self, time_step: int) -> None:
 		self.alive = False
 		self.last_time_step = time_step
+	def reset(self, brain: Brain, lifespan: int) -> None:
+		self.brain = brain
+		self.lifespan = lifespan
+		self.state = {key: None for key in self.state}
+		self.last_time_step = 0
+		self.history = []
+		self.alive = True
 	
 	def set_history(self, history: list[tuple[Any]] , keys: list[str]) -> None:
 		for state in history:
@@ -1,28 +1,37 @@
 from src.agent.brain.brain					import Brain
 from src.agent.brain.neat_brain				import NeatBrain
+from src.agent.brain.brain_store			import BrainStore
+from src.utils								import CreatableFromParameters
 
-from typing	import Any
+from typing	import Any, Optional
+
+CreatableFromParameters.register("brain", "neat-brain", NeatBrain)
 
 
 def create_brain(brain_type: str, params: dict[str, Any]) -> Brain:
-	try:
-		if brain_type == "neat-brain":
-			return NeatBrain.create_from_parameters(params)
-		else:
-			raise Exception(f"Invalid brain type: {brain_type}")
-	except Exception as e: raise
-	
+	creatable = CreatableFromParameters.get_registered_class("brain", brain_type)
+	return creatable.create_from_parameters(params)
+
 def get_brain_parameters(brain_type: str) -> tuple[tuple[str, type], ...]:
-	if brain_type == "neat-brain":
-		return NeatBrain.get_parameters()
-	else:
-		raise Exception(f"Invalid brain type: {brain_type}")
+	return CreatableFromParameters.get_registered_class("brain", brain_type).get_schema()
 
-def load_brain_from_data(data: dict[str, Any]) -> Brain:
+def load_brain_from_data(data: dict[str, Any] | str, brain_store: Optional[BrainStore] = None) -> Brain:
+	if isinstance(data, str):
+		if brain_store == None:
+			raise Exception(f"Missing brain store for brain reference: {data}")
+		if data not in brain_store.loaded:
+			brain_store.loaded[data] = load_brain_from_data(brain_store.get(data))
+		return brain_store.loaded[data]
 	if data["type"] == "neat-brain":
 		return NeatBrain.load_from_data(data)
 	else:
 		raise Exception(f"Invalid brain type: {data['type']}")
 
+def get_brain_n_nodes_from_data(data: dict[str, Any]) -> int:
+	if data["type"] == "neat-brain":
+		return NeatBrain.get_n_nodes_from_data(data)
+	else:
+		raise Exception(f"Invalid brain type: {data['type']}")
+
 def get_brain_types() -> list[str]:
-	return ["neat-brain"]
\ No newline at end of file
+	return CreatableFromParameters.get_registered_types("brain")
\ No newline at end of file
@@ -0,0 +1,39 @@
+from __future__	import annotations
+
+import json
+from collections.abc	import Mapping
+from hashlib			import sha1
+from typing				import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from src.agent.brain	import Brain
+
+
+class BrainStore(object):
+	def __init__(self, brains: Mapping[str, dict[str, Any]] | None = None):
+		# A table passed in, which may only be read from its file on the first lookup, is copied on the first add
+		self.brains	: Mapping[str, dict[str, Any]]	= brains if brains != None else {}
+		self.owned	: bool							= brains == None
+		self.loaded	: dict[str, Brain]				= {}
+
+	def add(self, data: dict[str, Any]) -> str:
+		key = __class__.get_key(data)
+		if key not in self.brains:
+			if not self.owned:
+				self.brains = dict(self.brains)
+				self.owned = True
+			self.brains[key] = data
+		return key
+	def intern(self, data: dict[str, Any] | str) -> str:
+		return data if isinstance(data, str) else self.add(data)
+	def get(self, key: str) -> dict[str, Any]:
+		if key not in self.brains:
+			raise Exception(f"{self.__class__.__name__}: Unknown brain reference: {key}")
+		return self.brains[key]
+
+	def to_dict(self) -> dict[str, dict[str, Any]]:
+		return dict(self.brains)
+
+	@staticmethod
+	def get_key(data: dict[str, Any]) -> str:
+		return sha1(json.dumps(data, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
\ No newline at end of file
@@ -43,6 +43,10 @@ class NeatBrain(Brain):
 			"network"				: self.neat_net.to_dict(),
 			"perception-processor"	: self.perception_processor.to_dict()
 		}
+
+	def __reduce__(self) -> tuple[Any, ...]:
+		# The network and perception processor pickle to their own compact wire formats
+		return (NeatBrain, (self.neat_net, self.perception_processor))
 	
 	@staticmethod
 	def load_from_data(data: dict[str, Any]) -> 'NeatBrain':
@@ -51,19 +55,21 @@ class NeatBrain(Brain):
 			load_perception_processor_from_data(data["perception-processor"])
 		)
 	
+	@staticmethod
+	def get_n_nodes_from_data(data: dict[str, Any]) -> int:
+		return len(data["network"]["node-evals"]) + len(data["network"]["inputs"])
+	
 	@staticmethod
 	def get_parameters() -> tuple[tuple[str, type], ...]:
 		return (("neat-neural-network", FeedForwardNetwork), ("perception-processor", PerceptionProcessor))
 	
 	@staticmethod
 	def create_from_parameters(params: dict[str, Any]) -> 'NeatBrain':
-		for key, param_type in __class__.get_parameters():
-			if key not in params:
-				raise Exception(f"{__class__.__name__}: Missing required parameter: {key}")
-			if not isinstance(params[key], param_type):
-				raise Exception(
-					f"{__class__.__name__}: Invalid type for parameter '{key}': expected {param_type}, got {type(params[key])}"
-				)
+		__class__.validate_parameters(params)
+		return __class__.create_trusted(params)
+
+	@staticmethod
+	def create_trusted(params: dict[str, Any]) -> 'NeatBrain':
 		try:
 			neural_network = create_neural_network("neat-neural-network", params)
 		except Exception as e: raise
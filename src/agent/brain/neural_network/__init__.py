@@ -1,22 +1,18 @@
 from src.agent.brain.neural_network.neural_network		import NeuralNetwork
 from src.agent.brain.neural_network.neat_neural_network	import NeatNeuralNetwork
+from src.utils											import CreatableFromParameters
 
 from typing import Any
 
+CreatableFromParameters.register("neural network", "neat-neural-network", NeatNeuralNetwork)
+
 
 def create_neural_network(neural_network_type: str, params: dict[str, Any]) -> NeuralNetwork:
-	try:
-		if neural_network_type == "neat-neural-network":
-			return NeatNeuralNetwork.create_from_parameters(params)
-		else:
-			raise Exception(f"Invalid neural network type: {neural_network_type}")
-	except Exception as e: raise
+	creatable = CreatableFromParameters.get_registered_class("neural network", neural_network_type)
+	return creatable.create_from_parameters(params)
 
 def get_neural_network_parameters(neural_network_type: str) -> tuple[tuple[str, type], ...]:
-	if neural_network_type == "neat-neural-network":
-		return NeatNeuralNetwork.get_parameters()
-	else:
-		raise Exception(f"Invalid neural network type: {neural_network_type}")
+	return CreatableFromParameters.get_registered_class("neural network", neural_network_type).get_schema()
 
 def get_neural_network_types() -> list[str]:
-	return ["neat-neural-network"]
\ No newline at end of file
+	return CreatableFromParameters.get_registered_types("neural network")
\ No newline at end of file
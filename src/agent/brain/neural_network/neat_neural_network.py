@@ -1,9 +1,15 @@
 from src.agent.brain.neural_network	import NeuralNetwork
 
+from array			import array
 from neat.nn		import FeedForwardNetwork
 from scipy.special	import expit as sigmoid
 from typing			import Any
 
+# Two packed buffers. The ints are the input, output and node counts, then the input ids, output ids,
+# node ids and the links of every node as CSR offsets and source ids. The doubles are the node biases,
+# the node responses and the link weights.
+type NetworkWire = tuple[bytes, bytes]
+
 
 class NeatNeuralNetwork(NeuralNetwork):
 	def __init__(
@@ -46,6 +52,25 @@ class NeatNeuralNetwork(NeuralNetwork):
 			"node-evals"	: self.node_evals
 		}
 
+	def to_wire(self) -> NetworkWire:
+		ints = array("i", [len(self.inputs), len(self.outputs), len(self.node_evals)])
+		ints.extend(self.inputs)
+		ints.extend(self.outputs)
+		ints.extend(node for node, _, _, _ in self.node_evals)
+		ints.append(0)
+		for _, _, _, links in self.node_evals:
+			ints.append(ints[-1] + len(links))
+		doubles = array("d", [bias for _, bias, _, _ in self.node_evals])
+		doubles.extend(response for _, _, response, _ in self.node_evals)
+		for _, _, _, links in self.node_evals:
+			ints.extend(i for i, _ in links)
+			doubles.extend(w for _, w in links)
+		return ints.tobytes(), doubles.tobytes()
+
+	def __reduce__(self) -> tuple[Any, ...]:
+		# Pickle the flat arrays rather than the activation values and nested tuples
+		return (NeatNeuralNetwork.load_from_wire, (self.to_wire(),))
+
 	@staticmethod
 	def create_from_neat_nn(nn : FeedForwardNetwork) -> 'NeatNeuralNetwork':
 		node_evals = [(n, b, r, l) for n, _, _, b, r, l in nn.node_evals]
@@ -57,15 +82,33 @@ class NeatNeuralNetwork(NeuralNetwork):
 	
 	@staticmethod
 	def create_from_parameters(params: dict[str, Any]) -> 'NeatNeuralNetwork':
-		for key, param_type in __class__.get_parameters():
-			if key not in params:
-				raise Exception(f"{__class__.__name__}: Missing required parameter: {key}")
-			if not isinstance(params[key], param_type):
-				raise Exception(
-					f"{__class__.__name__}: Invalid type for parameter '{key}': expected {param_type}, got {type(params[key])}"
-				)
+		__class__.validate_parameters(params)
+		return __class__.create_trusted(params)
+
+	@staticmethod
+	def create_trusted(params: dict[str, Any]) -> 'NeatNeuralNetwork':
 		return NeatNeuralNetwork.create_from_neat_nn(params["neat-neural-network"])
 	
 	@staticmethod
 	def load_from_data(data: dict[str, Any]) -> 'NeatNeuralNetwork':
-		return NeatNeuralNetwork(data["inputs"], data["outputs"], data["node-evals"])
\ No newline at end of file
+		return NeatNeuralNetwork(data["inputs"], data["outputs"], data["node-evals"])
+
+	@staticmethod
+	def load_from_wire(wire: NetworkWire) -> 'NeatNeuralNetwork':
+		ints, doubles = array("i"), array("d")
+		ints.frombytes(wire[0])
+		doubles.frombytes(wire[1])
+		n_inputs, n_outputs, n_nodes = ints[:3]
+		inputs = ints[3:3 + n_inputs].tolist()
+		outputs = ints[3 + n_inputs:3 + n_inputs + n_outputs].tolist()
+		start = 3 + n_inputs + n_outputs
+		nodes, offsets = ints[start:start + n_nodes], ints[start + n_nodes:start + 2 * n_nodes + 1]
+		sources, weights = ints[start + 2 * n_nodes + 1:], doubles[2 * n_nodes:]
+		node_evals = [
+			(
+				nodes[i], doubles[i], doubles[n_nodes + i],
+				list(zip(sources[offsets[i]:offsets[i + 1]], weights[offsets[i]:offsets[i + 1]]))
+			)
+			for i in range(n_nodes)
+		]
+		return NeatNeuralNetwork(inputs, outputs, node_evals)
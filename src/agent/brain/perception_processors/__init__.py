@@ -1,6 +1,7 @@
 from __future__	import annotations
 
 from src.agent.brain.perception_processors.perception_processor							import PerceptionProcessor
+from src.utils																			import CreatableFromParameters
 
 from typing	import Any, NotRequired, TypedDict, TYPE_CHECKING
 
@@ -17,19 +18,15 @@ class EnvironmentData(TypedDict):
 	sound_list	: NotRequired[list[Sound]]
 
 
+CreatableFromParameters.register("perception processor", "default-perception-processor", PerceptionProcessor)
+
+
 def create_perception_processor(perception_processor_type: str, params: dict[str, Any]) -> PerceptionProcessor:
-	try:
-		if perception_processor_type == "default-perception-processor":
-			return PerceptionProcessor.create_from_parameters(params)
-		else:
-			raise Exception(f"Invalid perception processor type: {perception_processor_type}")
-	except Exception as e: raise
+	creatable = CreatableFromParameters.get_registered_class("perception processor", perception_processor_type)
+	return creatable.create_from_parameters(params)
 
 def get_perception_processor_parameters(perception_processor_type: str) -> tuple[tuple[str, type], ...]:
-	if perception_processor_type == "default-perception-processor":
-		return PerceptionProcessor.get_parameters()
-	else:
-		raise Exception(f"Invalid perception processor type: {perception_processor_type}")
+	return CreatableFromParameters.get_registered_class("perception processor", perception_processor_type).get_schema()
 
 def load_perception_processor_from_data(data: dict[str, Any]) -> PerceptionProcessor:
 	if data["type"] == "default-perception-processor":
@@ -38,4 +35,4 @@ def load_perception_processor_from_data(data: dict[str, Any]) -> PerceptionProce
 		raise Exception(f"Invalid perception processor type: {data['type']}")
 
 def get_perception_processor_types() -> list[str]:
-	return ["default-perception-processor"]
\ No newline at end of file
+	return CreatableFromParameters.get_registered_types("perception processor")
\ No newline at end of file
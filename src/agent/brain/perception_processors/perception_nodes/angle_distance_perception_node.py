@@ -107,13 +107,11 @@ class AngleDistancePerceptionNode(PerceptionNode):
 	
 	@staticmethod
 	def create_from_parameters(params) -> 'AngleDistancePerceptionNode':
-		for key, param_type in __class__.get_parameters():
-			if key not in params:
-				raise Exception(f"{__class__.__name__}: Missing required parameter: {key}")
-			if not isinstance(params[key], param_type):
-				raise Exception(
-					f"{__class__.__name__}: Invalid type for parameter '{key}': expected {param_type}, got {type(params[key])}"
-				)
+		__class__.validate_parameters(params)
+		return __class__.create_trusted(params)
+
+	@staticmethod
+	def create_trusted(params) -> 'AngleDistancePerceptionNode':
 		return AngleDistancePerceptionNode(
 			params["normalized"], params["see-agents"], params["see-food"],
 			params["see-poisonous-food"]
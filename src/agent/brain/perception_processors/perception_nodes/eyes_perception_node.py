@@ -237,13 +237,11 @@ class EyesPerceptionNode(PerceptionNode):
 	
 	@staticmethod
 	def create_from_parameters(params) -> 'EyesPerceptionNode':
-		for key, param_type in __class__.get_parameters():
-			if key not in params:
-				raise Exception(f"{__class__.__name__}: Missing required parameter: {key}")
-			if not isinstance(params[key], param_type):
-				raise Exception(
-					f"{__class__.__name__}: Invalid type for parameter '{key}': expected {param_type}, got {type(params[key])}"
-				)
+		__class__.validate_parameters(params)
+		return __class__.create_trusted(params)
+
+	@staticmethod
+	def create_trusted(params) -> 'EyesPerceptionNode':
 		return EyesPerceptionNode(
 			params["n-cones"], params["normalized"], params["fov"], params["see-agents"],
 			params["see-food"], params["see-poisonous-food"], params["see-walls"]
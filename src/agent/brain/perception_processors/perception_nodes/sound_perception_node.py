@@ -53,13 +53,11 @@ class SoundPerceptionNode(PerceptionNode):
 	
 	@staticmethod
 	def create_from_parameters(params) -> 'SoundPerceptionNode':
-		for key, param_type in __class__.get_parameters():
-			if key not in params:
-				raise Exception(f"{__class__.__name__}: Missing required parameter: {key}")
-			if not isinstance(params[key], param_type):
-				raise Exception(
-					f"{__class__.__name__}: Invalid type for parameter '{key}': expected {param_type}, got {type(params[key])}"
-				)
+		__class__.validate_parameters(params)
+		return __class__.create_trusted(params)
+
+	@staticmethod
+	def create_trusted(params) -> 'SoundPerceptionNode':
 		return SoundPerceptionNode(params["n-freq"])
 
 	@staticmethod
@@ -6,6 +6,9 @@ from src.agent.brain.perception_processors.perception_nodes	import SoundPercepti
 from math	import sqrt
 from typing	import Any, Optional, Unpack, TYPE_CHECKING
 
+# Node types followed by the options of to_dict, in a fixed order
+type PerceptionSpec = tuple[tuple[str, ...], Optional[bool], Optional[int], Optional[int], Optional[bool], Optional[bool], Optional[bool], Optional[bool], Optional[int]]
+
 if TYPE_CHECKING:
 	from src.agent.brain.perception_processors.perception_nodes	import PerceptionNode
 	from src.agent.brain.perception_processors					import EnvironmentData
@@ -83,6 +86,16 @@ class PerceptionProcessor(CreatableFromParameters, Loadable):
 		if self.n_freq != None: data |= {"n-freq" : self.n_freq}
 		
 		return data
+
+	def get_spec(self) -> PerceptionSpec:
+		return (
+			tuple(node.to_dict()["type"] for node in self.perception_nodes), self.normalized, self.n_cones,
+			self.fov, self.see_agents, self.see_food, self.see_poisonous_food, self.see_walls, self.n_freq
+		)
+
+	def __reduce__(self) -> tuple[Any, ...]:
+		# The nodes are rebuilt from the spec, so none of their state is pickled
+		return (PerceptionProcessor.load_from_spec, (self.get_spec(),))
 	
 	@staticmethod
 	def get_parameters() -> tuple[tuple[str, type], ...]:
@@ -90,13 +103,11 @@ class PerceptionProcessor(CreatableFromParameters, Loadable):
 	
 	@staticmethod
 	def create_from_parameters(params) -> 'PerceptionProcessor':
-		for key, param_type in __class__.get_parameters():
-			if key not in params:
-				raise Exception(f"{__class__.__name__}: Missing required parameter: {key}")
-			if not isinstance(params[key], param_type):
-				raise Exception(
-					f"{__class__.__name__}: Invalid type for parameter '{key}': expected {param_type}, got {type(params[key])}"
-				)
+		__class__.validate_parameters(params)
+		return __class__.create_trusted(params)
+
+	@staticmethod
+	def create_trusted(params) -> 'PerceptionProcessor':
 		perception_nodes = [
 			create_perception_node(node_type, params) for node_type in params["perception-nodes"]
 		]
@@ -116,4 +127,22 @@ class PerceptionProcessor(CreatableFromParameters, Loadable):
 		perception_nodes = [
 			create_perception_node(perception_node["type"], data) for perception_node in data["perception-nodes"]
 		]
-		return PerceptionProcessor(perception_nodes)
\ No newline at end of file
+		perception_processor = PerceptionProcessor(perception_nodes)
+		if "normalized" in data: perception_processor.normalized = data["normalized"]
+		if "n-cones" in data: perception_processor.n_cones = data["n-cones"]
+		if "fov" in data: perception_processor.fov = data["fov"]
+		if "see-agents" in data: perception_processor.see_agents = data["see-agents"]
+		if "see-food" in data: perception_processor.see_food = data["see-food"]
+		if "see-poisonous-food" in data: perception_processor.see_poisonous_food = data["see-poisonous-food"]
+		if "see-walls" in data: perception_processor.see_walls = data["see-walls"]
+		if "n-freq" in data: perception_processor.n_freq = data["n-freq"]
+		return perception_processor
+
+	@staticmethod
+	def load_from_spec(spec: PerceptionSpec) -> 'PerceptionProcessor':
+		keys = ("normalized", "n-cones", "fov", "see-agents", "see-food", "see-poisonous-food", "see-walls", "n-freq")
+		data = {
+			"type"				: "default-perception-processor",
+			"perception-nodes"	: [{"type" : node_type} for node_type in spec[0]]
+		} | {key : value for key, value in zip(keys, spec[1:]) if value != None}
+		return PerceptionProcessor.load_from_data(data)
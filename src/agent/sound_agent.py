@@ -74,13 +74,11 @@ class SoundAgent(Agent):
 	
 	@staticmethod
 	def create_from_parameters(params: dict[str, Any]) -> 'SoundAgent':
-		for key, param_type in __class__.get_parameters():
-			if key not in params:
-				raise Exception(f"{__class__.__name__}: Missing required parameter: {key}")
-			if not isinstance(params[key], param_type):
-				raise Exception(
-					f"{__class__.__name__}: Invalid type for parameter '{key}': expected {param_type}, got {type(params[key])}"
-				)
+		__class__.validate_parameters(params)
+		return __class__.create_trusted(params)
+
+	@staticmethod
+	def create_trusted(params: dict[str, Any]) -> 'SoundAgent':
 		return SoundAgent(
 			params["id"], params["brain"], params["width"], params["height"], params["agents-lifespan"],
 			params["agents-lifespan-extension"], params["perception-distance"],
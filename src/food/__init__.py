@@ -1,22 +1,23 @@
 from src.food.food			import Food
+from src.food.food_record	import FoodRecord
 from src.food.default_food	import DefaultFood
+from src.utils				import CreatableFromParameters
 
 from typing import Any
 
+CreatableFromParameters.register("food", "default-food", DefaultFood)
 
-def create_food(food_type: str, params: dict[str, Any]) -> Food:
-	try:
-		if food_type == "default-food":
-			return DefaultFood.create_from_parameters(params)
-		else:
-			raise Exception(f"Invalid food type: {food_type}")
-	except Exception as e: raise
+
+def create_food(food_type: str, params: dict[str, Any], trusted: bool = False) -> Food:
+	# Trusted parameters were already checked with validate_parameters, usually once for many objects
+	creatable = CreatableFromParameters.get_registered_class("food", food_type)
+	return creatable.create_trusted(params) if trusted else creatable.create_from_parameters(params)
+
+def validate_food_parameters(food_type: str, params: dict[str, Any]) -> None:
+	CreatableFromParameters.get_registered_class("food", food_type).validate_parameters(params)
 
 def get_food_parameters(food_type: str) -> tuple[tuple[str, type], ...]:
-	if food_type == "default-food":
-		return DefaultFood.get_parameters()
-	else:
-		raise Exception(f"Invalid food type: {food_type}")
+	return CreatableFromParameters.get_registered_class("food", food_type).get_schema()
 
 def get_food_types() -> list[str]:
-	return ["default-food"]
\ No newline at end of file
+	return CreatableFromParameters.get_registered_types("food")
\ No newline at end of file
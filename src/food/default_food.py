@@ -1,4 +1,4 @@
-from src.food import Food
+from src.food import Food, FoodRecord
 
 from typing import Any
 
@@ -26,14 +26,13 @@ class DefaultFood(Food):
 				self.last_time_step = time_step
 			self.eaten_by = []
 
+	def to_record(self) -> FoodRecord:
+		return FoodRecord(
+			"default-food", self.x, self.y, self.first_time_step, self.last_time_step, self.eaten, self.poisonous
+		)
+
 	def to_dict(self) -> dict[str, Any]:
-		return {
-			"type"				: "default-food",
-			"first-time-step"	: self.first_time_step,
-			"last-time-step"	: self.last_time_step,
-			"eaten"				: self.eaten,
-			"poisonous"			: self.poisonous
-		}
+		return self.to_record().to_dict()
 	
 	@staticmethod
 	def get_parameters() -> tuple[tuple[str, type], ...]:
@@ -44,13 +43,11 @@ class DefaultFood(Food):
 	
 	@staticmethod
 	def create_from_parameters(params: dict[str, Any]) -> 'DefaultFood':
-		for key, param_type in __class__.get_parameters():
-			if key not in params:
-				raise Exception(f"{__class__.__name__}: Missing required parameter: {key}")
-			if not isinstance(params[key], param_type):
-				raise Exception(
-					f"{__class__.__name__}: Invalid type for parameter '{key}': expected {param_type}, got {type(params[key])}"
-				)
+		__class__.validate_parameters(params)
+		return __class__.create_trusted(params)
+
+	@staticmethod
+	def create_trusted(params: dict[str, Any]) -> 'DefaultFood':
 		return DefaultFood(
 			params["x"], params["y"], params["eating-number"], params["first-time-step"],
 			params["food-lifespan"], params["perception-distance"], params["poisonous-food-rate"]
@@ -7,7 +7,8 @@ from random	import random
 from typing	import Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
-	from src.agent import Agent
+	from src.agent	import Agent
+	from src.food	import FoodRecord
 	
 
 class Food(CreatableFromParameters):
@@ -29,10 +30,25 @@ class Food(CreatableFromParameters):
 		self.last_time_step	: int			= 0
 		self.eaten			: bool			= False
 
+	def reset(self, x: int, y: int, first_time_step: int) -> None:
+		# Reuses retired food in place, the remaining values were validated when it was created
+		self.x = x
+		self.y = y
+		self.first_time_step = first_time_step
+		self.poisonous = random() <= self.poisonous_food_rate
+		self.eaten_by = []
+		self.alive = True
+		self.last_time_step = 0
+		self.eaten = False
+
 	@abstractmethod
 	def simulate(self, time_step: int) -> None:
 		raise NotImplementedError(f"{self.__class__.__name__}: simulate method must be implemented in subclasses")
 
+	@abstractmethod
+	def to_record(self) -> FoodRecord:
+		raise NotImplementedError(f"{self.__class__.__name__}: to_record method must be implemented in subclasses")
+
 	@abstractmethod
 	def to_dict(self) -> dict[str, Any]:
 		raise NotImplementedError(f"{self.__class__.__name__}: to_dict method must be implemented in subclasses")
\ No newline at end of file
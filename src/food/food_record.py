@@ -0,0 +1,21 @@
+from typing	import Any, NamedTuple
+
+
+class FoodRecord(NamedTuple):
+	# What a simulation keeps of food once it is gone, the Food object itself is reused
+	type			: str
+	x				: int
+	y				: int
+	first_time_step	: int
+	last_time_step	: int
+	eaten			: bool
+	poisonous		: bool
+
+	def to_dict(self) -> dict[str, Any]:
+		return {
+			"type"				: self.type,
+			"first-time-step"	: self.first_time_step,
+			"last-time-step"	: self.last_time_step,
+			"eaten"				: self.eaten,
+			"poisonous"			: self.poisonous
+		}
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+plt.rcParams.update({
+    "font.family": "sans-serif",     # Helvetica is a sans-serif font
+    "font.sans-serif": "Arial",
+    "font.size": 5,                 # Match your document 10pt
+    "axes.labelsize": 6,
+    "axes.titlesize": 6,
+    "xtick.labelsize": 6,
+    "ytick.labelsize": 6,
+    "legend.fontsize": 6,
+    "figure.titlesize": 6,
+	"lines.linewidth": 0.25
+})
+import textwrap
+from math		import sqrt
+from pathlib	import Path
+from textwrap	import wrap
+from typing		import TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from src.training.replay	import GraphData
+
+
+textwidth_pt = 455.244
+
+
+# Every function here only takes plain data, so that it can be rendered in a worker process.
+
+def wrap_labels(ax, labels, width, break_long_words=False):
+	ax.set_xticks(labels)
+	for i, label in enumerate(labels):
+		labels[i] = textwrap.fill(label, width=width, break_long_words=break_long_words)
+	ax.set_xticklabels(labels, rotation=0)
+
+def render_graph(data: GraphData, path: str) -> None:
+	fig_width = data["width"] * (textwidth_pt / 72.27)
+	fig_height = fig_width * 8/10
+	_, ax = plt.subplots(figsize=(fig_width, fig_height))
+	ax.plot([i for i in range(len(data["data"]))], data["data"], data["colour"] if "colour" in data else 'b')
+	plt.xlabel("\n".join(wrap(data["x-label"], 16)))
+	plt.ylabel("\n".join(wrap(data["y-label"], 16)))
+	plt.title(data["title"])
+	Path(path + f"/{data['filename']}.pdf").unlink(missing_ok=True)
+	plt.savefig(
+		path + f"/{data['filename']}.pdf", format="pdf",
+		dpi=1000, bbox_inches="tight", pad_inches=0.08
+	)
+	plt.close('all')
+
+def render_sound_distance_graph(
+	stacked_bars: list[list[int]], labels: list[str], title: str, y_label: str, path: str
+) -> None:
+	fig_width = 0.45 * (textwidth_pt / 72.27)
+	fig_height = fig_width * 8/10
+	fig, ax = plt.subplots(figsize=(fig_width, fig_height))
+	dists = [[] for _ in range(len(stacked_bars))]
+	for i in range(len(stacked_bars[0])):
+		total = sum([d[i] for d in stacked_bars])
+		if total != 0:
+			for j in range(len(stacked_bars)):
+				dists[j] += [(stacked_bars[j][i] / total) * 100]
+		else:
+			for j in range(len(stacked_bars)):
+				dists[j] += [0.0]
+	dists = dists[1:]
+	colors = ['#D81B60','#1E88E5','#FFC107']
+	for i in range(len(dists)):
+		ax.bar(
+			range(10, 500, 20), dists[i], color=colors[i],
+			edgecolor = "white", label=labels[i+1], width=20,
+			bottom=[sum([dists[j][k] for j in range(i)]) for k in range(len(dists[i]))]
+		)
+	axis = plt.gca()
+	axis.set_xlim((0, 500))
+	axis.set_ylim((0, 100))
+	plt.xlabel("Distance to closest food")
+	plt.ylabel(y_label)
+	plt.title(title)
+	plt.legend(title="Sound Channels")
+	Path(path).unlink(missing_ok=True)
+	plt.savefig(path, format="pdf", dpi=1000, bbox_inches="tight", pad_inches=0.08)
+	plt.close('all')
+
+def render_distance_change_graph(sound: tuple[int, ...], dists: list[float], colour: str, path: str) -> None:
+	fig_width = 0.3 * (textwidth_pt / 72.27)
+	fig_height = fig_width * 8/10
+	fig, ax = plt.subplots(figsize=(fig_width, fig_height))
+	ax.plot([i for i in range(len(dists))], dists, colour)
+	plt.xlabel("Time since sound (time steps)")
+	plt.ylabel("Distance to sound origin\n(% of initial distance)")
+	plt.title(f"Sound {sound} average distance\nto sound origin over time")
+	Path(path).unlink(missing_ok=True)
+	plt.savefig(path, format="pdf", dpi=1000, bbox_inches="tight", pad_inches=0.08)
+	plt.close('all')
+
+def render_average_performance_graph(
+	vals: dict[str, dict[str, dict[str, list[float]]]], agents: tuple[str, ...], path: str
+) -> None:
+	fig_width = 0.45 * (textwidth_pt / 72.27)
+	fig_height = fig_width * 8/10
+
+	fig, ax = plt.subplots(figsize=(fig_width, fig_height))
+	colors = ['#D81B60','#1E88E5','#FFC107']
+	for j, i in enumerate(agents):
+		x_vals = list(vals.keys())
+		y_vals = [
+			sum(vals[key][i]["average-performance"])/len(vals[key][i]["average-performance"])
+			for key in vals.keys()
+		]
+		stdev = [
+			sqrt(
+				sum([(val - y_vals[j])**2 for val in vals[key][i]["average-performance"]]) /
+				(len(vals[key][i]["average-performance"]) - 1)
+			)
+			for j, key in enumerate(vals.keys())
+		]
+		ax.plot(x_vals, y_vals, colors[j], label=f"{i}")
+		ax.fill_between(
+			x_vals, [val - std for val, std in zip(y_vals, stdev)],
+			[val + std for val, std in zip(y_vals, stdev)], color=colors[j], alpha=.15
+		)
+	wrap_labels(ax, list(vals.keys()), 15)
+	ax.legend(title="Eating Agents")
+	plt.xlabel("Configurations")
+	plt.ylabel("Average Duration (time steps)")
+	fig.suptitle("Average agent performance")
+	Path(path).unlink(missing_ok=True)
+	fig.savefig(path, format="pdf", dpi=1000, bbox_inches="tight", pad_inches=0.08)
+	plt.close('all')
@@ -2,35 +2,27 @@ from src.simulation.simulation					import Simulation
 from src.simulation.random_food_simulation		import RandomFoodSimulation
 from src.simulation.fixed_food_simulation		import FixedFoodSimulation
 from src.simulation.poisonous_food_simulation	import PoisonousFoodSimulation
+from src.utils									import CreatableFromParameters
 
 from typing	import Any
 
+CreatableFromParameters.register("simulation", "random-food-simulation", RandomFoodSimulation)
+CreatableFromParameters.register("simulation", "fixed-food-simulation", FixedFoodSimulation)
+CreatableFromParameters.register("simulation", "poisonous-food-simulation", PoisonousFoodSimulation)
 
-def create_simulation(simulation_type: str, params: dict[str, Any]) -> Simulation:
-	try:
-		if simulation_type == "random-food-simulation":
-			return RandomFoodSimulation.create_from_parameters(params)
-		elif simulation_type == "fixed-food-simulation":
-			return FixedFoodSimulation.create_from_parameters(params)
-		elif simulation_type == "poisonous-food-simulation":
-			return PoisonousFoodSimulation.create_from_parameters(params)
-		else:
-			raise Exception(f"Invalid simulation type: {simulation_type}")
-	except Exception as e: raise
+
+def create_simulation(simulation_type: str, params: dict[str, Any], trusted: bool = False) -> Simulation:
+	# Trusted parameters were already checked with validate_parameters, usually once for many objects
+	creatable = CreatableFromParameters.get_registered_class("simulation", simulation_type)
+	return creatable.create_trusted(params) if trusted else creatable.create_from_parameters(params)
+
+def validate_simulation_parameters(simulation_type: str, params: dict[str, Any]) -> None:
+	CreatableFromParameters.get_registered_class("simulation", simulation_type).validate_parameters(params)
 
 def get_simulation_parameters(simulation_type: str) -> tuple[tuple[str, type], ...]:
-	if simulation_type == "random-food-simulation":
-		return RandomFoodSimulation.get_parameters()
-	elif simulation_type == "fixed-food-simulation":
-		return FixedFoodSimulation.get_parameters()
-	elif simulation_type == "poisonous-food-simulation":
-		return PoisonousFoodSimulation.get_parameters()
-	else:
-		raise Exception(f"Invalid simulation type: {simulation_type}")
+	return CreatableFromParameters.get_registered_class("simulation", simulation_type).get_schema()
 
 def get_simulation_types() -> list[str]:
-	return [
-		"random-food-simulation",
-		"fixed-food-simulation",
-		"poisonous-food-simulation"
-	]
\ No newline at end of file
+	return CreatableFromParameters.get_registered_types("simulation")
+
+from src.simulation.simulation_pool	import SimulationPool, SIMULATION_POOL
@@ -1,11 +1,11 @@
 from __future__	import annotations
 
-from src.agent.brain	import Brain
+from src.agent.brain	import Brain, BrainStore
 from src.food			import create_food, get_food_parameters
 from src.simulation		import Simulation
 
 from random	import random
-from typing import Any
+from typing import Any, Optional
 
 
 class PoisonousFoodSimulation(Simulation):
@@ -27,6 +27,12 @@ class PoisonousFoodSimulation(Simulation):
 			self.create_food()
 		self.start_loop()
 	
+	def reset(self, brain: Brain, world_seed: Optional[int] = None) -> None:
+		super().reset(brain, world_seed)
+		while self.get_n_food() < self.n_food:
+			self.create_food()
+		self.start_loop()
+
 	def main_loop(self) -> None:
 		while not self.finished:
 			for food in self.food:
@@ -54,13 +60,14 @@ class PoisonousFoodSimulation(Simulation):
 			if food.alive == True:
 				food.alive = False
 				food.last_time_step = self.time_step
-			self.finished_food += [food]
+			self.retire_food(food)
+		self.food = []
 	
-	def to_dict(self) -> dict[str, Any]:
+	def to_dict(self, brain_store: Optional[BrainStore] = None) -> dict[str, Any]:
 		return {
 			"type"		: "poisonous-food-simulation",
 			"duration"	: self.last_time_step,
-			"brain"		: self.brain.to_dict(),
+			"brain"		: self.brain.to_dict() if brain_store == None else brain_store.add(self.brain.to_dict()),
 			"agents"	: [agent.to_dict() for agent in self.agents],
 			"food"		: [food.to_dict() for food in self.finished_food]
 		}
@@ -76,13 +83,11 @@ class PoisonousFoodSimulation(Simulation):
 	
 	@staticmethod
 	def create_from_parameters(params: dict[str, Any]) -> 'PoisonousFoodSimulation':
-		for key, param_type in __class__.get_parameters():
-			if key not in params:
-				raise Exception(f"{__class__.__name__}: Missing required parameter: {key}")
-			if not isinstance(params[key], param_type):
-				raise Exception(
-					f"{__class__.__name__}: Invalid type for parameter '{key}': expected {param_type}, got {type(params[key])}"
-				)
+		__class__.validate_parameters(params)
+		return __class__.create_trusted(params)
+
+	@staticmethod
+	def create_trusted(params: dict[str, Any]) -> 'PoisonousFoodSimulation':
 		return PoisonousFoodSimulation(
 			params["brain"], params["width"], params["height"], params["n-agents"], params["agent-type"],
 			params["agents-lifespan"], params["agents-lifespan-extension"], params["food-type"], params["food-lifespan"],
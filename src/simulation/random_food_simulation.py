@@ -1,10 +1,10 @@
 from __future__	import annotations
 
-from src.agent.brain	import Brain
+from src.agent.brain	import Brain, BrainStore
 from src.simulation 	import Simulation
 
 from random import random
-from typing import Any
+from typing import Any, Optional
 
 
 class RandomFoodSimulation(Simulation):
@@ -23,6 +23,10 @@ class RandomFoodSimulation(Simulation):
 		self.create_agents()
 		self.start_loop()
 	
+	def reset(self, brain: Brain, world_seed: Optional[int] = None) -> None:
+		super().reset(brain, world_seed)
+		self.start_loop()
+
 	def main_loop(self) -> None:
 		while not self.finished:
 			for food in self.food:
@@ -48,13 +52,14 @@ class RandomFoodSimulation(Simulation):
 			if food.alive == True:
 				food.alive = False
 				food.last_time_step = self.time_step
-			self.finished_food += [food]
+			self.retire_food(food)
+		self.food = []
 	
-	def to_dict(self) -> dict[str, Any]:
+	def to_dict(self, brain_store: Optional[BrainStore] = None) -> dict[str, Any]:
 		return {
 			"type"		: "random-food-simulation",
 			"duration"	: self.last_time_step,
-			"brain"		: self.brain.to_dict(),
+			"brain"		: self.brain.to_dict() if brain_store == None else brain_store.add(self.brain.to_dict()),
 			"agents"	: [agent.to_dict() for agent in self.agents],
 			"food"		: [food.to_dict() for food in self.finished_food]
 		}
@@ -70,13 +75,11 @@ class RandomFoodSimulation(Simulation):
 	
 	@staticmethod
 	def create_from_parameters(params: dict[str, Any]) -> 'RandomFoodSimulation':
-		for key, param_type in __class__.get_parameters():
-			if key not in params:
-				raise Exception(f"{__class__.__name__}: Missing required parameter: {key}")
-			if not isinstance(params[key], param_type):
-				raise Exception(
-					f"{__class__.__name__}: Invalid type for parameter '{key}': expected {param_type}, got {type(params[key])}"
-				)
+		__class__.validate_parameters(params)
+		return __class__.create_trusted(params)
+
+	@staticmethod
+	def create_trusted(params: dict[str, Any]) -> 'RandomFoodSimulation':
 		return RandomFoodSimulation(
 			params["brain"], params["width"], params["height"], params["n-agents"], params["agent-type"],
 			params["agents-lifespan"], params["agents-lifespan-extension"], params["food-type"], params["food-lifespan"],
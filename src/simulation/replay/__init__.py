@@ -1,17 +1,24 @@
+from __future__ import annotations
+
 from src.simulation.replay.simulation_replay				import SimulationReplay
 from src.simulation.replay.random_food_simulation_replay	import RandomFoodSimulationReplay
 from src.simulation.replay.fixed_food_simulation_replay		import FixedFoodSimulationReplay
 from src.simulation.replay.poisonous_food_simulation_replay	import PoisonousFoodSimulationReplay
 
-from typing	import Any
+from typing	import Any, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from src.agent.brain	import BrainStore
 
 
-def load_simulation_replay_from_data(data: dict[str, Any]) -> SimulationReplay:
+def load_simulation_replay_from_data(
+	data: dict[str, Any], brain_store: Optional[BrainStore] = None
+) -> SimulationReplay:
 	if data["type"] == "random-food-simulation":
-		return RandomFoodSimulationReplay.load_from_data(data)
+		return RandomFoodSimulationReplay.load_from_data(data, brain_store)
 	elif data["type"] == "fixed-food-simulation":
-		return FixedFoodSimulationReplay.load_from_data(data)
+		return FixedFoodSimulationReplay.load_from_data(data, brain_store)
 	elif data["type"] == "poisonous-food-simulation":
-		return PoisonousFoodSimulationReplay.load_from_data(data)
+		return PoisonousFoodSimulationReplay.load_from_data(data, brain_store)
 	else:
 		raise Exception(f"Invalid simulation type: {data['type']}")
\ No newline at end of file
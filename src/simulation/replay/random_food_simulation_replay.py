@@ -3,20 +3,23 @@ from __future__ import annotations
 from src.agent.brain		import load_brain_from_data
 from src.simulation.replay	import SimulationReplay
 
-from typing	import Any, TYPE_CHECKING
+from typing	import Any, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
-	from src.agent.brain	import Brain
+	from src.agent.brain	import Brain, BrainStore
 
 
 class RandomFoodSimulationReplay(SimulationReplay):
 	def __init__(
-		self, duration: int, brain: Brain, agents: list[dict[str, Any]], food: list[dict[str, Any]]
+		self, duration: int, brain: Optional[Brain], agents: list[dict[str, Any]], food: list[dict[str, Any]]
 	):
 		super().__init__(duration, brain, agents, food)
 
 	@staticmethod
-	def load_from_data(data: dict[str, Any]) -> 'RandomFoodSimulationReplay':
-		return RandomFoodSimulationReplay(
-			data["duration"], load_brain_from_data(data["brain"]), data["agents"], data["food"]
-		)
\ No newline at end of file
+	def load_from_data(data: dict[str, Any], brain_store: Optional[BrainStore] = None) -> 'RandomFoodSimulationReplay':
+		simulation_replay = RandomFoodSimulationReplay(
+			data["duration"], load_brain_from_data(data["brain"], brain_store) if "brain" in data else None,
+			data["agents"], data["food"]
+		)
+		if "n-nodes" in data: simulation_replay.n_nodes = data["n-nodes"]
+		return simulation_replay
\ No newline at end of file
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from src.utils	import Loadable
 
-from typing	import Any, TYPE_CHECKING
+from typing	import Any, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
 	from src.agent.brain	import Brain
@@ -10,9 +10,17 @@ if TYPE_CHECKING:
 
 class SimulationReplay(Loadable):
 	def __init__(
-		self, duration: int, brain: Brain, agents: list[dict[str, Any]], food: list[dict[str, Any]]
+		self, duration: int, brain: Optional[Brain], agents: list[dict[str, Any]], food: list[dict[str, Any]]
 	):
 		self.duration	: int					= duration
-		self.brain		: Brain					= brain
+		self.brain		: Optional[Brain]		= brain
 		self.agents		: list[dict[str, Any]]	= agents
-		self.food		: list[dict[str, Any]]	= food
\ No newline at end of file
+		self.food		: list[dict[str, Any]]	= food
+		self.n_nodes	: Optional[int]			= None
+
+	def get_n_nodes(self) -> int:
+		if self.n_nodes != None:
+			return self.n_nodes
+		if self.brain == None:
+			raise Exception(f"{self.__class__.__name__}: get_n_nodes: Replay has neither a brain nor a node count")
+		return self.brain.get_n_nodes()
\ No newline at end of file
@@ -1,19 +1,19 @@
 from __future__	import annotations
 
-from src.agent	import create_agent, get_agent_parameters
-from src.food	import create_food, get_food_parameters
+from src.agent	import create_agent, get_agent_parameters, validate_agent_parameters
+from src.food	import create_food, get_food_parameters, validate_food_parameters
 from src.utils	import CreatableFromParameters
 
 from abc		import abstractmethod
-from random		import random
+from random		import random, seed
 from threading	import Thread
 from typing		import Any, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
 	from src.agent								import Agent
-	from src.agent.brain						import Brain
+	from src.agent.brain						import Brain, BrainStore
 	from src.agent.brain.perception_processors	import Sound
-	from src.food								import Food
+	from src.food								import Food, FoodRecord
 
 
 class Simulation(CreatableFromParameters):
@@ -44,7 +44,9 @@ class Simulation(CreatableFromParameters):
 		self.time_step			: int							= 0
 		self.agents				: list[Agent]					= []
 		self.food				: list[Food]					= []
-		self.finished_food		: list[Food]					= []
+		self.finished_food		: list[FoodRecord]				= []
+		self.food_pool			: list[Food]					= []
+		self.food_validated		: bool							= False
 		self.sounds				: list[Sound]		= []
 		self.prev_sounds		: list[Sound]		= []
 		self.sound_history		: list[list[Sound]]	= []
@@ -61,25 +63,68 @@ class Simulation(CreatableFromParameters):
 		self.sound_history += [self.sounds]
 
 	def create_agents(self) -> None:
+		# Agents only differ in their id, so the parameters are validated once for all of them
+		params = self.generate_agent_parameters()
+		params["id"] = 0
+		validate_agent_parameters(self.agent_type, params)
 		for i in range(self.n_agents):
-			params = self.generate_agent_parameters()
-			params["id"] = i
-			agent = create_agent(self.agent_type, params)
-			agent.set_in_state("x", int(random()*self.width))
-			agent.set_in_state("y", int(random()*self.height))
-			agent.set_in_state("angle", int(random()*360))
-			agent.save_state()
+			agent = create_agent(self.agent_type, params | {"id" : i}, trusted=True)
+			self.place_agent(agent)
 			self.agents += [agent]
+	def place_agent(self, agent: Agent) -> None:
+		agent.set_in_state("x", int(random()*self.width))
+		agent.set_in_state("y", int(random()*self.height))
+		agent.set_in_state("angle", int(random()*360))
+		agent.save_state()
 	def create_food(self) -> None:
-		params = self.generate_food_parameters()
-		self.food += [create_food(self.food_type, params)]
+		if self.food_pool:
+			food = self.food_pool.pop()
+			food.reset(int(random() * self.width), int(random() * self.height), self.time_step)
+		else:
+			params = self.generate_food_parameters()
+			# Only the position and time step change between spawns, so the first one is validated
+			if not self.food_validated:
+				validate_food_parameters(self.food_type, params)
+				self.food_validated = True
+			food = create_food(self.food_type, params, trusted=True)
+		self.food += [food]
+	def retire_food(self, food: Food) -> None:
+		self.finished_food += [food.to_record()]
+		self.food_pool += [food]
 	def separate_food(self) -> None:
-		dead_food = [food for food in self.food if not food.alive]
-		self.finished_food += dead_food
+		for food in self.food:
+			if not food.alive:
+				self.retire_food(food)
 		self.food = [food for food in self.food if food.alive]
 	def add_sound(self, sound: Sound):
 		self.sounds += [sound]
 	
+	def clear(self) -> None:
+		# Drops what the last run recorded, the agent and food objects are kept for the next one
+		self.last_time_step = 0
+		self.finished = False
+		self.time_step = 0
+		self.food_pool += self.food
+		self.food = []
+		self.finished_food = []
+		self.sounds = []
+		self.prev_sounds = []
+		self.sound_history = []
+		for agent in self.agents:
+			agent.reset(self.brain, self.agents_lifespan)
+
+	def reset(self, brain: Brain, world_seed: Optional[int] = None) -> None:
+		# Puts the world back in the state its constructor leaves it in, subclasses then add their food
+		# and start the loop. Draws from the generator in the same order as the constructor.
+		if self.main_loop_thread != None:
+			self.main_loop_thread.join()
+		if world_seed != None:
+			seed(world_seed)
+		self.brain = brain
+		self.clear()
+		for agent in self.agents:
+			self.place_agent(agent)
+
 	def start_loop(self) -> None:
 		if not self.finished:
 			self.main_loop_thread = Thread(target=self.main_loop, name="name", args=[])
@@ -132,5 +177,5 @@ class Simulation(CreatableFromParameters):
 		raise NotImplementedError(f"{self.__class__.__name__}: main_loop method must be implemented in subclasses")
 	
 	@abstractmethod
-	def to_dict(self) -> dict[str, Any]:
+	def to_dict(self, brain_store: Optional[BrainStore] = None) -> dict[str, Any]:
 		raise NotImplementedError(f"{self.__class__.__name__}: to_dict method must be implemented in subclasses")
\ No newline at end of file
@@ -0,0 +1,106 @@
+from __future__	import annotations
+
+from src.simulation	import create_simulation, validate_simulation_parameters
+
+import json
+from collections	import OrderedDict
+from random			import seed
+from threading		import Lock
+from typing			import Any, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from src.agent.brain	import Brain
+	from src.simulation		import Simulation
+
+
+class SimulationPool(object):
+	# Finished simulations kept per process, so that evaluating a genome resets an existing world instead
+	# of building its agents, food and buffers again. Worlds are keyed on their type and parameters, the
+	# brain is given on every acquire. At most max_idle worlds are kept over all keys, those of the least
+	# recently used keys go first.
+	def __init__(self, max_idle: int = 256):
+		self.max_idle		: int									= max_idle
+		self.idle			: OrderedDict[str, list[Simulation]]	= OrderedDict()
+		self.n_idle			: int									= 0
+		self.keys			: dict[int, str]				= {}
+		self.validated		: set[str]						= set()
+		self.lock			: Lock							= Lock()
+		self.n_created		: int							= 0
+		self.n_reused		: int							= 0
+
+	@staticmethod
+	def get_key(simulation_type: str, params: dict[str, Any]) -> str:
+		return json.dumps([simulation_type, {key: val for key, val in params.items() if key != "brain"}], sort_keys=True)
+
+	def acquire(
+		self, simulation_type: str, params: dict[str, Any], brain: Brain, world_seed: Optional[int] = None
+	) -> Simulation:
+		# The returned simulation is running, join its main_loop_thread and release it once read
+		key = SimulationPool.get_key(simulation_type, params)
+		with self.lock:
+			sim = self.idle[key].pop() if self.idle.get(key) else None
+			if key in self.idle:
+				self.idle.move_to_end(key)
+			if sim != None:
+				self.n_idle -= 1
+				self.n_reused += 1
+			else:
+				self.n_created += 1
+			validated = key in self.validated
+			self.validated.add(key)
+		if sim != None:
+			sim.reset(brain, world_seed)
+			return sim
+		if not validated:
+			validate_simulation_parameters(simulation_type, params | {"brain" : brain})
+		if world_seed != None:
+			seed(world_seed)
+		sim = create_simulation(simulation_type, params | {"brain" : brain}, trusted=True)
+		with self.lock:
+			self.keys[id(sim)] = key
+		return sim
+
+	def release(self, sim: Simulation) -> None:
+		if sim.main_loop_thread != None:
+			sim.main_loop_thread.join()
+		# Drops the recordings now rather than on the next acquire
+		sim.clear()
+		with self.lock:
+			key = self.keys.get(id(sim))
+			if key == None:
+				raise Exception(f"{self.__class__.__name__}: release: Simulation was not acquired from this pool")
+			if self.max_idle <= 0:
+				del self.keys[id(sim)]
+				return
+			self.idle.setdefault(key, []).append(sim)
+			self.idle.move_to_end(key)
+			self.n_idle += 1
+			while self.n_idle > self.max_idle:
+				oldest_key, oldest = next(iter(self.idle.items()))
+				if oldest:
+					self.n_idle -= 1
+					del self.keys[id(oldest.pop(0))]
+				if not oldest:
+					del self.idle[oldest_key]
+
+	def clear(self) -> None:
+		# Drops every idle world, simulations still acquired are pooled again when released
+		with self.lock:
+			for idle in self.idle.values():
+				for sim in idle:
+					del self.keys[id(sim)]
+			self.idle = OrderedDict()
+			self.n_idle = 0
+			self.validated = set()
+
+	def get_stats(self) -> dict[str, int]:
+		with self.lock:
+			return {
+				"created"	: self.n_created,
+				"reused"	: self.n_reused,
+				"idle"		: self.n_idle
+			}
+
+
+# One pool per process, workers keep their worlds warm between tasks
+SIMULATION_POOL = SimulationPool()
@@ -1,37 +1,37 @@
 from __future__ import annotations
 
-from src.simulation			import create_simulation
-from src.training			import create_training
-from src.training.replay	import load_training_replay_from_data
+from src.graph_rendering	import (
+	render_average_performance_graph, render_distance_change_graph, render_graph, render_sound_distance_graph
+)
+from src.simulation			import SIMULATION_POOL
+from src.training			import BrainEvaluation, create_training
+from src.training.distributed	import EvaluationServer, load_key
+from src.training.replay	import (
+	get_training_data_paths, load_training_data_from_file, load_training_header_from_file,
+	load_training_replay_from_data
+)
+from src.training.replay.analysis_cache			import AnalysisCache
+from src.training.replay.columnar_training_data	import convert_saved_data, save_columnar_training_data
+from src.training.replay.food_lifetime_index	import FoodLifetimeIndex
+from src.training.replay.json_training_header	import order_training_data
+from src.training.replay.performance_records	import publish_cell_performance, save_performance
+from src.training.replay.sound_analysis			import accumulate_sound_follow_distances, get_sound_code_indices
+from src.training.replay.training_index			import update_training_index
+from src.utils									import Histogram, RenderQueue, ResultWriter, TaskGraph, write_json_atomically
 
-import matplotlib
-matplotlib.use('Agg')
 import json
-import matplotlib.pyplot as plt
-plt.rcParams.update({
-    "font.family": "sans-serif",     # Helvetica is a sans-serif font
-    "font.sans-serif": "Arial",
-    "font.size": 5,                 # Match your document 10pt
-    "axes.labelsize": 6,
-    "axes.titlesize": 6,
-    "xtick.labelsize": 6,
-    "ytick.labelsize": 6,
-    "legend.fontsize": 6,
-    "figure.titlesize": 6,
-	"lines.linewidth": 0.25
-})
-import textwrap
+import numpy as np
+from concurrent.futures	import Future
+from hashlib	import sha1
 from itertools	import product
-from math		import sqrt
+from os			import cpu_count
 from pathlib	import Path
-from textwrap	import wrap
 from time		import time
-from typing		import Any, TYPE_CHECKING
+from typing		import Any, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
-	from src.simulation			import Simulation
 	from src.training			import Training
-	from src.training.replay	import GraphData
+	from src.training.replay	import GraphData, TrainingReplay
 
 
 def remove_directory_tree(start_directory: Path) -> None:
@@ -41,391 +41,371 @@ def remove_directory_tree(start_directory: Path) -> None:
 		else: remove_directory_tree(path)
 	start_directory.rmdir()
 
-def wrap_labels(ax, labels, width, break_long_words=False):
-	ax.set_xticks(labels)
-	for i, label in enumerate(labels):
-		labels[i] = textwrap.fill(label, width=width, break_long_words=break_long_words)
-	ax.set_xticklabels(labels, rotation=0)
+def save_training_result(directory: Path, id: int, data: dict[str, Any]) -> None:
+	# Trainings of the same cell may index this directory concurrently, so never expose a partial file
+	write_json_atomically(directory / f"{id}.json", order_training_data(data))
+	save_columnar_training_data(data, f"{directory}/{id}.npz")
+	update_training_index(directory)
 
-textwidth_pt = 455.244
+# Parameters that only shape the sweep and do not change the outcome of a single run
+SWEEP_PARAMETERS = ("n-repeats", "eating-numbers")
 
 class TerminalApplication(object):
-	def __init__(self):
+	def __init__(self, params_path: str = "saved_parameters/default_params.json"):
 		# remove_directory_tree(Path("saved_data"))
-		with open("saved_parameters/default_params.json", "r") as fp:
+		with open(params_path, "r") as fp:
 			data = json.load(fp)
-		self.default_params	: dict[str, Any]			= data["default-params"]
-		self.params			: dict[str, Any]			= dict(self.default_params)
-		self.trainings		: dict[str, dict[str, Any]]	= data["trainings"]
-		self.configs		: dict[str, dict[str, Any]]	= data["configs"]
-
-	def main(self) -> None:
-		for training_type, train_params in self.trainings.items():
-			for config_name, conf_params in self.configs.items():
-
-				self.params = dict(self.default_params)
-				for key, val in train_params.items():
-					self.params[key] = val
-				for key, val in conf_params.items():
-					self.params[key] = val
-
-				if "n-repeats" not in self.params.keys():
-					raise Exception(f"{self.__class__.__name__}: Invalid parameter: n-repeats")
-				for eating_number in self.params["eating-numbers"]:
-					for id in range(self.params["n-repeats"]):
-						self.train(training_type, config_name, eating_number, id)
-					self.create_graphs_from_training_data(training_type, config_name, eating_number)
-					self.generate_distance_sound_graphs(training_type, config_name, eating_number)
-					self.generate_distance_change_sound_graphs(training_type, config_name, eating_number)
-					self.get_number_of_nodes(training_type, config_name, eating_number)
-			self.generate_average_performance_graph(training_type)
+		self.default_params			: dict[str, Any]			= data["default-params"]
+		self.params					: dict[str, Any]			= dict(self.default_params)
+		self.trainings				: dict[str, dict[str, Any]]	= data["trainings"]
+		self.configs				: dict[str, dict[str, Any]]	= data["configs"]
+		self.force					: bool						= False
+		self.n_evaluation_workers	: int						= cpu_count() or 1
+		self.render_queue			: RenderQueue				= RenderQueue()
+		self.result_writer			: ResultWriter				= ResultWriter()
+		self.evaluation_server		: Optional[EvaluationServer]	= None
+		# Keeps the per generation summaries of trainings off the output, for headless batch runs
+		self.quiet					: bool						= False
+
+	def get_params(self, training_type: str, config_name: str) -> dict[str, Any]:
+		params = dict(self.default_params)
+		for key, val in self.trainings[training_type].items():
+			params[key] = val
+		for key, val in self.configs[config_name].items():
+			params[key] = val
+
+		if "n-repeats" not in params.keys():
+			raise Exception(f"{self.__class__.__name__}: Invalid parameter: n-repeats")
+		return params
+
+	def main(self, n_workers: int = 1, resume: bool = True, force: bool = False) -> None:
+		self.run_task_graph(self.create_task_graph(self.get_runs()), n_workers, resume, force)
 
 		print()
 		print("Training completed.")
+
+	def run_shard(
+		self, shard_index: int, shard_count: int, n_workers: int = 1, resume: bool = True, force: bool = False,
+		trainings: Optional[list[str]] = None, configs: Optional[list[str]] = None,
+		eating_numbers: Optional[list[int]] = None
+	) -> None:
+		if shard_count < 1 or not 0 <= shard_index < shard_count:
+			raise Exception(f"{self.__class__.__name__}: Invalid shard {shard_index} of {shard_count}")
+		# Round robin over the grid so that every shard gets a similar mix of configurations
+		runs = self.get_runs(trainings, configs, eating_numbers)[shard_index::shard_count]
+		print(f"Shard {shard_index} of {shard_count}: {len(runs)} training(s)")
+		task_graph = self.create_task_graph(
+			runs, graphs=False, state_path=Path(f"saved_data/task_state.shard-{shard_index}-of-{shard_count}.json")
+		)
+		self.run_task_graph(task_graph, n_workers, resume, force)
+
+		print()
+		print(f"Shard {shard_index} of {shard_count} completed.")
+
+	def merge_and_graph(
+		self, n_workers: int = 1, trainings: Optional[list[str]] = None, configs: Optional[list[str]] = None,
+		eating_numbers: Optional[list[int]] = None
+	) -> None:
+		# Only cells that some shard has produced results for
+		runs = [
+			run for run in self.get_runs(trainings, configs, eating_numbers)
+			if Path(f"saved_data/{run[0]}/{run[1]}/{run[2]}").exists()
+			and get_training_data_paths(Path(f"saved_data/{run[0]}/{run[1]}/{run[2]}"))
+		]
+		task_graph = self.create_task_graph(runs, train=False, state_path=None)
+		self.run_task_graph(task_graph, n_workers, False, False)
+
+		print()
+		print("Graphs completed.")
+
+	def start_evaluation_server(self, port: int, host: str = "127.0.0.1", key_path: Path = Path("evaluation.key")) -> None:
+		self.evaluation_server = EvaluationServer(load_key(key_path, create=True), host, port)
+		self.evaluation_server.start()
+
+	def stop_evaluation_server(self) -> None:
+		if self.evaluation_server != None:
+			self.evaluation_server.print_stats()
+			self.evaluation_server.stop()
+			self.evaluation_server = None
+
+	def run_task_graph(self, task_graph: TaskGraph, n_workers: int, resume: bool, force: bool) -> None:
+		if self.evaluation_server != None and n_workers > 1:
+			raise Exception(f"{self.__class__.__name__}: Distributed evaluation runs one training at a time, use a single worker")
+		self.force = force
+		# Share the cores between the trainings running side by side and their final evaluations
+		self.n_evaluation_workers = max(1, (cpu_count() or 1) // max(1, n_workers))
+		if not resume:
+			task_graph.reset_state()
+		try:
+			task_graph.run(n_workers)
+		finally:
+			try:
+				self.result_writer.close()
+			finally:
+				self.render_queue.wait()
+
+	def get_runs(
+		self, trainings: Optional[list[str]] = None, configs: Optional[list[str]] = None,
+		eating_numbers: Optional[list[int]] = None
+	) -> list[tuple[str, str, int, int]]:
+		for name in trainings or []:
+			if name not in self.trainings:
+				raise Exception(f"{self.__class__.__name__}: Unknown training: {name}")
+		for name in configs or []:
+			if name not in self.configs:
+				raise Exception(f"{self.__class__.__name__}: Unknown config: {name}")
+		runs = []
+		for training_type in self.trainings:
+			if trainings != None and training_type not in trainings: continue
+			for config_name in self.configs:
+				if configs != None and config_name not in configs: continue
+				params = self.get_params(training_type, config_name)
+				for eating_number in params["eating-numbers"]:
+					if eating_numbers != None and eating_number not in eating_numbers: continue
+					runs += [(training_type, config_name, eating_number, id) for id in range(params["n-repeats"])]
+		return runs
+
+	def create_task_graph(
+		self, runs: list[tuple[str, str, int, int]], train: bool = True, graphs: bool = True,
+		state_path: Optional[Path] = Path("saved_data/task_state.json")
+	) -> TaskGraph:
+		key = sha1(json.dumps({
+			"default-params" : self.default_params, "trainings" : self.trainings, "configs" : self.configs,
+			"runs" : runs, "train" : train, "graphs" : graphs
+		}, sort_keys=True).encode()).hexdigest()
+		task_graph = TaskGraph(state_path, key)
+		cells : dict[tuple[str, str, int], list[str]] = {}
+		for training_type, config_name, eating_number, id in runs:
+			train_tasks = cells.setdefault((training_type, config_name, eating_number), [])
+			if train:
+				train_tasks += [f"train/{training_type}/{config_name}/{eating_number}/{id}"]
+				task_graph.add_task(
+					train_tasks[-1], self.run_training, (training_type, config_name, eating_number, id)
+				)
+		if not graphs:
+			return task_graph
+		# Graph tasks outrank trainings, so that a cell is graphed as soon as its repeats are trained
+		graph_tasks : dict[str, list[str]] = {}
+		for (training_type, config_name, eating_number), train_tasks in cells.items():
+			graph_tasks.setdefault(training_type, [])
+			graph_tasks[training_type] += [f"graphs/{training_type}/{config_name}/{eating_number}"]
+			task_graph.add_task(
+				graph_tasks[training_type][-1], self.generate_cell_graphs, (training_type, config_name, eating_number),
+				train_tasks, 1
+			)
+		for training_type, tasks in graph_tasks.items():
+			task_graph.add_task(
+				f"performance/{training_type}", self.generate_average_performance_graph, (training_type,), tasks, 1
+			)
+		return task_graph
+
+	def run_training(self, training_type: str, config_name: str, eating_number: int, id: int) -> Optional[Future]:
+		self.params = self.get_params(training_type, config_name)
+		self.params["eating-number"] = eating_number
+		if not self.force and self.is_training_done(training_type, config_name, eating_number, id):
+			print()
+			print(f"Skipping training {training_type} with config {config_name}, eating number {eating_number}, and id {id}: results are up to date")
+			return None
+		return self.train(training_type, config_name, eating_number, id)
+
+	def get_run_key(self, id: int) -> str:
+		with open(self.params["config-file"], "r") as fp:
+			config = fp.read()
+		params = {key: val for key, val in self.params.items() if key not in SWEEP_PARAMETERS}
+		return sha1(json.dumps(
+			{"params" : params, "id" : id, "config" : config}, sort_keys=True, separators=(',', ':')
+		).encode()).hexdigest()
+
+	def is_training_done(self, training_type: str, config_file: str, eating_number: int, id: int) -> bool:
+		directory = Path(f"saved_data/{training_type}/{config_file}/{eating_number}")
+		if not directory.exists():
+			return False
+		try:
+			run = update_training_index(directory)["runs"].get(str(id))
+		except Exception:
+			return False
+		return run != None and run["run-key"] == self.get_run_key(id)
+
+	def generate_cell_graphs(self, training_type: str, config_name: str, eating_number: int) -> None:
+		self.create_graphs_from_training_data(training_type, config_name, eating_number)
+		# Both sound passes share one set of recorded analysis worlds
+		sound_analysis = self.get_sound_analysis(training_type, config_name, eating_number)
+		self.generate_distance_sound_graphs(training_type, config_name, eating_number, sound_analysis)
+		self.generate_distance_change_sound_graphs(training_type, config_name, eating_number, sound_analysis)
+		self.get_number_of_nodes(training_type, config_name, eating_number)
 	
-	def train(self, training_type: str, config_file: str, eating_number: int, id: int) -> None:
+	def train(self, training_type: str, config_file: str, eating_number: int, id: int) -> Optional[Future]:
+		# Returns the pending write of the results, or None once they are on disk
 		print()
 		self.params["eating-number"] = eating_number
 		print(f"Running training {training_type} with config {config_file}, eating number {eating_number}, and id {id} and configs {self.params}")
 		start = time()
 		training = create_training("neat-training", self.params)
+		if self.evaluation_server != None:
+			training.evaluation_server = self.evaluation_server
+		training.statistics_path = Path(f"saved_data/{training_type}/{config_file}/{eating_number}/{id}.generations.jsonl")
+		training.quiet = self.quiet
 		training.start_training()
 		end = time()
 		print(f"Training took {end - start:.2f} seconds")
-		average_performance, max_performance = self.get_training_result_performance(training)
+		if self.evaluation_server != None:
+			self.evaluation_server.print_stats()
+		average_performance, max_performance, n_worlds = self.get_training_result_performance(training)
+		# The next training of this process most likely simulates another cell, its worlds would only hold memory
+		SIMULATION_POOL.clear()
 		Path(f"saved_data/{training_type}/{config_file}/{eating_number}").mkdir(parents=True, exist_ok=True)
-		Path(f"saved_data/{training_type}/{config_file}/{eating_number}/{id}.json").unlink(missing_ok=True)
-		with open(f"saved_data/{training_type}/{config_file}/{eating_number}/{id}.json", "w+") as fp:
-			json.dump(training.to_dict() | {
-				"duration" : end - start,
-				"average-performance" : average_performance,
-				"max-performance" : max_performance
-			}, fp, separators=(',', ':'))
-		print(f"Average Performance: {average_performance}, Maximum Performance: {max_performance}")
+		data = training.to_dict() | {
+			"duration" : end - start,
+			"average-performance" : average_performance,
+			"max-performance" : max_performance,
+			"evaluation-worlds" : n_worlds,
+			"run-key" : self.get_run_key(id)
+		}
 		del training
+		print(f"Average Performance: {average_performance}, Maximum Performance: {max_performance}, Evaluation Worlds: {n_worlds}")
+		# The snapshot is written while the next training runs, nothing holds on to it after this
+		return self.result_writer.submit(
+			save_training_result, Path(f"saved_data/{training_type}/{config_file}/{eating_number}"), id, data
+		)
 
-	def get_training_result_performance(self, training: Training) -> tuple[float, float]:
-		brain = training.brain
-		if brain == None:
-			raise Exception(f"{self.__class__.__name__}: get_training_result_performance: Training has not been completed")
-		simulations = []
-		for _ in range(50):
-			sim = create_simulation(
-				training.simulation_type, training.generate_simulation_parameters(brain)
-			)
-			sim.start_loop()
-			simulations += [sim]
-		while not all([sim.finished for sim in simulations]):
-			pass
-		durations = [sim.last_time_step for sim in simulations]
-		for sim in simulations: del sim
-		return sum(durations)/len(durations), max(durations)
+	def get_training_result_performance(self, training: Training) -> tuple[float, float, int]:
+		evaluation = BrainEvaluation.create_from_parameters(self.params, self.n_evaluation_workers)
+		return evaluation.evaluate(training)
 	
-	def generate_distance_sound_graphs(
+	def get_best_sound_training_replay(
+		self, training_type: str, config_file: str, eating_number: int
+	) -> TrainingReplay | None:
+		directory = Path(f"saved_data/{training_type}/{config_file}/{eating_number}")
+		runs = []
+		for run in update_training_index(directory)["runs"].values():
+			if "sound-perception-node" not in run["perception-nodes"]:
+				continue
+			if run["n-freq"] == None or run["n-freq"] == 0:
+				continue
+			runs += [run]
+		if runs == []:
+			return None
+		
+		run = max(runs, key=lambda r: r["average-performance"])
+		return load_training_replay_from_data(load_training_data_from_file(directory.joinpath(run["file"])))
+
+	def get_sound_analysis(
 		self, training_type: str, config_file: str, eating_number: int
+	) -> tuple[TrainingReplay, list[dict[str, np.ndarray]]] | None:
+		training_replay = self.get_best_sound_training_replay(training_type, config_file, eating_number)
+		if training_replay == None:
+			return None
+		analysis_cache = AnalysisCache(
+			Path(f"saved_data/{training_type}/{config_file}/{eating_number}"), n_workers=self.n_evaluation_workers
+		)
+		return training_replay, analysis_cache.get_worlds(training_replay)
+
+	def generate_distance_sound_graphs(
+		self, training_type: str, config_file: str, eating_number: int,
+		sound_analysis: tuple[TrainingReplay, list[dict[str, np.ndarray]]] | None = None
 	) -> None:
 		print()
 		print(f"Generating distance sound graphs for training {training_type} with config {config_file} and eating number {eating_number}")
 
-		def get_closest_food(x: int, y: int, t: int, sim: Simulation) -> tuple[float, float]:
-			reg_min_dist_sq = float('inf'); poi_min_dist_sq = float('inf')
-			i = 0
-			if len(sim.finished_food) == 0: return reg_min_dist_sq, poi_min_dist_sq
-			food = sim.finished_food[i]
-			while food.last_time_step < t:
-				dx = x - food.x
-				dy = y - food.y
-				dist_sq = dx * dx + dy * dy
-				if food.poisonous:
-					if dist_sq < poi_min_dist_sq:
-						poi_min_dist_sq = dist_sq
-				else:
-					if dist_sq < reg_min_dist_sq:
-						reg_min_dist_sq = dist_sq
-				i += 1
-				if i >= len(sim.finished_food): break
-				food = sim.finished_food[i]
-			return sqrt(reg_min_dist_sq), sqrt(poi_min_dist_sq)
-
-		training_replays = []
-		for path in Path(f"saved_data/{training_type}/{config_file}/{eating_number}").iterdir():
-			if path.is_file() and path.suffix == ".json":
-				with open(path, "r") as fp:
-					training_replay = load_training_replay_from_data(json.load(fp))
-					if "sound-perception-node" not in training_replay.perception_nodes:
-						continue
-					if training_replay.n_freq == None or training_replay.n_freq == 0:
-						continue
-					training_replays += [training_replay]
-			else: continue
-		if training_replays == []:
+		if sound_analysis == None:
+			sound_analysis = self.get_sound_analysis(training_type, config_file, eating_number)
+		if sound_analysis == None:
 			return
-		
-		training_replay = max(
-			training_replays, key=lambda tr: tr.average_performance
-		)
+		training_replay, worlds = sound_analysis
 
-		regular_sounds : dict[tuple[int, ...], list[float]] = {
-			key: [] for key in product([0, 1], repeat=training_replay.n_freq)
-		}
-		poisonous_sounds : dict[tuple[int, ...], list[float]] = {
-			key: [] for key in product([0, 1], repeat=training_replay.n_freq)
-		}
-
-		brain = training_replay.brain
-		if brain == None:
-			raise Exception(f"{self.__class__.__name__}: generate_sound_graphs: Training has not been completed")
-		simulations : list[Simulation] = []
-		for _ in range(20):
-			sim = create_simulation(
-				training_replay.simulation_type, training_replay.generate_simulation_parameters(brain)
-			)
-			sim.start_loop()
-			simulations += [sim]
-		while not all([sim.finished for sim in simulations]):
-			pass
-		for sim in simulations:
-			for t, gen_sounds in enumerate(sim.sound_history):
-				for sound in gen_sounds:
-					reg_dist, poi_dist = get_closest_food(sound[1][0], sound[1][1], t, sim)
-					if reg_dist != float('inf'):
-						regular_sounds[sound[2]] += [reg_dist]
-					if poi_dist != float('inf'):
-						poisonous_sounds[sound[2]] += [poi_dist]
-		for sim in simulations: del sim
-
-		textwidth_pt = 455.244
-		fig_width = 0.45 * (textwidth_pt / 72.27) 
-		fig_height = fig_width * 8/10
-	
-		labels = [str(key) for key in regular_sounds.keys()]
-		fig, ax = plt.subplots(figsize=(fig_width, fig_height))
-		dists = [dists for dists in regular_sounds.values()]
-		stacked_bars = [
-			[
-				0 for _ in range(0, 500, 20)
-			] for _ in range(len(dists))
-		]
-		for i, dist_list in enumerate(dists):
-			for dist in dist_list:
-				if dist < 500:
-					stacked_bars[i][int(dist//20)] += 1
-		dists = [[] for _ in range(len(dists))]
-		for i in range(len(stacked_bars[0])):
-			total = sum([d[i] for d in stacked_bars])
-			if total != 0:
-				for j in range(len(stacked_bars)):
-					dists[j] += [(stacked_bars[j][i] / total) * 100]
-			else:
-				for j in range(len(stacked_bars)):
-					dists[j] += [0.0]
-		dists = dists[1:]
-		colors = ['#D81B60','#1E88E5','#FFC107']
-		for i in range(len(dists)):
-			ax.bar(
-				range(10, 500, 20), dists[i], color=colors[i],
-				edgecolor = "white", label=labels[i+1], width=20,
-				bottom=[sum([dists[j][k] for j in range(i)]) for k in range(len(dists[i]))]
+		# Sound distances binned per sound code into 20 unit buckets up to 500
+		regular_histogram = Histogram(2 ** training_replay.n_freq, 20, 500)
+		poisonous_histogram = Histogram(2 ** training_replay.n_freq, 20, 500)
+		for world in worlds:
+			reg_dists, poi_dists = FoodLifetimeIndex.create_from_world(world).get_closest_food_distances(
+				world["sound-positions"][:, 0], world["sound-positions"][:, 1], world["sound-time-steps"]
 			)
-		axis = plt.gca()
-		axis.set_xlim((0, 500))
-		axis.set_ylim((0, 100))
-		plt.xlabel("Distance to closest food")
-		plt.ylabel("Percentage of sounds")
-		plt.title("Sound distances to closest regular food")
-		plt.legend(title="Sound Channels")
-		path = f"saved_data/{training_type}/{config_file}/{eating_number}/regular_sound_.pdf"
-		Path(path).unlink(missing_ok=True)
-		plt.savefig(path, format="pdf", dpi=1000, bbox_inches="tight", pad_inches=0.08)
+			codes = get_sound_code_indices(world["sound-codes"])
+			regular_histogram.add(codes, reg_dists)
+			poisonous_histogram.add(codes, poi_dists)
+		regular_histogram.save(Path(f"saved_data/{training_type}/{config_file}/{eating_number}/analysis/regular_sound_histogram.npz"))
+		poisonous_histogram.save(Path(f"saved_data/{training_type}/{config_file}/{eating_number}/analysis/poisonous_sound_histogram.npz"))
+
+		labels = [str(key) for key in product([0, 1], repeat=training_replay.n_freq)]
+		self.render_queue.submit(
+			render_sound_distance_graph, regular_histogram.counts.tolist(), labels,
+			"Sound distances to closest regular food", "Percentage of sounds",
+			f"saved_data/{training_type}/{config_file}/{eating_number}/regular_sound_.pdf"
+		)
 		if training_replay.poisonous_food_rate != None and training_replay.poisonous_food_rate > 0:
-			fig, ax = plt.subplots(figsize=(fig_width, fig_height))
-			dists = [dists for dists in poisonous_sounds.values()]
-			stacked_bars = [
-				[
-					0 for _ in range(0, 500, 20)
-				] for _ in range(len(dists))
-			]
-			for i, dist_list in enumerate(dists):
-				for dist in dist_list:
-					if dist < 500:
-						stacked_bars[i][int(dist//20)] += 1
-			dists = [[] for _ in range(len(dists))]
-			for i in range(len(stacked_bars[0])):
-				total = sum([d[i] for d in stacked_bars])
-				if total != 0:
-					for j in range(len(stacked_bars)):
-						dists[j] += [(stacked_bars[j][i] / total) * 100]
-				else:
-					for j in range(len(stacked_bars)):
-						dists[j] += [0.0]
-			dists = dists[1:]
-			colors = ['#D81B60','#1E88E5','#FFC107']
-			for i in range(len(dists)):
-				ax.bar(
-					range(10, 500, 20), dists[i], color=colors[i],
-					edgecolor = "white", label=labels[i+1], width=20,
-					bottom=[sum([dists[j][k] for j in range(i)]) for k in range(len(dists[i]))]
-				)
-			axis = plt.gca()
-			axis.set_xlim((0, 500))
-			axis.set_ylim((0, 100))
-			plt.xlabel("Distance to closest food")
-			plt.ylabel("Number of sounds")
-			plt.title("Sound distances to closest poisonous food")
-			plt.legend(title="Sound Channels")
-			path = f"saved_data/{training_type}/{config_file}/{eating_number}/poisonous_sound_.pdf"
-			Path(path).unlink(missing_ok=True)
-			plt.savefig(path, format="pdf", dpi=1000, bbox_inches="tight", pad_inches=0.08)
-		plt.close('all')
+			self.render_queue.submit(
+				render_sound_distance_graph, poisonous_histogram.counts.tolist(), labels,
+				"Sound distances to closest poisonous food", "Number of sounds",
+				f"saved_data/{training_type}/{config_file}/{eating_number}/poisonous_sound_.pdf"
+			)
 	
 	def generate_distance_change_sound_graphs(
-		self, training_type: str, config_file: str, eating_number: int
+		self, training_type: str, config_file: str, eating_number: int,
+		sound_analysis: tuple[TrainingReplay, list[dict[str, np.ndarray]]] | None = None
 	) -> None:
 		print()
 		print(f"Generating distance change sound graphs for training {training_type} with config {config_file} and eating number {eating_number}")
 
-		def distance_average(distances: list[float]) -> float:
-			if len(distances) == 0: return 0.0
-			return sum([d/(d+1) for d in distances])/sum([1/(d+1) for d in distances])
-
-		training_replays = []
-		for path in Path(f"saved_data/{training_type}/{config_file}/{eating_number}").iterdir():
-			if path.is_file() and path.suffix == ".json":
-				with open(path, "r") as fp:
-					training_replay = load_training_replay_from_data(json.load(fp))
-					if "sound-perception-node" not in training_replay.perception_nodes:
-						continue
-					if training_replay.n_freq == None or training_replay.n_freq == 0:
-						continue
-					training_replays += [training_replay]
-			else: continue
-		if training_replays == []:
+		if sound_analysis == None:
+			sound_analysis = self.get_sound_analysis(training_type, config_file, eating_number)
+		if sound_analysis == None:
 			return
-		
-		training_replay = max(
-			training_replays, key=lambda tr: tr.average_performance
-		)
+		training_replay, worlds = sound_analysis
 
-		sound_distances : dict[tuple[int, ...], list[list[float]]] = {
-			key: [[] for _ in range(20)] for key in product([0, 1], repeat=training_replay.n_freq)
-		}
-
-		brain = training_replay.brain
-		if brain == None:
-			raise Exception(f"{self.__class__.__name__}: generate_sound_graphs: Training has not been completed")
-		simulations : list[Simulation] = []
-		for _ in range(20):
-			sim = create_simulation(
-				training_replay.simulation_type, training_replay.generate_simulation_parameters(brain)
-			)
-			sim.start_loop()
-			simulations += [sim]
-		while not all([sim.finished for sim in simulations]):
-			pass
-
-		for sim in simulations:
-			for t, gen_sounds in enumerate(sim.sound_history):
-				for sound in gen_sounds:
-					for agent in sim.agents:
-						if agent.id == sound[0]:
-							continue
-						for tick in range(t, min(t+20, agent.last_time_step)):
-							sound_distances[sound[2]][tick - t] += [sqrt(
-								(agent.get_from_state("x") - sound[1][0])**2 +
-								(agent.get_from_state("y") - sound[1][1])**2
-							)]
-		for sim in simulations: del sim
+		numerators = np.zeros((2 ** training_replay.n_freq, 20)); denominators = np.zeros((2 ** training_replay.n_freq, 20))
+		for world in worlds:
+			numerator, denominator = accumulate_sound_follow_distances(world, training_replay.n_freq, 20)
+			numerators += numerator; denominators += denominator
+		distance_averages = np.divide(numerators, denominators, out=np.zeros_like(numerators), where=denominators > 0)
 
-		average_sound_distances : dict[tuple[int, ...], list[float]] = {
-			sound: [distance_average(dists) for dists in dist_lists]
-			for sound, dist_lists in sound_distances.items()
-		}
 		average_sound_distances : dict[tuple[int, ...], list[float]] = {
 			sound: [d/dists[0] * 100 for d in dists]
 			if dists[0] != 0.0 else [100.0 for _ in dists]
-			for sound, dists in average_sound_distances.items()
+			for sound, dists in zip(product([0, 1], repeat=training_replay.n_freq), distance_averages.tolist())
 		}
 
-		textwidth_pt = 455.244
-		fig_width = 0.3 * (textwidth_pt / 72.27) 
-		fig_height = fig_width * 8/10
 		colors = ['#D81B60','#1E88E5','#FFC107']
 		average_sound_distances.pop((0,) * training_replay.n_freq)
 		for i, (sound, dists) in enumerate(average_sound_distances.items()):
-			fig, ax = plt.subplots(figsize=(fig_width, fig_height))
-			ax.plot([i for i in range(len(dists))], dists, colors[i])
-			plt.xlabel("Time since sound (time steps)")
-			plt.ylabel("Distance to sound origin\n(% of initial distance)")
-			plt.title(f"Sound {sound} average distance\nto sound origin over time")
-			path = f"saved_data/{training_type}/{config_file}/{eating_number}/sound_{sound}_distance_change.pdf"
-			Path(path).unlink(missing_ok=True)
-			plt.savefig(path, format="pdf", dpi=1000, bbox_inches="tight", pad_inches=0.08)
-		plt.close('all')
+			self.render_queue.submit(
+				render_distance_change_graph, sound, dists, colors[i],
+				f"saved_data/{training_type}/{config_file}/{eating_number}/sound_{sound}_distance_change.pdf"
+			)
 
 	def generate_graphs(self, starting_directory: str):
 		start_path = Path(f"saved_data/{starting_directory}")
 		for config in start_path.iterdir():
 			if config.is_dir():
 				self.generate_graphs(f"{starting_directory}/{config.name}")
-			elif config.suffix == ".json":
-				print(f"Generating graphs for {config}")
-				with open(config, "r") as fp:
-					training_replay = load_training_replay_from_data(json.load(fp))
-				training_replay.create_graphs(f"{start_path}/{config.stem}")
+		for config in get_training_data_paths(start_path):
+			if "type" not in load_training_header_from_file(config): continue
+			print(f"Generating graphs for {config}")
+			training_replay = load_training_replay_from_data(load_training_data_from_file(config))
+			training_replay.create_graphs(f"{start_path}/{config.stem}", self.render_queue)
+		self.render_queue.wait()
+	
+	def convert_saved_data(self, starting_directory: str = ""):
+		print()
+		print(f"Converting training data in saved_data/{starting_directory} to the columnar format")
+		for path in convert_saved_data(Path(f"saved_data/{starting_directory}")):
+			print(f"Converted {path}")
 	
 	def generate_average_performance_graph(self, training_type: str) -> None:
-		with open(f"saved_data/{training_type}/performance.json", "r") as fp:
-			vals: dict[str, dict[str, dict[str, list[float]]]] = json.load(fp)
+		vals: dict[str, dict[str, dict[str, list[float]]]] = save_performance(Path(f"saved_data/{training_type}"))
 		vals = {" ".join(key.split(" ")[1:]): val for key, val in vals.items()}
 		agents = tuple(vals[list(vals.keys())[0]].keys())
 		print()
 		print(f"Training {training_type} average performance: {vals}")
 
-		textwidth_pt = 455.244
-		fig_width = 0.45 * (textwidth_pt / 72.27) 
-		fig_height = fig_width * 8/10
-
-		fig, ax = plt.subplots(figsize=(fig_width, fig_height))
-		colors = ['#D81B60','#1E88E5','#FFC107']
-		for j, i in enumerate(agents):
-			x_vals = list(vals.keys())
-			y_vals = [
-				sum(vals[key][i]["average-performance"])/len(vals[key][i]["average-performance"])
-				for key in vals.keys()
-			]
-			stdev = [
-				sqrt(
-					sum([(val - y_vals[j])**2 for val in vals[key][i]["average-performance"]]) /
-					(len(vals[key][i]["average-performance"]) - 1)
-				)
-				for j, key in enumerate(vals.keys())
-			]
-			ax.plot(x_vals, y_vals, colors[j], label=f"{i}")
-			ax.fill_between(
-				x_vals, [val - std for val, std in zip(y_vals, stdev)],
-				[val + std for val, std in zip(y_vals, stdev)], color=colors[j], alpha=.15
-			)
-		wrap_labels(ax, list(vals.keys()), 15)
-		ax.legend(title="Eating Agents")
-		plt.xlabel("Configurations")
-		plt.ylabel("Average Duration (time steps)")
-		fig.suptitle("Average agent performance")
-		Path(f"saved_data/{training_type}/average_performance.pdf").unlink(missing_ok=True)
-		fig.savefig(
-			f"saved_data/{training_type}/average_performance.pdf", format="pdf",
-			dpi=1000, bbox_inches="tight", pad_inches=0.08
+		self.render_queue.submit(
+			render_average_performance_graph, vals, agents, f"saved_data/{training_type}/average_performance.pdf"
 		)
-		plt.close('all')
 	
 	def get_number_of_nodes(self, training_type: str, config_name: str, eating_number: int) -> None:
 		start_path = Path(f"saved_data/{training_type}/{config_name}/{eating_number}")
-		nodes = []
-		for config in start_path.iterdir():
-			if config.suffix == ".json":
-				with open(config, "r") as fp:
-					training_replay = load_training_replay_from_data(json.load(fp))
-					if training_replay.brain != None:
-						nodes += [training_replay.brain.get_n_nodes()]
+		nodes = [
+			run["n-nodes"] for run in update_training_index(start_path)["runs"].values() if run["n-nodes"] != None
+		]
 		print(f"Number of nodes for training {training_type} with config {config_name} and eating number {eating_number}: {sum(nodes)/len(nodes)}")
 		with open(start_path.joinpath("nodes.txt"), "w+") as fp:
 			for n in nodes:
@@ -448,20 +428,7 @@ class TerminalApplication(object):
 		}
 	
 	def create_graph(self, data: GraphData, path: str) -> None:
-		textwidth_pt = 455.244
-		fig_width = data["width"] * (textwidth_pt / 72.27) 
-		fig_height = fig_width * 8/10
-		_, ax = plt.subplots(figsize=(fig_width, fig_height))
-		ax.plot([i for i in range(len(data["data"]))], data["data"], data["colour"] if "colour" in data else 'b')
-		plt.xlabel("\n".join(wrap(data["x-label"], 16)))
-		plt.ylabel("\n".join(wrap(data["y-label"], 16)))
-		plt.title(data["title"])
-		Path(path + f"/{data['filename']}.pdf").unlink(missing_ok=True)
-		plt.savefig(
-			path + f"/{data['filename']}.pdf", format="pdf",
-			dpi=1000, bbox_inches="tight", pad_inches=0.08
-		)
-		plt.close('all')
+		self.render_queue.submit(render_graph, data, path)
 
 	def create_graphs_from_training_data(self, training_type: str, config_file: str, eating_number: int) -> None:
 		print()
@@ -469,32 +436,18 @@ class TerminalApplication(object):
 		data_lists = []
 		average_performance = []
 		max_performance = []
-		for path in Path(f"saved_data/{training_type}/{config_file}/{eating_number}").iterdir():
-			if path.is_file() and path.suffix == ".json":
-				with open(path, "r") as fp:
-					training_replay = load_training_replay_from_data(json.load(fp))
-				graphs_data = training_replay.get_graphs_data()
-				if data_lists == []:
-					data_lists = [[graph_data] for graph_data in graphs_data]
-				else:
-					for i in range(len(data_lists)):
-						data_lists[i] += [graphs_data[i]]
-				average_performance += [training_replay.average_performance]
-				max_performance += [training_replay.max_performance]
+		for run in update_training_index(Path(f"saved_data/{training_type}/{config_file}/{eating_number}"))["runs"].values():
+			graphs_data = run["graphs"]
+			if data_lists == []:
+				data_lists = [[graph_data] for graph_data in graphs_data]
+			else:
+				for i in range(len(data_lists)):
+					data_lists[i] += [graphs_data[i]]
+			average_performance += [run["average-performance"]]
+			max_performance += [run["max-performance"]]
 		data_lists = [self.join_graph_data(data_list) for data_list in data_lists]
 		for graph_data in data_lists:
 			self.create_graph(graph_data, f"saved_data/{training_type}/{config_file}/{eating_number}")
-		sim_type_performance_path = Path(f"saved_data/{training_type}/performance.json")
-		if sim_type_performance_path.exists():
-			with open(sim_type_performance_path, "r") as fp:
-				sim_type_performance = json.load(fp)
-		else:
-			sim_type_performance = {}
-		if config_file not in sim_type_performance:
-			sim_type_performance[config_file] = {}
-		sim_type_performance[config_file][eating_number] = {
-			"average-performance": average_performance,
-			"max-performance": max_performance
-		}
-		with open(sim_type_performance_path, "w") as fp:
-			json.dump(sim_type_performance, fp, indent=2)
\ No newline at end of file
+		publish_cell_performance(
+			Path(f"saved_data/{training_type}"), config_file, eating_number, average_performance, max_performance
+		)
\ No newline at end of file
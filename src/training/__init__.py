@@ -1,21 +1,19 @@
 from src.training.training		import Training
 from src.training.neat_training	import NeatTraining
+from src.training.brain_evaluation	import BrainEvaluation
+from src.utils						import CreatableFromParameters
 
 from typing import Any
 
+CreatableFromParameters.register("training", "neat-training", NeatTraining)
+
+
 def create_training(training_type: str, params: dict[str, Any]) -> Training:
-	try:	
-		if training_type == "neat-training":
-			return NeatTraining.create_from_parameters(params)
-		else:
-			raise Exception(f"Invalid training type: {training_type}")
-	except Exception as e: raise
+	creatable = CreatableFromParameters.get_registered_class("training", training_type)
+	return creatable.create_from_parameters(params)
 
 def get_training_parameters(training_type: str) -> tuple[tuple[str, type], ...]:
-	if training_type == "neat-training":
-		return NeatTraining.get_parameters()
-	else:
-		raise Exception(f"Invalid training type: {training_type}")
+	return CreatableFromParameters.get_registered_class("training", training_type).get_schema()
 
 def get_training_types() -> list[str]:
-	return ["neat-training"]
\ No newline at end of file
+	return CreatableFromParameters.get_registered_types("training")
\ No newline at end of file
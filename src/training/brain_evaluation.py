@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from src.simulation	import SIMULATION_POOL
+from src.utils		import get_standard_error
+
+from concurrent.futures	import ProcessPoolExecutor
+from random				import getrandbits, getstate, seed, setstate
+from typing				import Any, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from src.agent.brain	import Brain
+	from src.training		import Training
+
+
+def run_evaluation_worlds(
+	simulation_type: str, simulation_params: dict[str, Any], brain: Brain, world_seed: int,
+	n_worlds: int
+) -> list[int]:
+	# Simulations draw from the module level generator, so every batch is seeded explicitly to keep
+	# forked workers from replaying the same worlds. Its state is put back afterwards, a batch run in
+	# the main process would otherwise leave the caller's generator reseeded.
+	state = getstate()
+	seed(world_seed)
+	durations = []
+	try:
+		for _ in range(n_worlds):
+			# Simulations start their own loop thread on creation
+			sim = SIMULATION_POOL.acquire(simulation_type, simulation_params, brain)
+			if sim.main_loop_thread != None: sim.main_loop_thread.join()
+			durations += [sim.last_time_step]
+			SIMULATION_POOL.release(sim)
+	finally:
+		setstate(state)
+	return durations
+
+
+class BrainEvaluation(object):
+	def __init__(
+		self, n_workers: int = 1, max_worlds: int = 50, batch_size: int = 10,
+		target_standard_error: Optional[float] = None
+	):
+		self.n_workers				: int				= n_workers
+		self.max_worlds				: int				= max_worlds
+		self.batch_size				: int				= batch_size
+		self.target_standard_error	: Optional[float]	= target_standard_error
+
+	def is_adaptive(self) -> bool:
+		return self.target_standard_error != None
+
+	def is_finished(self, durations: list[int]) -> bool:
+		if len(durations) >= self.max_worlds:
+			return True
+		if not self.is_adaptive():
+			return False
+		return get_standard_error(durations) <= self.target_standard_error
+
+	def split_round(self, n_worlds: int) -> list[int]:
+		n_chunks = max(1, min(self.n_workers, n_worlds))
+		return [n_worlds // n_chunks + (1 if i < n_worlds % n_chunks else 0) for i in range(n_chunks)]
+
+	def evaluate(self, training: Training) -> tuple[float, float, int]:
+		brain = training.brain
+		if brain == None:
+			raise Exception(f"{self.__class__.__name__}: evaluate: Training has not been completed")
+		simulation_params = training.generate_simulation_parameters(brain)
+		del simulation_params["brain"]
+		base_seed = getrandbits(32)
+
+		durations : list[int] = []
+		executor = ProcessPoolExecutor(max_workers=self.n_workers) if self.n_workers > 1 else None
+		try:
+			while not self.is_finished(durations):
+				remaining = self.max_worlds - len(durations)
+				n_worlds = min(self.batch_size, remaining) if self.is_adaptive() else remaining
+				chunks = self.split_round(n_worlds)
+				args = [
+					(training.simulation_type, simulation_params, brain, base_seed + len(durations) + i, chunk)
+					for i, chunk in enumerate(chunks)
+				]
+				if executor == None:
+					results = [run_evaluation_worlds(*arg) for arg in args]
+				else:
+					results = [future.result() for future in [executor.submit(run_evaluation_worlds, *arg) for arg in args]]
+				for result in results:
+					durations += result
+		finally:
+			if executor != None: executor.shutdown()
+		return sum(durations)/len(durations), max(durations), len(durations)
+
+	@staticmethod
+	def create_from_parameters(params: dict[str, Any], n_workers: int = 1) -> 'BrainEvaluation':
+		return BrainEvaluation(
+			n_workers,
+			params["evaluation-max-worlds"] if "evaluation-max-worlds" in params else 50,
+			params["evaluation-batch-size"] if "evaluation-batch-size" in params else 10,
+			params["evaluation-target-sem"] if "evaluation-target-sem" in params else None
+		)
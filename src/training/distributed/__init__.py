@@ -0,0 +1,4 @@
+from src.training.distributed.evaluation_server	import EvaluationServer, WorkerStats
+from src.training.distributed.evaluation_worker	import EvaluationWorker, evaluate_genome
+from src.training.distributed.protocol			import load_key
+from src.training.distributed.simulation_summary	import SimulationSummary
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from src.training.distributed.protocol	import SERVER_ROLE, MessageChannel
+
+import socket
+from collections	import deque
+from threading		import Condition, Thread
+from time			import monotonic
+from typing			import Any, Optional
+
+
+class WorkerStats(object):
+	def __init__(self, name: str, address: str):
+		self.name				: str	= name
+		self.address			: str	= address
+		self.connected			: bool	= True
+		self.n_completed		: int	= 0
+		self.n_requeued			: int	= 0
+		self.busy_time			: float	= 0.0
+		self.bytes_sent			: int	= 0
+
+	def get_throughput(self) -> float:
+		return self.n_completed / self.busy_time if self.busy_time > 0 else 0.0
+
+	def to_dict(self) -> dict[str, Any]:
+		return {
+			"name"				: self.name,
+			"address"			: self.address,
+			"connected"			: self.connected,
+			"completed"			: self.n_completed,
+			"requeued"			: self.n_requeued,
+			"busy-time"			: self.busy_time,
+			"tasks-per-second"	: self.get_throughput(),
+			"bytes-sent"		: self.bytes_sent
+		}
+
+
+class EvaluationServer(object):
+	# Hands tasks to remote EvaluationWorkers over TCP. A task whose worker disconnects, or sends no
+	# heartbeat for heartbeat_timeout seconds, goes back to the front of the queue. Only workers holding
+	# the same key are served, and the server only listens on the loopback interface unless told otherwise.
+	def __init__(
+		self, key: bytes, host: str = "127.0.0.1", port: int = 0, heartbeat_timeout: float = 30.0,
+		worker_timeout: float = 300.0
+	):
+		self.key				: bytes							= key
+		self.heartbeat_timeout	: float							= heartbeat_timeout
+		# map fails after this many seconds without a connected worker
+		self.worker_timeout		: float							= worker_timeout
+		self.server_socket		: socket.socket					= socket.create_server((host, port))
+		self.address			: tuple[str, int]				= self.server_socket.getsockname()[:2]
+		self.condition			: Condition						= Condition()
+		self.running			: bool							= False
+		self.pending			: deque[int]					= deque()
+		self.payloads			: dict[int, Any]				= {}
+		self.results			: dict[int, Any]				= {}
+		# task id -> (worker name, traceback) of tasks that raised on their worker
+		self.errors				: dict[int, tuple[str, str]]	= {}
+		# task id -> (worker id, time assigned, time of the last heartbeat)
+		self.in_flight			: dict[int, tuple[int, float, float]]	= {}
+		self.workers			: dict[int, WorkerStats]		= {}
+		self.handlers			: list[Thread]					= []
+		self.next_task_id		: int							= 0
+		self.next_worker_id		: int							= 0
+
+	def start(self) -> None:
+		self.running = True
+		Thread(target=self.accept_loop, name="evaluation-server-accept", daemon=True).start()
+		Thread(target=self.monitor_loop, name="evaluation-server-monitor", daemon=True).start()
+		print(f"Evaluation server listening on {self.address[0]}:{self.address[1]}")
+
+	def stop(self, timeout: float = 5.0) -> None:
+		with self.condition:
+			self.running = False
+			self.condition.notify_all()
+		self.server_socket.close()
+		# Gives idle workers their stop message before the process exits, busy ones find the connection closed
+		deadline = monotonic() + timeout
+		for handler in self.handlers:
+			handler.join(max(0.0, deadline - monotonic()))
+
+	def accept_loop(self) -> None:
+		while self.running:
+			try:
+				connection, address = self.server_socket.accept()
+			except OSError:
+				break
+			self.handlers += [Thread(target=self.handle_worker, args=(connection, address), daemon=True)]
+			self.handlers[-1].start()
+
+	def monitor_loop(self) -> None:
+		while self.running:
+			with self.condition:
+				now = monotonic()
+				for task_id, (worker_id, _, last_heartbeat) in list(self.in_flight.items()):
+					if now - last_heartbeat > self.heartbeat_timeout:
+						print(f"Evaluation task {task_id} timed out on worker {self.workers[worker_id].name}, re-queueing")
+						self.requeue(task_id)
+				self.condition.wait(self.heartbeat_timeout / 4)
+
+	def requeue(self, task_id: int) -> None:
+		worker_id = self.in_flight.pop(task_id)[0]
+		self.workers[worker_id].n_requeued += 1
+		if task_id not in self.results and task_id not in self.errors:
+			self.pending.appendleft(task_id)
+			self.condition.notify_all()
+
+	def get_task(self, worker_id: int) -> Optional[tuple[int, Any]]:
+		# The payload is taken under the lock, map may discard the task as soon as it is released
+		with self.condition:
+			while self.running and not self.pending:
+				self.condition.wait()
+			if not self.running:
+				return None
+			task_id = self.pending.popleft()
+			self.in_flight[task_id] = (worker_id, monotonic(), monotonic())
+			return task_id, self.payloads[task_id]
+
+	def handle_worker(self, connection: socket.socket, address: tuple[str, int]) -> None:
+		worker_id = None
+		channel = MessageChannel(connection, self.key, SERVER_ROLE)
+		try:
+			# Peers that never complete the handshake do not hold on to their thread
+			connection.settimeout(self.heartbeat_timeout)
+			channel.handshake()
+			message = channel.receive()
+			connection.settimeout(None)
+			if message[0] != "register":
+				return
+			with self.condition:
+				worker_id = self.next_worker_id
+				self.next_worker_id += 1
+				self.workers[worker_id] = WorkerStats(message[1], f"{address[0]}:{address[1]}")
+			channel.send(("welcome", worker_id))
+			print(f"Evaluation worker {message[1]} connected from {address[0]}:{address[1]}")
+			while True:
+				message = channel.receive()
+				if message[0] == "ready":
+					task = self.get_task(worker_id)
+					if task == None:
+						channel.send(("stop",))
+						return
+					n_bytes = channel.send(("task", *task))
+					with self.condition:
+						self.workers[worker_id].bytes_sent += n_bytes
+				elif message[0] == "heartbeat":
+					with self.condition:
+						if message[1] in self.in_flight and self.in_flight[message[1]][0] == worker_id:
+							assigned_worker_id, assigned, _ = self.in_flight[message[1]]
+							self.in_flight[message[1]] = (assigned_worker_id, assigned, monotonic())
+				elif message[0] == "result":
+					with self.condition:
+						task_id, result = message[1], message[2]
+						if task_id in self.in_flight and self.in_flight[task_id][0] == worker_id:
+							self.workers[worker_id].busy_time += monotonic() - self.in_flight.pop(task_id)[1]
+						# The first result wins when a re-queued task is completed twice
+						if task_id in self.payloads and task_id not in self.results:
+							self.results[task_id] = result
+							self.workers[worker_id].n_completed += 1
+						self.condition.notify_all()
+				elif message[0] == "error":
+					with self.condition:
+						task_id = message[1]
+						if task_id in self.in_flight and self.in_flight[task_id][0] == worker_id:
+							del self.in_flight[task_id]
+						if task_id in self.payloads and task_id not in self.results:
+							self.errors[task_id] = (self.workers[worker_id].name, message[2])
+						self.condition.notify_all()
+		except ConnectionError as e:
+			print(f"Evaluation connection from {address[0]}:{address[1]} closed: {e}")
+		except (EOFError, OSError):
+			pass
+		finally:
+			connection.close()
+			if worker_id != None:
+				with self.condition:
+					self.workers[worker_id].connected = False
+					for task_id, (assigned_worker_id, _, _) in list(self.in_flight.items()):
+						if assigned_worker_id == worker_id:
+							print(f"Evaluation worker {self.workers[worker_id].name} disconnected, re-queueing task {task_id}")
+							self.requeue(task_id)
+
+	def map(self, payloads: list[Any]) -> list[Any]:
+		with self.condition:
+			task_ids = list(range(self.next_task_id, self.next_task_id + len(payloads)))
+			self.next_task_id += len(payloads)
+			for task_id, payload in zip(task_ids, payloads):
+				self.payloads[task_id] = payload
+			self.pending.extend(task_ids)
+			self.condition.notify_all()
+			try:
+				idle_since = None
+				while not all(task_id in self.results for task_id in task_ids):
+					if not self.running:
+						raise Exception(f"{self.__class__.__name__}: Stopped before all tasks were evaluated")
+					failed = [task_id for task_id in task_ids if task_id in self.errors]
+					if failed:
+						name, error = self.errors[failed[0]]
+						raise Exception(
+							f"{self.__class__.__name__}: {len(failed)} task(s) failed, the first on worker {name}:\n{error}"
+						)
+					if any(worker.connected for worker in self.workers.values()):
+						idle_since = None
+					elif idle_since == None:
+						idle_since = monotonic()
+					elif monotonic() - idle_since > self.worker_timeout:
+						raise Exception(
+							f"{self.__class__.__name__}: No evaluation worker connected for {self.worker_timeout:.0f} seconds"
+						)
+					self.condition.wait(1.0)
+				return [self.results[task_id] for task_id in task_ids]
+			finally:
+				self.discard(task_ids)
+
+	def discard(self, task_ids: list[int]) -> None:
+		# Called with the condition held. Results of discarded tasks still being evaluated are ignored.
+		discarded = set(task_ids)
+		self.pending = deque(task_id for task_id in self.pending if task_id not in discarded)
+		for task_id in task_ids:
+			self.payloads.pop(task_id, None)
+			self.results.pop(task_id, None)
+			self.errors.pop(task_id, None)
+			self.in_flight.pop(task_id, None)
+
+	def get_stats(self) -> list[dict[str, Any]]:
+		with self.condition:
+			return [worker.to_dict() for worker in self.workers.values()]
+
+	def print_stats(self) -> None:
+		for stats in self.get_stats():
+			print(
+				f"Worker {stats['name']} ({stats['address']}): {stats['completed']} task(s), "
+				f"{stats['tasks-per-second']:.2f} task(s)/s, {stats['requeued']} re-queued, "
+				f"{stats['bytes-sent']} bytes sent{'' if stats['connected'] else ', disconnected'}"
+			)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from src.simulation						import SIMULATION_POOL
+from src.training.distributed.protocol	import WORKER_ROLE, MessageChannel
+
+import socket
+from threading	import Event, Lock, Thread
+from time		import monotonic, sleep
+from traceback	import format_exc
+from typing		import Any, Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from src.agent.brain	import Brain
+
+
+def evaluate_genome(
+	simulation_type: str, simulation_params: dict[str, Any], brain: Brain, world_seed: int
+) -> tuple[float, dict[str, Any]]:
+	# Workers keep their worlds between tasks, the seed is applied before the reset one starts its loop
+	sim = SIMULATION_POOL.acquire(simulation_type, simulation_params, brain, world_seed)
+	if sim.main_loop_thread != None: sim.main_loop_thread.join()
+	# The server already has the brain, so it is not sent back
+	summary = sim.to_dict()
+	del summary["brain"]
+	n_eaten_food = sim.get_n_eaten_food()
+	SIMULATION_POOL.release(sim)
+	return n_eaten_food, summary
+
+
+class EvaluationWorker(object):
+	def __init__(
+		self, key: bytes, host: str, port: int, name: Optional[str] = None, heartbeat_interval: float = 5.0,
+		connect_timeout: float = 300.0, evaluate: Callable[..., Any] = evaluate_genome
+	):
+		self.key				: bytes					= key
+		self.host				: str					= host
+		self.port				: int					= port
+		self.name				: str					= name if name != None else socket.gethostname()
+		self.heartbeat_interval	: float					= heartbeat_interval
+		self.connect_timeout	: float					= connect_timeout
+		# Called with the payload of every task
+		self.evaluate			: Callable[..., Any]	= evaluate
+		self.send_lock			: Lock					= Lock()
+		self.n_completed		: int					= 0
+
+	def send(self, channel: MessageChannel, message: tuple[Any, ...]) -> None:
+		with self.send_lock:
+			channel.send(message)
+
+	def send_heartbeats(self, channel: MessageChannel, task_id: int, done: Event) -> None:
+		while not done.wait(self.heartbeat_interval):
+			try:
+				self.send(channel, ("heartbeat", task_id))
+			except OSError:
+				return
+
+	def connect(self) -> socket.socket:
+		# Workers may be started before the training that serves them, so keep trying for a while
+		deadline = monotonic() + self.connect_timeout
+		while True:
+			try:
+				return socket.create_connection((self.host, self.port))
+			except ConnectionRefusedError:
+				if monotonic() > deadline: raise
+				sleep(1.0)
+
+	def run(self) -> None:
+		with self.connect() as connection:
+			channel = MessageChannel(connection, self.key, WORKER_ROLE)
+			channel.handshake()
+			self.send(channel, ("register", self.name))
+			message = channel.receive()
+			if message[0] != "welcome":
+				raise Exception(f"{self.__class__.__name__}: Unexpected reply from the server: {message[0]}")
+			print(f"Evaluation worker {self.name} registered with {self.host}:{self.port} as {message[1]}")
+			while True:
+				self.send(channel, ("ready",))
+				message = channel.receive()
+				if message[0] == "stop":
+					break
+				_, task_id, payload = message
+				done = Event()
+				heartbeat_thread = Thread(target=self.send_heartbeats, args=(channel, task_id, done), daemon=True)
+				heartbeat_thread.start()
+				try:
+					result = self.evaluate(*payload)
+				except Exception:
+					# Another worker would fail the same way, so the task is reported rather than retried
+					print(f"Evaluation task {task_id} failed:\n{format_exc()}")
+					self.send(channel, ("error", task_id, format_exc()))
+					continue
+				finally:
+					done.set()
+					heartbeat_thread.join()
+				self.send(channel, ("result", task_id, result))
+				self.n_completed += 1
+		print(f"Evaluation worker {self.name} stopped after {self.n_completed} task(s)")
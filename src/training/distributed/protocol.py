@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import hmac
+import pickle
+import struct
+from hashlib	import sha256
+from os			import chmod
+from pathlib	import Path
+from secrets	import token_bytes
+from socket		import socket
+from typing		import Any
+
+
+# Messages are pickled tuples behind a 4 byte big-endian length and an HMAC of the pickle. Pickle runs
+# code on load, so nothing is unpickled before its HMAC is checked against the key both ends share.
+HEADER = struct.Struct("!I")
+SEQUENCE = struct.Struct("!Q")
+NONCE_SIZE = 32
+# Bounds what a peer that has not authenticated yet can make us buffer
+MAX_MESSAGE_SIZE = 1 << 28
+
+SERVER_ROLE = b"s"
+WORKER_ROLE = b"w"
+
+
+def load_key(path: Path, create: bool = False) -> bytes:
+	# The server creates the key on first use, workers are given a copy of the file
+	if create and not path.exists():
+		path.parent.mkdir(parents=True, exist_ok=True)
+		path.write_bytes(token_bytes(32))
+		chmod(path, 0o600)
+		print(f"Created evaluation key {path}, copy it to the machines running workers")
+	key = path.read_bytes()
+	if len(key) < 16:
+		raise Exception(f"Evaluation key {path} is too short")
+	return key
+
+def receive_exactly(connection: socket, n_bytes: int) -> bytes:
+	data = bytearray()
+	while len(data) < n_bytes:
+		chunk = connection.recv(n_bytes - len(data))
+		if not chunk:
+			raise ConnectionError("Connection closed")
+		data += chunk
+	return bytes(data)
+
+
+class MessageChannel(object):
+	# Both ends exchange a nonce first. Every frame is then signed over both nonces, its sender's role
+	# and its position in the stream, so frames cannot be forged, reflected or replayed in another session.
+	def __init__(self, connection: socket, key: bytes, role: bytes):
+		self.connection		: socket	= connection
+		self.key			: bytes		= key
+		self.role			: bytes		= role
+		self.peer_role		: bytes		= WORKER_ROLE if role == SERVER_ROLE else SERVER_ROLE
+		self.session		: bytes		= b""
+		self.n_sent			: int		= 0
+		self.n_received		: int		= 0
+
+	def handshake(self) -> None:
+		nonce = token_bytes(NONCE_SIZE)
+		self.connection.sendall(nonce)
+		peer_nonce = receive_exactly(self.connection, NONCE_SIZE)
+		self.session = nonce + peer_nonce if self.role == SERVER_ROLE else peer_nonce + nonce
+
+	def sign(self, role: bytes, sequence: int, data: bytes) -> bytes:
+		return hmac.new(self.key, self.session + role + SEQUENCE.pack(sequence) + data, sha256).digest()
+
+	def send(self, message: tuple[Any, ...]) -> int:
+		data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+		frame = HEADER.pack(len(data)) + self.sign(self.role, self.n_sent, data) + data
+		self.n_sent += 1
+		self.connection.sendall(frame)
+		return len(frame)
+
+	def receive(self) -> tuple[Any, ...]:
+		(size,) = HEADER.unpack(receive_exactly(self.connection, HEADER.size))
+		if size > MAX_MESSAGE_SIZE:
+			raise ConnectionError(f"Message of {size} bytes is too large")
+		signature = receive_exactly(self.connection, sha256().digest_size)
+		data = receive_exactly(self.connection, size)
+		if not hmac.compare_digest(signature, self.sign(self.peer_role, self.n_received, data)):
+			raise ConnectionError("Message failed authentication")
+		self.n_received += 1
+		return pickle.loads(data)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing	import Any, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from src.agent.brain	import BrainStore
+
+
+class SimulationSummary(object):
+	# Stands in for a Simulation that was run by a remote worker, holding its to_dict data.
+	def __init__(self, data: dict[str, Any], brain_data: dict[str, Any]):
+		self.data		: dict[str, Any]	= data
+		self.brain_data	: dict[str, Any]	= brain_data
+
+	def to_dict(self, brain_store: Optional[BrainStore] = None) -> dict[str, Any]:
+		return {
+			"type"		: self.data["type"],
+			"duration"	: self.data["duration"],
+			"brain"		: self.brain_data if brain_store == None else brain_store.add(self.brain_data)
+		} | {key: val for key, val in self.data.items() if key not in ("type", "duration")}
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from src.utils	import get_variance
+
+import json
+from math		import sqrt
+from neat		import reporting
+from pathlib	import Path
+from time		import perf_counter
+from typing		import Any, Optional, TextIO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from neat	import Config, DefaultGenome, DefaultSpeciesSet
+
+
+class GenerationReporter(reporting.BaseReporter):
+	# Replaces neat's StatisticsReporter and StdOutReporter. Each generation is summarised in one line of
+	# a JSONL file, and in one printed line unless quiet, and nothing is kept once it is written, so the
+	# memory used does not grow with the run or the population.
+	def __init__(self, path: Optional[Path] = None, quiet: bool = False):
+		self.path				: Optional[Path]	= path
+		self.quiet				: bool				= quiet
+		self.file				: Optional[TextIO]	= None
+		self.generation			: int				= 0
+		self.generation_start	: float				= 0.0
+		self.summary			: dict[str, Any]	= {}
+		self.n_extinctions		: int				= 0
+
+	def start_generation(self, generation: int) -> None:
+		self.generation = generation
+		self.generation_start = perf_counter()
+		self.summary = {"generation" : generation}
+
+	def post_evaluate(
+		self, config: Config, population: dict[int, DefaultGenome], species: DefaultSpeciesSet,
+		best_genome: DefaultGenome
+	) -> None:
+		eval_time = perf_counter() - self.generation_start
+		fitnesses = [genome.fitness for genome in population.values()]
+		self.summary |= {
+			"n-genomes"				: len(fitnesses),
+			"best-fitness"			: best_genome.fitness,
+			"mean-fitness"			: sum(fitnesses) / len(fitnesses),
+			"stdev-fitness"			: sqrt(get_variance(fitnesses)),
+			"best-genome"			: best_genome.key,
+			"best-genome-size"		: list(best_genome.size()),
+			"n-species-evaluated"	: len(species.species),
+			"eval-time"				: eval_time,
+			"genomes-per-second"	: len(fitnesses) / eval_time if eval_time > 0 else 0.0
+		}
+
+	def end_generation(self, config: Config, population: dict[int, DefaultGenome], species_set: DefaultSpeciesSet) -> None:
+		self.summary |= {
+			"n-species"			: len(species_set.species),
+			"n-extinctions"		: self.n_extinctions,
+			"generation-time"	: perf_counter() - self.generation_start
+		}
+		self.write(self.summary)
+		if not self.quiet:
+			print(
+				f"Generation {self.generation}: best {self.summary['best-fitness']:.3f}, "
+				f"mean {self.summary['mean-fitness']:.3f} (stdev {self.summary['stdev-fitness']:.3f}), "
+				f"{self.summary['n-species']} species, {self.summary['genomes-per-second']:.1f} genomes/s, "
+				f"{self.summary['generation-time']:.3f} sec"
+			)
+		self.summary = {}
+
+	def complete_extinction(self) -> None:
+		self.n_extinctions += 1
+		if not self.quiet:
+			print("All species extinct.")
+
+	def info(self, msg: str) -> None:
+		if not self.quiet:
+			print(msg)
+
+	def write(self, summary: dict[str, Any]) -> None:
+		if self.path == None:
+			return
+		if self.file == None:
+			self.path.parent.mkdir(parents=True, exist_ok=True)
+			self.file = open(self.path, "w")
+		self.file.write(json.dumps(summary, separators=(',', ':')) + "\n")
+		# Flushed every generation so that the file can be followed while the training runs
+		self.file.flush()
+
+	def close(self) -> None:
+		if self.file != None:
+			self.file.close()
+			self.file = None
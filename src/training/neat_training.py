@@ -1,21 +1,31 @@
 from __future__	import annotations
 
-from src.agent.brain						import create_brain
+from src.agent.brain						import BrainStore, create_brain
 from src.agent.brain.perception_processors	import create_perception_processor
-from src.simulation							import create_simulation
 from src.training							import Training
+from src.training.distributed				import SimulationSummary
+from src.training.generation_reporter		import GenerationReporter
+from src.utils								import FITNESS_AGGREGATIONS, aggregate_trials, get_variance
 
 import neat
-from os		import remove
-from string	import Template
-from typing	import Any, TYPE_CHECKING
+from random		import getrandbits
+from os			import fdopen, remove, stat
+from pathlib	import Path
+from string		import Template
+from tempfile	import mkstemp
+from typing		import Any, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
 	from src.agent.brain.perception_processors	import PerceptionProcessor
 	from src.simulation							import Simulation
+	from src.training.distributed				import EvaluationServer
 	from neat									import Config, DefaultGenome
 
 
+# Parsed config templates, keyed by path and modification time, shared by every training in the process.
+CONFIG_TEMPLATES : dict[tuple[str, int], tuple[Template, dict[str, Any]]] = {}
+
+
 class NeatTraining(Training):
 	def __init__(
 		self, n_generations: int, width: int, height: int, n_agents: int, agent_type: str,
@@ -31,77 +41,162 @@ class NeatTraining(Training):
 		)
 		self.config_file	: str	= config_file
 
-		self.config_params				: dict[str, Any]											= {}
-		self.simulations 				: dict[str, dict[str, tuple[Simulation, DefaultGenome]]]	= {}
-		self.generation					: int														= 0
+		self.config_params		: dict[str, Any]																= {}
+		self.config_text		: str																			= ""
+		self.simulations		: dict[str, dict[str, tuple[Simulation | SimulationSummary, DefaultGenome]]]	= {}
+		self.generation			: int																			= 0
+		self.evaluation_server	: Optional[EvaluationServer]													= None
+		# Every genome is scored on n_eval_trials worlds, the replay keeps the first of them
+		self.n_eval_trials		: int																			= 1
+		self.trial_aggregation	: str																			= "mean"
+		self.trim_fraction		: float																			= 0.25
+		self.fitness_variances	: dict[str, dict[str, float]]													= {}
+		# Per generation summaries are streamed to statistics_path, quiet keeps them off the output
+		self.statistics_path	: Optional[Path]																= None
+		self.quiet				: bool																			= False
 
 		self.process_config()
 	
 	def process_config(self) -> None:
-		with open(self.config_file, "r") as fp:
-			for line in fp.readlines():
+		template, config_params = __class__.load_config_template(self.config_file)
+		self.config_params = dict(config_params)
+		self.config_text = template.substitute({
+			"num_inputs"	: self.perception_processor.get_n_input(),
+			"num_outputs"	: self.perception_processor.get_n_output()
+		})
+
+	@staticmethod
+	def load_config_template(config_file: str) -> tuple[Template, dict[str, Any]]:
+		key = (config_file, stat(config_file).st_mtime_ns)
+		if key not in CONFIG_TEMPLATES:
+			with open(config_file, "r") as fp:
+				text = fp.read()
+			config_params = {}
+			for line in text.splitlines():
 				line = line.split("#")[0]
 				if len(line) > 0:
 					line = line.split("=")
 					if len(line) == 2:
 						try:
-							self.config_params[line[0].strip()] = float(line[1].strip())
+							config_params[line[0].strip()] = float(line[1].strip())
 						except:
 							if line[1].strip() in ["True", "False"]:
-								self.config_params[line[0].strip()] = line[1].strip() == "True"
+								config_params[line[0].strip()] = line[1].strip() == "True"
 							else:
-								self.config_params[line[0].strip()] = str(line[1].strip())
-		with open("temp/config", "w+") as fp:
-			with open(self.config_file, "r") as src_fp:
-				src = Template(src_fp.read())
-			pattern = {
-				"num_inputs"	: self.perception_processor.get_n_input(),
-				"num_outputs"	: self.perception_processor.get_n_output()
-			}
-			fp.write(src.substitute(pattern))
+								config_params[line[0].strip()] = str(line[1].strip())
+			CONFIG_TEMPLATES[key] = (Template(text), config_params)
+		return CONFIG_TEMPLATES[key]
 
+	def load_config(self) -> Config:
+		# neat.Config only reads from a path, so each training renders into its own temp file.
+		fd, path = mkstemp(prefix="neat-config-")
+		try:
+			with fdopen(fd, "w") as fp:
+				fp.write(self.config_text)
+			return neat.Config(
+				neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet, 
+				neat.DefaultStagnation, path
+			)
+		finally:
+			remove(path)
 
 	def start_training(self) -> None:
 		# Load configuration.
-		config = neat.Config(
-			neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet, 
-			neat.DefaultStagnation, "temp/config"
-		)
+		config = self.load_config()
 
 		# Create the population, which is the top-level object for a NEAT run.
 		pop = neat.Population(config)
-		pop.add_reporter(neat.StdOutReporter(True))
-		stats = neat.StatisticsReporter()
-		pop.add_reporter(stats)
+		reporter = GenerationReporter(self.statistics_path, self.quiet)
+		pop.add_reporter(reporter)
 
 		# Run for up to 30 generations.
-		winner = pop.run(self.eval_genomes, self.n_generations)
+		try:
+			winner = pop.run(self.eval_genomes, self.n_generations)
+		finally:
+			reporter.close()
 
 		self.brain = create_brain("neat-brain", {
 			"perception-processor" : self.perception_processor,
 			"neat-neural-network" : neat.nn.FeedForwardNetwork.create(winner, config)
 		} | self.generate_perception_processor_parameter())
-		remove("temp/config")
 
 	def eval_genomes(
 			self, genomes: list[tuple[int, DefaultGenome]], config: Config
 	) -> None:
+		if self.evaluation_server != None:
+			self.eval_genomes_remotely(genomes, config)
+			return
 		self.simulations[str(self.generation)] = {}
+		trials : dict[str, list[Simulation]] = {}
+		for id, genome in genomes:
+			neat_net = neat.nn.FeedForwardNetwork.create(genome, config)
+			trials[str(id)] = []
+			for _ in range(self.n_eval_trials):
+				# Trials run concurrently, so each one needs a network of its own to activate
+				brain = create_brain("neat-brain", {
+					"perception-processor" : self.perception_processor,
+					"neat-neural-network" : neat_net
+				} | self.generate_perception_processor_parameter()) 
+				trials[str(id)] += [self.start_simulation(brain)]
+		while not all([sim.finished for sims in trials.values() for sim in sims]):
+			pass
+		self.set_fitness(genomes, {id : [sim.get_n_eaten_food() for sim in sims] for id, sims in trials.items()})
+		# Only the summary of the first trial is kept, the worlds go back to the pool for the next generation
+		for id, genome in genomes:
+			summary = trials[str(id)][0].to_dict()
+			del summary["brain"]
+			self.simulations[str(self.generation)][str(id)] = (
+				SimulationSummary(summary, trials[str(id)][0].brain.to_dict()), genome
+			)
+			for sim in trials[str(id)]:
+				self.release_simulation(sim)
+
+		self.generation += 1
+
+	def eval_genomes_remotely(
+			self, genomes: list[tuple[int, DefaultGenome]], config: Config
+	) -> None:
+		if self.evaluation_server == None:
+			raise Exception(f"{self.__class__.__name__}: eval_genomes_remotely: No evaluation server")
+		payloads = []
 		for id, genome in genomes:
 			brain = create_brain("neat-brain", {
 				"perception-processor" : self.perception_processor,
 				"neat-neural-network" : neat.nn.FeedForwardNetwork.create(genome, config)
-			} | self.generate_perception_processor_parameter()) 
-			sim = create_simulation(self.simulation_type, self.generate_simulation_parameters(brain))
-			self.simulations[str(self.generation)][str(id)] = (sim, genome)
-		while not all([sim.finished for sim, _ in self.simulations[str(self.generation)].values()]):
-			pass
-		for id, pair in self.simulations[str(self.generation)].items():
-			pair[1].fitness = pair[0].get_n_eaten_food()
+			} | self.generate_perception_processor_parameter())
+			simulation_params = self.generate_simulation_parameters(brain)
+			del simulation_params["brain"]
+			payloads += [
+				(self.simulation_type, simulation_params, brain, getrandbits(32)) for _ in range(self.n_eval_trials)
+			]
+		results = self.evaluation_server.map(payloads)
+
+		self.simulations[str(self.generation)] = {}
+		fitnesses = {}
+		for i, (id, genome) in enumerate(genomes):
+			genome_results = results[i * self.n_eval_trials:(i + 1) * self.n_eval_trials]
+			fitnesses[str(id)] = [fitness for fitness, _ in genome_results]
+			self.simulations[str(self.generation)][str(id)] = (
+				SimulationSummary(genome_results[0][1], payloads[i * self.n_eval_trials][2].to_dict()), genome
+			)
+		self.set_fitness(genomes, fitnesses)
 
 		self.generation += 1
 
-	def get_simulation(self, generation: str, simulation: str) -> Simulation|None:
+	def set_fitness(self, genomes: list[tuple[int, DefaultGenome]], fitnesses: dict[str, list[int]]) -> None:
+		for id, genome in genomes:
+			genome.fitness = aggregate_trials(fitnesses[str(id)], self.trial_aggregation, self.trim_fraction)
+		if self.n_eval_trials < 2:
+			return
+		variances = {id : get_variance(values) for id, values in fitnesses.items()}
+		self.fitness_variances[str(self.generation)] = variances
+		if not self.quiet:
+			print(
+				f"Trial fitness variance over {self.n_eval_trials} trials: "
+				f"mean {sum(variances.values()) / len(variances):.3f}, max {max(variances.values()):.3f}"
+			)
+
+	def get_simulation(self, generation: str, simulation: str) -> Simulation|SimulationSummary|None:
 		if generation in self.simulations:
 			if simulation in self.simulations[generation]:
 				return self.simulations[generation][simulation][0]
@@ -109,16 +204,25 @@ class NeatTraining(Training):
 		else: return None
 	
 	def to_dict(self) -> dict[str, Any]:
-		return {
+		brain_store = BrainStore()
+		data = {
 			"type"				: "neat-training",
 			"config-file"		: self.config_file,
 			"simulations"		: {
 				gen_id : {
-					sim_id : sim[0].to_dict() for sim_id, sim in gen.items()
+					sim_id : sim[0].to_dict(brain_store) for sim_id, sim in gen.items()
 				} for gen_id, gen in self.simulations.items()
 			},
 			"config-params"		: self.config_params
-		} | super().to_dict()
+		} | super().to_dict(brain_store)
+		if self.n_eval_trials > 1:
+			data |= {
+				"n-eval-trials"				: self.n_eval_trials,
+				"eval-trial-aggregation"	: self.trial_aggregation,
+				"eval-trim-fraction"		: self.trim_fraction,
+				"fitness-variances"			: self.fitness_variances
+			}
+		return data | {"brains" : brain_store.to_dict()}
 	
 	@staticmethod
 	def get_parameters() -> tuple[tuple[str, type], ...]:
@@ -132,13 +236,11 @@ class NeatTraining(Training):
 	
 	@staticmethod
 	def create_from_parameters(params: dict[str, Any]) -> 'NeatTraining':
-		for key, param_type in __class__.get_parameters():
-			if key not in params:
-				raise Exception(f"{__class__.__name__}: Missing required parameter: {key}")
-			if not isinstance(params[key], param_type):
-				raise Exception(
-					f"{__class__.__name__}: Invalid type for parameter '{key}': expected {param_type}, got {type(params[key])}"
-				)
+		__class__.validate_parameters(params)
+		return __class__.create_trusted(params)
+
+	@staticmethod
+	def create_trusted(params: dict[str, Any]) -> 'NeatTraining':
 		perception_processor = create_perception_processor(
 			params["perception-processor-type"], params
 		)
@@ -162,4 +264,15 @@ class NeatTraining(Training):
 		if "see-poisonous-food" in params: training.see_poisonous_food = params["see-poisonous-food"]
 		if "see-walls" in params: training.see_walls = params["see-walls"]
 		if "n-freq" in params: training.n_freq = params["n-freq"]
+		if "n-eval-trials" in params: training.n_eval_trials = params["n-eval-trials"]
+		if "eval-trial-aggregation" in params: training.trial_aggregation = params["eval-trial-aggregation"]
+		if "eval-trim-fraction" in params: training.trim_fraction = params["eval-trim-fraction"]
+		if not isinstance(training.n_eval_trials, int) or training.n_eval_trials < 1:
+			raise Exception(f"{__class__.__name__}: Invalid value for parameter 'n-eval-trials': {training.n_eval_trials}")
+		if training.trial_aggregation not in FITNESS_AGGREGATIONS:
+			raise Exception(
+				f"{__class__.__name__}: Invalid value for parameter 'eval-trial-aggregation': {training.trial_aggregation}"
+			)
+		if not 0 <= training.trim_fraction < 0.5:
+			raise Exception(f"{__class__.__name__}: Invalid value for parameter 'eval-trim-fraction': {training.trim_fraction}")
 		return training
\ No newline at end of file
@@ -1,9 +1,17 @@
 from src.training.replay.training_replay		import TrainingReplay
 from src.training.replay.neat_training_replay	import NeatTrainingReplay
+from src.training.replay.columnar_training_data	import load_columnar_training_data, load_columnar_training_header
+from src.training.replay.json_training_header	import (
+	BULK_LAST_KEY, TRAINING_DATA_BULK_KEYS, load_json_training_header
+)
 
-from typing	import Any, TypedDict
+import json
+from pathlib	import Path
+from typing		import Any, TypedDict
 
 
+TRAINING_INDEX_FILENAME = "index.json"
+
 GraphData = TypedDict("GraphData", {
 	"title": str,
 	"filename": str,
@@ -18,4 +26,32 @@ def load_training_replay_from_data(data: dict[str, Any]) -> TrainingReplay:
 	if data["type"] == "neat-training":
 		return NeatTrainingReplay.load_from_data(data)
 	else:
-		raise Exception(f"Invalid training type: {data['type']}")
\ No newline at end of file
+		raise Exception(f"Invalid training type: {data['type']}")
+
+def load_training_data_from_file(path: Path) -> dict[str, Any]:
+	if path.suffix == ".npz":
+		return load_columnar_training_data(path)
+	elif path.suffix == ".json":
+		with open(path, "r") as fp:
+			return json.load(fp)
+	else:
+		raise Exception(f"Invalid training data file: {path}")
+
+def load_training_header_from_file(path: Path) -> dict[str, Any]:
+	# Everything but the simulations and the brain table, which are not parsed where the format allows it
+	if path.suffix == ".npz":
+		header = load_columnar_training_header(path)
+		del header["format-version"], header["generations"]
+	else:
+		header = load_json_training_header(path) if path.suffix == ".json" else None
+		if header == None:
+			header = load_training_data_from_file(path)
+	return {key: val for key, val in header.items() if key not in TRAINING_DATA_BULK_KEYS + (BULK_LAST_KEY,)}
+
+def get_training_data_paths(directory: Path) -> list[Path]:
+	paths : dict[str, Path] = {}
+	for path in sorted(directory.iterdir()):
+		if path.is_file() and path.suffix in (".npz", ".json") and path.name != TRAINING_INDEX_FILENAME:
+			if path.stem not in paths or path.suffix == ".npz":
+				paths[path.stem] = path
+	return list(paths.values())
\ No newline at end of file
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from src.agent.brain	import BrainStore
+from src.simulation		import SIMULATION_POOL
+from src.utils			import SharedArrays
+
+import json
+import numpy				as np
+from concurrent.futures		import ProcessPoolExecutor
+from hashlib				import sha1
+from os						import getpid, replace
+from pathlib				import Path
+from random				import getstate, setstate
+from typing					import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from src.agent.brain			import Brain
+	from src.simulation				import Simulation
+	from src.utils					import SharedArraysHandle
+	from src.training.replay		import TrainingReplay
+
+
+ANALYSIS_CACHE_VERSION = 1
+
+ANALYSIS_DIRECTORY = "analysis"
+
+
+def record_simulation(sim: Simulation, n_freq: int) -> dict[str, np.ndarray]:
+	# Positions are indexed by time step, ticks an agent has no history for are NaN.
+	positions = np.full((len(sim.agents), sim.last_time_step + 1, 2), np.nan, dtype=np.float32)
+	for i, agent in enumerate(sim.agents):
+		history = agent.history[:sim.last_time_step + 1]
+		if history:
+			positions[i, :len(history)] = [(state["x"], state["y"]) for state in history]
+	sounds = [(t, sound) for t, gen_sounds in enumerate(sim.sound_history) for sound in gen_sounds]
+	food = sim.finished_food
+	return {
+		"duration"				: np.array(sim.last_time_step, dtype=np.int32),
+		"agent-ids"				: np.array([agent.id for agent in sim.agents], dtype=np.int32),
+		"agent-last-time-step"	: np.array([agent.last_time_step for agent in sim.agents], dtype=np.int32),
+		"agent-positions"		: positions,
+		"sound-time-steps"		: np.array([t for t, _ in sounds], dtype=np.int32),
+		"sound-agent-ids"		: np.array([sound[0] for _, sound in sounds], dtype=np.int32),
+		"sound-positions"		: np.array([sound[1] for _, sound in sounds], dtype=np.float32).reshape(-1, 2),
+		"sound-codes"			: np.array([sound[2] for _, sound in sounds], dtype=np.int8).reshape(-1, n_freq),
+		"food-positions"		: np.array([(f.x, f.y) for f in food], dtype=np.float32).reshape(-1, 2),
+		"food-first-time-step"	: np.array([f.first_time_step for f in food], dtype=np.int32),
+		"food-last-time-step"	: np.array([f.last_time_step for f in food], dtype=np.int32),
+		"food-poisonous"		: np.array([f.poisonous for f in food], dtype=np.bool_)
+	}
+
+def run_analysis_worlds(
+	simulation_type: str, simulation_params: dict[str, Any], brain: Brain, n_freq: int,
+	world_seeds: list[int]
+) -> list[dict[str, np.ndarray]]:
+	# The fixed world seeds go through the module level generator. Its state is put back afterwards,
+	# or every training started later in this process would begin from the same state.
+	state = getstate()
+	worlds = []
+	try:
+		for world_seed in world_seeds:
+			# Seeded before the loop starts, since simulations start their own loop thread on creation
+			sim = SIMULATION_POOL.acquire(simulation_type, simulation_params, brain, world_seed)
+			if sim.main_loop_thread != None: sim.main_loop_thread.join()
+			worlds += [record_simulation(sim, n_freq)]
+			SIMULATION_POOL.release(sim)
+	finally:
+		setstate(state)
+	return worlds
+
+def run_shared_analysis_worlds(
+	simulation_type: str, simulation_params: dict[str, Any], brain: Brain, n_freq: int,
+	world_seeds: list[int]
+) -> list[SharedArraysHandle]:
+	# The recordings go back to the parent in shared memory, which attaches to and owns the segments
+	handles = []
+	for world in run_analysis_worlds(simulation_type, simulation_params, brain, n_freq, world_seeds):
+		shared_world = SharedArrays.create_from_arrays(world)
+		handles += [shared_world.get_handle()]
+		shared_world.close()
+	return handles
+
+
+class AnalysisCache(object):
+	def __init__(self, directory: Path, n_worlds: int = 20, base_seed: int = 0, n_workers: int = 1):
+		self.directory	: Path	= directory.joinpath(ANALYSIS_DIRECTORY)
+		self.n_worlds	: int	= n_worlds
+		self.base_seed	: int	= base_seed
+		self.n_workers	: int	= n_workers
+
+	def get_world_seeds(self) -> list[int]:
+		return list(range(self.base_seed, self.base_seed + self.n_worlds))
+
+	def get_key(self, training_replay: TrainingReplay) -> str:
+		if training_replay.brain == None:
+			raise Exception(f"{self.__class__.__name__}: get_key: Training has not been completed")
+		simulation_params = training_replay.generate_simulation_parameters(training_replay.brain)
+		del simulation_params["brain"]
+		return sha1(json.dumps({
+			"version"			: ANALYSIS_CACHE_VERSION,
+			"brain"				: BrainStore.get_key(training_replay.brain.to_dict()),
+			"simulation-type"	: training_replay.simulation_type,
+			"simulation-params"	: simulation_params,
+			"seeds"				: self.get_world_seeds()
+		}, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+	def get_path(self, training_replay: TrainingReplay) -> Path:
+		return self.directory.joinpath(f"{self.get_key(training_replay)}.npz")
+
+	def record(self, training_replay: TrainingReplay) -> list[dict[str, np.ndarray]]:
+		brain = training_replay.brain
+		if brain == None:
+			raise Exception(f"{self.__class__.__name__}: record: Training has not been completed")
+		simulation_params = training_replay.generate_simulation_parameters(brain)
+		del simulation_params["brain"]
+		n_freq = training_replay.n_freq if training_replay.n_freq != None else 0
+		args = (training_replay.simulation_type, simulation_params, brain, n_freq)
+		seeds = self.get_world_seeds()
+		if self.n_workers <= 1:
+			return run_analysis_worlds(*args, seeds)
+		chunks = [seeds[i::self.n_workers] for i in range(self.n_workers) if seeds[i::self.n_workers]]
+		SharedArrays.ensure_tracker()
+		with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+			results = list(executor.map(run_shared_analysis_worlds, *zip(*[args + (chunk,) for chunk in chunks])))
+		# Restore seed order so the cached worlds do not depend on the number of workers
+		worlds = {}
+		for chunk, handles in zip(chunks, results):
+			worlds |= {world_seed : SharedArrays.attach(handle) for world_seed, handle in zip(chunk, handles)}
+		return [worlds[world_seed] for world_seed in seeds]
+
+	def save(self, path: Path, worlds: list[dict[str, np.ndarray]]) -> None:
+		arrays = {
+			f"{i}/{key}" : column for i, world in enumerate(worlds) for key, column in world.items()
+		} | {"n-worlds" : np.array(len(worlds))}
+		self.directory.mkdir(parents=True, exist_ok=True)
+		with open(path.with_name(f".{path.name}.{getpid()}.tmp"), "wb") as fp:
+			np.savez_compressed(fp, **arrays)
+		replace(path.with_name(f".{path.name}.{getpid()}.tmp"), path)
+
+	def load(self, path: Path) -> list[dict[str, np.ndarray]]:
+		worlds : list[dict[str, np.ndarray]] = []
+		with np.load(path, allow_pickle=False) as fp:
+			for i in range(int(fp["n-worlds"])):
+				worlds += [{
+					key.split("/", 1)[1] : fp[key] for key in fp.files if key.startswith(f"{i}/")
+				}]
+		return worlds
+
+	def get_worlds(self, training_replay: TrainingReplay) -> list[dict[str, np.ndarray]]:
+		path = self.get_path(training_replay)
+		if path.exists():
+			return self.load(path)
+		worlds = self.record(training_replay)
+		self.save(path, worlds)
+		return worlds
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from src.agent.brain	import BrainStore, get_brain_n_nodes_from_data
+
+import json
+import numpy			as np
+from collections.abc	import Iterator, Mapping
+from os				import getpid, replace
+from pathlib			import Path
+from typing				import Any, Optional
+
+
+COLUMNAR_FORMAT_VERSION = 2
+# Version 1 kept the brain table in the header
+READABLE_FORMAT_VERSIONS = (1, 2)
+
+COLUMN_KEYS = (
+	"sim-ids", "durations", "n-nodes", "agent-offsets", "agent-lifetimes", "food-offsets",
+	"food-first-time-step", "food-last-time-step", "food-eaten", "food-poisonous"
+)
+# Files written before these columns existed take the types from the header
+OPTIONAL_COLUMN_KEYS = ("brain-refs", "agent-type-names", "agent-types", "food-type-names", "food-types")
+
+
+def types_to_columns(types: list[str]) -> tuple[np.ndarray, np.ndarray]:
+	# The type strings to_dict wrote, which can differ from the parameter names, e.g. "sounds-agent"
+	names = sorted(set(types))
+	indices = {name: i for i, name in enumerate(names)}
+	return np.array(names, dtype=np.str_), np.array([indices[name] for name in types], dtype=np.int16)
+
+def simulations_to_columns(
+	simulations: dict[str, dict[str, Any]], brain_store: BrainStore
+) -> dict[str, np.ndarray]:
+	sims = list(simulations.values())
+	agents = [agent for sim in sims for agent in sim["agents"]]
+	food = [food for sim in sims for food in sim["food"]]
+	brain_refs = [brain_store.intern(sim["brain"]) if "brain" in sim else None for sim in sims]
+	columns = {
+		"sim-ids"				: np.array(list(simulations.keys()), dtype=np.str_),
+		"durations"				: np.array([sim["duration"] for sim in sims], dtype=np.int32),
+		"n-nodes"				: np.array([
+			sim["n-nodes"] if "n-nodes" in sim else get_brain_n_nodes_from_data(brain_store.get(brain_ref))
+			for sim, brain_ref in zip(sims, brain_refs)
+		], dtype=np.int32),
+		"agent-offsets"			: np.cumsum([0] + [len(sim["agents"]) for sim in sims], dtype=np.int64),
+		"agent-lifetimes"		: np.array([agent["lifetime"] for agent in agents], dtype=np.int32),
+		"food-offsets"			: np.cumsum([0] + [len(sim["food"]) for sim in sims], dtype=np.int64),
+		"food-first-time-step"	: np.array([f["first-time-step"] for f in food], dtype=np.int32),
+		"food-last-time-step"	: np.array([f["last-time-step"] for f in food], dtype=np.int32),
+		"food-eaten"			: np.array([f["eaten"] for f in food], dtype=np.bool_),
+		"food-poisonous"		: np.array([f["poisonous"] for f in food], dtype=np.bool_)
+	}
+	columns["agent-type-names"], columns["agent-types"] = types_to_columns([agent["type"] for agent in agents])
+	columns["food-type-names"], columns["food-types"] = types_to_columns([f["type"] for f in food])
+	if None not in brain_refs:
+		columns["brain-refs"] = np.array(brain_refs, dtype=np.str_)
+	return columns
+
+def columns_to_simulations(columns: dict[str, np.ndarray], header: dict[str, Any]) -> dict[str, dict[str, Any]]:
+	durations = columns["durations"].tolist(); n_nodes = columns["n-nodes"].tolist()
+	agent_offsets = columns["agent-offsets"].tolist(); lifetimes = columns["agent-lifetimes"].tolist()
+	food_offsets = columns["food-offsets"].tolist()
+	first_time_steps = columns["food-first-time-step"].tolist()
+	last_time_steps = columns["food-last-time-step"].tolist()
+	eaten = columns["food-eaten"].tolist(); poisonous = columns["food-poisonous"].tolist()
+
+	brain_refs = columns["brain-refs"].tolist() if "brain-refs" in columns else None
+	if "agent-types" in columns:
+		agent_type_names = columns["agent-type-names"].tolist()
+		agent_types = [agent_type_names[i] for i in columns["agent-types"].tolist()]
+	else:
+		agent_types = [header["agent-type"]] * len(lifetimes)
+	if "food-types" in columns:
+		food_type_names = columns["food-type-names"].tolist()
+		food_types = [food_type_names[i] for i in columns["food-types"].tolist()]
+	else:
+		food_types = [header["food-type"]] * len(eaten)
+
+	simulations = {}
+	for i, sim_id in enumerate(columns["sim-ids"].tolist()):
+		simulations[sim_id] = {
+			"type"		: header["simulation-type"],
+			"duration"	: durations[i],
+			"n-nodes"	: n_nodes[i],
+			"agents"	: [
+				{"type" : agent_types[j], "lifetime" : lifetimes[j]}
+				for j in range(agent_offsets[i], agent_offsets[i + 1])
+			],
+			"food"		: [
+				{
+					"type"				: food_types[j],
+					"first-time-step"	: first_time_steps[j],
+					"last-time-step"	: last_time_steps[j],
+					"eaten"				: eaten[j],
+					"poisonous"			: poisonous[j]
+				} for j in range(food_offsets[i], food_offsets[i + 1])
+			]
+		}
+		if brain_refs != None: simulations[sim_id]["brain"] = brain_refs[i]
+	return simulations
+
+def save_columnar_training_data(data: dict[str, Any], path: str | Path) -> None:
+	brain_store = BrainStore(data["brains"] if "brains" in data else None)
+	arrays = {}
+	for gen_id, gen in data["simulations"].items():
+		for key, column in simulations_to_columns(gen, brain_store).items():
+			arrays[f"{gen_id}/{key}"] = column
+	header = {key: val for key, val in data.items() if key not in ("simulations", "brains")} | {
+		"format-version"	: COLUMNAR_FORMAT_VERSION,
+		"generations"		: list(data["simulations"].keys())
+	}
+	if "brain" in header: header["brain"] = brain_store.intern(header["brain"])
+	arrays["header"] = np.array(json.dumps(header, separators=(',', ':')))
+	# The networks are members of their own so that reading the header does not parse them. The final
+	# brain is also stored alone, a replay that only needs it never reads the table.
+	arrays["brains"] = np.array(json.dumps(brain_store.to_dict(), separators=(',', ':')))
+	if "brain" in header:
+		arrays["brain"] = np.array(json.dumps(brain_store.get(header["brain"]), separators=(',', ':')))
+	path = Path(path)
+	with open(path.with_name(f".{path.name}.{getpid()}.tmp"), "wb") as fp:
+		np.savez_compressed(fp, **arrays)
+	replace(path.with_name(f".{path.name}.{getpid()}.tmp"), path)
+
+def load_columnar_training_header(path: str | Path) -> dict[str, Any]:
+	with np.load(path, allow_pickle=False) as fp:
+		header = json.loads(str(fp["header"]))
+	if header["format-version"] not in READABLE_FORMAT_VERSIONS:
+		raise Exception(f"Unsupported columnar training data version: {header['format-version']}")
+	return header
+
+def load_columnar_training_data(path: str | Path) -> dict[str, Any]:
+	header = load_columnar_training_header(path)
+	generations = header.pop("generations")
+	if header.pop("format-version") > 1:
+		header["brains"] = ColumnarBrains(path)
+		if "brain" in header:
+			with np.load(path, allow_pickle=False) as fp:
+				header["brain"] = json.loads(str(fp["brain"]))
+	return header | {"simulations" : ColumnarGenerations(path, header, generations)}
+
+
+class ColumnarBrains(Mapping[str, dict[str, Any]]):
+	# The brain table of a file, read on the first lookup
+	def __init__(self, path: str | Path):
+		self.path	: Path							= Path(path)
+		self.brains	: Optional[dict[str, Any]]		= None
+
+	def get_brains(self) -> dict[str, dict[str, Any]]:
+		if self.brains == None:
+			with np.load(self.path, allow_pickle=False) as fp:
+				self.brains = json.loads(str(fp["brains"]))
+		return self.brains
+
+	def __getitem__(self, key: str) -> dict[str, Any]:
+		return self.get_brains()[key]
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self.get_brains())
+
+	def __len__(self) -> int:
+		return len(self.get_brains())
+
+
+class ColumnarGenerations(Mapping[str, dict[str, dict[str, Any]]]):
+	def __init__(self, path: str | Path, header: dict[str, Any], generations: list[str]):
+		self.path			: Path				= Path(path)
+		self.header			: dict[str, Any]	= header
+		self.generations	: list[str]			= generations
+
+	def get_columns(self, gen_id: str) -> dict[str, np.ndarray]:
+		if gen_id not in self.generations:
+			raise KeyError(gen_id)
+		with np.load(self.path, allow_pickle=False) as fp:
+			return {
+				key: fp[f"{gen_id}/{key}"] for key in COLUMN_KEYS + OPTIONAL_COLUMN_KEYS if f"{gen_id}/{key}" in fp
+			}
+
+	def __getitem__(self, gen_id: str) -> dict[str, dict[str, Any]]:
+		return columns_to_simulations(self.get_columns(gen_id), self.header)
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self.generations)
+
+	def __len__(self) -> int:
+		return len(self.generations)
+
+
+def convert_saved_data(start_directory: Path) -> list[Path]:
+	converted = []
+	for path in start_directory.iterdir():
+		if path.is_dir():
+			converted += convert_saved_data(path)
+		elif path.suffix == ".json" and not path.with_suffix(".npz").exists():
+			with open(path, "r") as fp:
+				data = json.load(fp)
+			if "type" not in data or "simulations" not in data:
+				continue
+			save_columnar_training_data(data, path.with_suffix(".npz"))
+			converted += [path.with_suffix(".npz")]
+	return converted
\ No newline at end of file
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import numpy	as np
+
+
+class FoodLifetimeIndex(object):
+	# Food is simulated before the agents, so during time step t the food alive is the food with
+	# first_time_step <= t < last_time_step.
+	def __init__(
+		self, positions: np.ndarray, first_time_steps: np.ndarray, last_time_steps: np.ndarray,
+		poisonous: np.ndarray
+	):
+		self.positions	: np.ndarray	= np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+		self.poisonous	: np.ndarray	= np.asarray(poisonous, dtype=np.bool_)
+
+		first_time_steps = np.asarray(first_time_steps, dtype=np.int64)
+		lifetimes = np.maximum(np.asarray(last_time_steps, dtype=np.int64) - first_time_steps, 0)
+		n_time_steps = int((first_time_steps + lifetimes).max()) + 1 if len(lifetimes) > 0 else 1
+
+		# Active food per time step in CSR form: the food alive at t is indices[offsets[t]:offsets[t + 1]]
+		food_ids = np.repeat(np.arange(len(lifetimes)), lifetimes)
+		time_steps = first_time_steps[food_ids] + np.arange(len(food_ids)) - np.repeat(np.cumsum(lifetimes) - lifetimes, lifetimes)
+		order = np.argsort(time_steps, kind="stable")
+		self.indices	: np.ndarray	= food_ids[order]
+		self.offsets	: np.ndarray	= np.concatenate(([0], np.cumsum(np.bincount(time_steps, minlength=n_time_steps))))
+
+	def get_alive_food(self, time_step: int) -> np.ndarray:
+		if time_step < 0 or time_step >= len(self.offsets) - 1:
+			return self.indices[:0]
+		return self.indices[self.offsets[time_step]:self.offsets[time_step + 1]]
+
+	def get_closest_food_distances(
+		self, xs: np.ndarray, ys: np.ndarray, time_steps: np.ndarray
+	) -> tuple[np.ndarray, np.ndarray]:
+		# Distances to the closest regular and closest poisonous food alive at each query's time step,
+		# inf where there is none.
+		time_steps = np.asarray(time_steps, dtype=np.int64)
+		in_range = (time_steps >= 0) & (time_steps < len(self.offsets) - 1)
+		safe_time_steps = np.where(in_range, time_steps, 0)
+		starts = np.where(in_range, self.offsets[safe_time_steps], 0)
+		counts = np.where(in_range, self.offsets[safe_time_steps + 1] - starts, 0)
+
+		query_ids = np.repeat(np.arange(len(counts)), counts)
+		food_ids = self.indices[np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(len(query_ids))]
+		distances = np.hypot(
+			self.positions[food_ids, 0] - np.asarray(xs, dtype=np.float64)[query_ids],
+			self.positions[food_ids, 1] - np.asarray(ys, dtype=np.float64)[query_ids]
+		)
+
+		regular = np.full(len(counts), np.inf); poisonous = np.full(len(counts), np.inf)
+		is_poisonous = self.poisonous[food_ids]
+		np.minimum.at(regular, query_ids[~is_poisonous], distances[~is_poisonous])
+		np.minimum.at(poisonous, query_ids[is_poisonous], distances[is_poisonous])
+		return regular, poisonous
+
+	@staticmethod
+	def create_from_world(world: dict[str, np.ndarray]) -> 'FoodLifetimeIndex':
+		return FoodLifetimeIndex(
+			world["food-positions"], world["food-first-time-step"], world["food-last-time-step"],
+			world["food-poisonous"]
+		)
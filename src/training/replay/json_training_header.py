@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib	import Path
+from typing		import Any, Optional, TextIO
+
+
+# Members holding the bulk of a training result. Files written with BULK_LAST_KEY set have them after
+# every other member, so their header ends at the first of them.
+TRAINING_DATA_BULK_KEYS = ("simulations", "brains")
+BULK_LAST_KEY = "bulk-last"
+
+WHITESPACE = re.compile(r"\s*")
+DELIMITERS = ",:}] \t\n\r"
+
+
+def order_training_data(data: dict[str, Any]) -> dict[str, Any]:
+	return {key: val for key, val in data.items() if key not in TRAINING_DATA_BULK_KEYS} | {BULK_LAST_KEY : True} | {
+		key: data[key] for key in TRAINING_DATA_BULK_KEYS if key in data
+	}
+
+
+class JsonMemberReader(object):
+	# Decodes a JSON object one member at a time, reading the file only as far as the members asked for
+	def __init__(self, fp: TextIO, chunk_size: int = 1 << 16):
+		self.fp			: TextIO			= fp
+		self.chunk_size	: int				= chunk_size
+		self.decoder	: json.JSONDecoder	= json.JSONDecoder()
+		self.text		: str				= ""
+		self.position	: int				= 0
+
+	def read_more(self) -> None:
+		chunk = self.fp.read(self.chunk_size)
+		if chunk == "":
+			raise Exception(f"{self.__class__.__name__}: Unexpected end of file")
+		self.text = self.text[self.position:] + chunk
+		self.position = 0
+
+	def peek(self) -> str:
+		while True:
+			self.position = WHITESPACE.match(self.text, self.position).end()
+			if self.position < len(self.text):
+				return self.text[self.position]
+			self.read_more()
+
+	def expect(self, char: str) -> None:
+		if self.peek() != char:
+			raise Exception(f"{self.__class__.__name__}: Expected {char!r}, found {self.peek()!r}")
+		self.position += 1
+
+	def decode(self) -> Any:
+		self.peek()
+		while True:
+			# Keys and values are always followed by a delimiter, a number cut in two, like "12" of "12.5",
+			# decodes but is not followed by one and continues in the next chunk
+			try:
+				value, end = self.decoder.raw_decode(self.text, self.position)
+				if end < len(self.text) and self.text[end] in DELIMITERS:
+					self.position = end
+					return value
+			except json.JSONDecodeError:
+				pass
+			self.read_more()
+
+
+def load_json_training_header(path: Path, chunk_size: int = 1 << 16) -> Optional[dict[str, Any]]:
+	# Returns None for files that have members after their bulk, these need to be parsed whole
+	header = {}
+	with open(path, "r") as fp:
+		reader = JsonMemberReader(fp, chunk_size)
+		reader.expect("{")
+		while reader.peek() != "}":
+			key = reader.decode()
+			reader.expect(":")
+			if key in TRAINING_DATA_BULK_KEYS:
+				return header if header.get(BULK_LAST_KEY) == True else None
+			header[key] = reader.decode()
+			if reader.peek() == ",":
+				reader.expect(",")
+	return header
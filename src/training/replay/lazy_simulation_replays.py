@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from src.agent.brain								import BrainStore
+from src.simulation.replay							import load_simulation_replay_from_data
+from src.training.replay.columnar_training_data	import ColumnarGenerations, simulations_to_columns
+
+import numpy			as np
+from collections.abc	import Iterator, Mapping
+from typing				import Any, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from src.simulation.replay	import SimulationReplay
+
+
+class LazySimulationReplays(Mapping[str, dict[str, "SimulationReplay"]]):
+	def __init__(
+		self, simulations: Mapping[str, Mapping[str, dict[str, Any]]], brain_store: Optional[BrainStore] = None
+	):
+		self.simulations	: Mapping[str, Mapping[str, dict[str, Any]]]	= simulations
+		self.brain_store	: Optional[BrainStore]							= brain_store
+		self.loaded			: dict[str, dict[str, SimulationReplay]]		= {}
+		self.columns		: dict[str, dict[str, np.ndarray]]				= {}
+
+	def is_loaded(self, gen_id: str) -> bool:
+		return gen_id in self.loaded
+
+	def get_columns(self, gen_id: str) -> dict[str, np.ndarray]:
+		if gen_id not in self.columns:
+			if isinstance(self.simulations, ColumnarGenerations):
+				self.columns[gen_id] = self.simulations.get_columns(gen_id)
+			else:
+				if self.brain_store == None: self.brain_store = BrainStore()
+				self.columns[gen_id] = simulations_to_columns(self.simulations[gen_id], self.brain_store)
+		return self.columns[gen_id]
+
+	def __getitem__(self, gen_id: str) -> dict[str, SimulationReplay]:
+		if gen_id not in self.loaded:
+			self.loaded[gen_id] = {
+				sim_id : load_simulation_replay_from_data(sim_data, self.brain_store)
+				for sim_id, sim_data in self.simulations[gen_id].items()
+			}
+		return self.loaded[gen_id]
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self.simulations)
+
+	def __len__(self) -> int:
+		return len(self.simulations)
\ No newline at end of file
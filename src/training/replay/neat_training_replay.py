@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from src.agent.brain		import load_brain_from_data
-from src.simulation.replay	import load_simulation_replay_from_data
-from src.training.replay	import TrainingReplay
+from src.agent.brain		import BrainStore, load_brain_from_data
+from src.training.replay							import TrainingReplay
+from src.training.replay.lazy_simulation_replays	import LazySimulationReplays
 
-from typing	import Any, TYPE_CHECKING
+import numpy			as np
+from collections.abc	import Mapping
+from typing				import Any, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
-	from src.simulation.replay	import SimulationReplay
 	from src.training.replay	import GraphData
 
 
@@ -17,8 +18,8 @@ class NeatTrainingReplay(TrainingReplay):
 		agents_lifespan: int, agents_lifespan_extension: int, food_type: str, food_lifespan: int,
 		perception_distance: int, eating_distance: int, eating_number: int, max_time_steps: int,
 		perception_processor_type: str, simulation_type: str,perception_nodes: list[str], config_file: str, config_params: dict[str, Any],
-		simulations: dict[str, dict[str, dict[str, Any]]], duration: float, average_performance: float,
-		max_performance: int
+		simulations: Mapping[str, Mapping[str, dict[str, Any]]], duration: float, average_performance: float,
+		max_performance: int, brain_store: Optional[BrainStore] = None
 	):
 		super().__init__(
 			n_generations, width, height, n_agents, agent_type, agents_lifespan, agents_lifespan_extension,
@@ -27,14 +28,16 @@ class NeatTrainingReplay(TrainingReplay):
 		)
 		self.config_file				: str	= config_file
 		self.config_params				: dict[str, Any]							= config_params
-		self.simulations 				: dict[str, dict[str, SimulationReplay]]	= {
-			gen_id: {
-				sim_id : load_simulation_replay_from_data(sim_data)
-				for sim_id, sim_data in gen.items()
-			} for gen_id, gen in simulations.items()
-		}
+		self.simulations 				: LazySimulationReplays						= LazySimulationReplays(
+			simulations, brain_store
+		)
 	
 	def get_fitness_graph_data(self) -> GraphData:
+		data = []
+		for gen_id in self.simulations:
+			columns = self.simulations.get_columns(gen_id)
+			eaten = np.count_nonzero(columns["food-eaten"] & ~columns["food-poisonous"])
+			data += [int(eaten) / len(columns["sim-ids"])]
 		return {
 			"title": "",
 			"filename": "fitness",
@@ -42,13 +45,7 @@ class NeatTrainingReplay(TrainingReplay):
 			"y-label": "",
 			"width": 0.23,
 			"colour": '#D81B60',
-			"data": [
-				sum([
-					sum([1 for food in sim.food if food["eaten"] and food["poisonous"] == False])
-					for sim in gen.values()
-				]) / len(gen.values())
-				for _, gen in self.simulations.items()
-			]
+			"data": data
 		}
 
 	def get_node_graph_data(self) -> GraphData:
@@ -60,8 +57,8 @@ class NeatTrainingReplay(TrainingReplay):
 			"width": 0.23,
 			"colour": '#1E88E5',
 			"data": [
-				sum([sim.brain.get_n_nodes() for sim in gen.values()]) / len(gen.values())
-				for _, gen in self.simulations.items()
+				int(columns["n-nodes"].sum()) / len(columns["sim-ids"])
+				for columns in map(self.simulations.get_columns, self.simulations)
 			]
 		}
 	
@@ -74,14 +71,25 @@ class NeatTrainingReplay(TrainingReplay):
 			"width": 0.23,
 			"colour": '#D81B60',
 			"data": [
-				sum([
-					sim.duration for sim in gen.values()
-				]) / len(gen.values())
-				for _, gen in self.simulations.items()
+				int(columns["durations"].sum()) / len(columns["sim-ids"])
+				for columns in map(self.simulations.get_columns, self.simulations)
 			]
 		}
 
 	def get_food_graph_data(self) -> GraphData:
+		columns = [self.simulations.get_columns(gen_id) for gen_id in self.simulations]
+		durations = np.concatenate([c["durations"] for c in columns]).astype(np.int64)
+		first_time_steps = np.concatenate([c["food-first-time-step"] for c in columns]).astype(np.int64)
+		last_time_steps = np.concatenate([c["food-last-time-step"] for c in columns]).astype(np.int64)
+		n_steps = int(durations.max())
+
+		# food i is active on steps [first, last): +1 at its first step, -1 at its last step
+		active = first_time_steps < last_time_steps
+		diff = np.bincount(np.minimum(first_time_steps[active], n_steps), minlength=n_steps + 1) -\
+			np.bincount(np.minimum(last_time_steps[active], n_steps), minlength=n_steps + 1)
+		n_food = np.cumsum(diff)[:n_steps]
+		# simulations still running at step i are those with duration > i
+		n_running = len(durations) - np.cumsum(np.bincount(durations, minlength=n_steps + 1))[:n_steps]
 		return {
 			"title": "",
 			"filename": "food",
@@ -89,24 +97,7 @@ class NeatTrainingReplay(TrainingReplay):
 			"y-label": "",
 			"width": 0.23,
 			"colour": '#FFC107',
-			"data": [sum([
-				sum([
-					len([
-						1 for food in sim.food
-						if food["first-time-step"] <= i and food["last-time-step"] > i
-					])
-					for sim in gen.values()
-				]) for _, gen in self.simulations.items()]) / sum([
-						len([1 for sim in gen.values()
-							if sim.duration > i
-						])
-					for _, gen in self.simulations.items()
-				])
-				for i in range(max([
-						max([sim.duration for sim in gen.values()])
-					for _, gen in self.simulations.items()
-				]))
-			]
+			"data": (n_food / n_running).tolist()
 		}
 	
 	def get_graphs_data(self) -> list[GraphData]:
@@ -119,19 +110,20 @@ class NeatTrainingReplay(TrainingReplay):
 
 	@staticmethod
 	def load_from_data(data: dict[str, Any]) -> 'NeatTrainingReplay':
+		brain_store = BrainStore(data["brains"]) if "brains" in data else None
 		training_replay = NeatTrainingReplay(
 			data["n-generations"], data["width"], data["height"], data["n-agents"], data["agent-type"],
 			data["agents-lifespan"], data["agents-lifespan-extension"], data["food-type"], data["food-lifespan"],
 			data["perception-distance"], data["eating-distance"], data["eating-number"], data["max-time-steps"],
 			data["perception-processor-type"], data["simulation-type"], data["perception-nodes"], data["config-file"],
 			data["config-params"], data["simulations"], data["duration"], data["average-performance"],
-			data["max-performance"]
+			data["max-performance"], brain_store
 		)
 		if "food-spawn-rate" in data: training_replay.food_spawn_rate = data["food-spawn-rate"]
 		if "n-food" in data: training_replay.n_food = data["n-food"]
 		if "poisonous-food-rate" in data: training_replay.poisonous_food_rate = data["poisonous-food-rate"]
 		if "poisonous-perception-distance" in data: training_replay.poisonous_perception_distance = data["poisonous-perception-distance"]
-		if "brain" in data: training_replay.brain = load_brain_from_data(data["brain"])
+		if "brain" in data: training_replay.brain = load_brain_from_data(data["brain"], brain_store)
 		if "normalized" in data: training_replay.normalized = data["normalized"]
 		if "n-cones" in data: training_replay.n_cones = data["n-cones"]
 		if "fov" in data: training_replay.fov = data["fov"]
@@ -140,4 +132,5 @@ class NeatTrainingReplay(TrainingReplay):
 		if "see-poisonous-food" in data: training_replay.see_poisonous_food = data["see-poisonous-food"]
 		if "see-walls" in data: training_replay.see_walls = data["see-walls"]
 		if "n-freq" in data: training_replay.n_freq = data["n-freq"]
+		if "run-key" in data: training_replay.run_key = data["run-key"]
 		return training_replay
\ No newline at end of file
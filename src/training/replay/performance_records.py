@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from src.utils	import write_json_atomically
+
+import json
+from hashlib	import sha1
+from os			import getpid
+from pathlib	import Path
+from time		import time_ns
+from typing		import Any
+
+
+PERFORMANCE_FILENAME = "performance.json"
+PERFORMANCE_RECORDS_DIRECTORY = "performance-records"
+
+
+# Every cell publishes its results as a new record file instead of rewriting performance.json, so that
+# cells finishing side by side, on one machine or on several over shared storage, never lose each
+# other's updates. Readers merge the newest record of every cell.
+
+def get_cell_key(config_name: str, eating_number: int) -> str:
+	return sha1(json.dumps([config_name, eating_number]).encode()).hexdigest()[:16]
+
+def publish_cell_performance(
+	training_directory: Path, config_name: str, eating_number: int, average_performance: list[float],
+	max_performance: list[float]
+) -> Path:
+	records_directory = training_directory.joinpath(PERFORMANCE_RECORDS_DIRECTORY)
+	records_directory.mkdir(parents=True, exist_ok=True)
+	cell_key = get_cell_key(config_name, eating_number)
+	published = time_ns()
+	path = records_directory.joinpath(f"{cell_key}.{published}.{getpid()}.json")
+	write_json_atomically(path, {
+		"config"				: config_name,
+		"eating-number"			: eating_number,
+		"published"				: published,
+		"average-performance"	: average_performance,
+		"max-performance"		: max_performance
+	})
+	# Older records of the cell are superseded, a newer one written meanwhile by another worker stays
+	for old_path in records_directory.glob(f"{cell_key}.*.json"):
+		if get_record_order(old_path) < get_record_order(path):
+			old_path.unlink(missing_ok=True)
+	return path
+
+def get_record_order(path: Path) -> tuple[int, str]:
+	return int(path.name.split(".")[1]), path.name
+
+def load_performance(training_directory: Path) -> dict[str, dict[str, dict[str, list[float]]]]:
+	# Results of cells that only exist in a performance.json written before the records were introduced
+	# are kept, the records take precedence
+	performance : dict[str, dict[str, dict[str, list[float]]]] = {}
+	performance_path = training_directory.joinpath(PERFORMANCE_FILENAME)
+	if performance_path.exists():
+		with open(performance_path, "r") as fp:
+			for config_name, cells in json.load(fp).items():
+				for eating_number, cell in cells.items():
+					performance.setdefault(config_name, {})[str(eating_number)] = cell
+	records_directory = training_directory.joinpath(PERFORMANCE_RECORDS_DIRECTORY)
+	if records_directory.exists():
+		loaded : set[str] = set()
+		for path in sorted(records_directory.glob("*.json"), key=get_record_order, reverse=True):
+			cell_key = path.name.split(".")[0]
+			if cell_key in loaded:
+				continue
+			try:
+				with open(path, "r") as fp:
+					record : dict[str, Any] = json.load(fp)
+			except FileNotFoundError:
+				# Superseded since the listing, an older record of the cell stands in until the next load
+				continue
+			loaded.add(cell_key)
+			performance.setdefault(record["config"], {})[str(record["eating-number"])] = {
+				"average-performance"	: record["average-performance"],
+				"max-performance"		: record["max-performance"]
+			}
+	return {
+		config_name : dict(sorted(performance[config_name].items(), key=lambda item: int(item[0])))
+		for config_name in sorted(performance)
+	}
+
+def save_performance(training_directory: Path) -> dict[str, dict[str, dict[str, list[float]]]]:
+	# performance.json is only a merged snapshot of the records, kept for the readers of the old file
+	performance = load_performance(training_directory)
+	write_json_atomically(training_directory.joinpath(PERFORMANCE_FILENAME), performance, 2)
+	return performance
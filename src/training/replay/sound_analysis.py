@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import numpy	as np
+
+
+def get_sound_code_indices(codes: np.ndarray) -> np.ndarray:
+	# Same order as itertools.product([0, 1], repeat=n_freq)
+	weights = 1 << np.arange(codes.shape[1] - 1, -1, -1, dtype=np.int64)
+	return (codes.astype(np.int64) != 0) @ weights
+
+# Distances of every other living agent to each sound origin over the n_lags time steps after the
+# sound, reduced per sound code to (sum(d/(d+1)), sum(1/(d+1))) so that worlds can be summed.
+# A sound of step t is emitted after its agent moved, from positions[:, t + 1], so lag 0 compares
+# the listeners' positions after that same step. An agent dead at step L has no move after index L.
+def accumulate_sound_follow_distances(
+	world: dict[str, np.ndarray], n_freq: int, n_lags: int = 20, chunk_size: int = 4096
+) -> tuple[np.ndarray, np.ndarray]:
+	numerators = np.zeros(((1 << n_freq) * n_lags,), dtype=np.float64)
+	denominators = np.zeros(((1 << n_freq) * n_lags,), dtype=np.float64)
+
+	positions = world["agent-positions"]
+	agent_ids = world["agent-ids"]
+	last_time_steps = world["agent-last-time-step"]
+	if len(world["sound-time-steps"]) == 0 or len(agent_ids) == 0:
+		return numerators.reshape(-1, n_lags), denominators.reshape(-1, n_lags)
+	lags = np.arange(n_lags)
+
+	for start in range(0, len(world["sound-time-steps"]), chunk_size):
+		time_steps = world["sound-time-steps"][start:start + chunk_size]
+		emitters = world["sound-agent-ids"][start:start + chunk_size]
+		origins = world["sound-positions"][start:start + chunk_size]
+		codes = get_sound_code_indices(world["sound-codes"][start:start + chunk_size])
+
+		# (sounds, agents, lags)
+		ticks = time_steps[:, None, None] + 1 + lags[None, None, :]
+		valid = (ticks <= last_time_steps[None, :, None]) & (agent_ids[None, :] != emitters[:, None])[:, :, None]
+		ticks = np.minimum(ticks, positions.shape[1] - 1)
+		agent_positions = positions[np.arange(len(agent_ids))[None, :, None], ticks]
+		distances = np.hypot(
+			agent_positions[..., 0] - origins[:, None, None, 0], agent_positions[..., 1] - origins[:, None, None, 1]
+		)
+		valid &= ~np.isnan(distances)
+
+		bins = np.broadcast_to(codes[:, None, None] * n_lags + lags[None, None, :], valid.shape)[valid]
+		distances = distances[valid].astype(np.float64)
+		numerators += np.bincount(bins, weights=distances / (distances + 1), minlength=len(numerators))
+		denominators += np.bincount(bins, weights=1 / (distances + 1), minlength=len(denominators))
+	return numerators.reshape(-1, n_lags), denominators.reshape(-1, n_lags)
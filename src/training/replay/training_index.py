@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from src.training.replay	import (
+	TRAINING_INDEX_FILENAME, get_training_data_paths, load_training_data_from_file,
+	load_training_header_from_file, load_training_replay_from_data
+)
+
+import json
+from os			import getpid, replace
+from pathlib	import Path
+from typing		import Any
+
+
+TRAINING_INDEX_VERSION = 2
+
+
+def summarize_training_run(path: Path) -> dict[str, Any]:
+	stat = path.stat()
+	training_replay = load_training_replay_from_data(load_training_data_from_file(path))
+	return {
+		"file"					: path.name,
+		"mtime-ns"				: stat.st_mtime_ns,
+		"size"					: stat.st_size,
+		"average-performance"	: training_replay.average_performance,
+		"max-performance"		: training_replay.max_performance,
+		"n-nodes"				: training_replay.brain.get_n_nodes() if training_replay.brain != None else None,
+		"perception-nodes"		: training_replay.perception_nodes,
+		"n-freq"				: training_replay.n_freq,
+		"run-key"				: training_replay.run_key,
+		"graphs"				: training_replay.get_graphs_data()
+	}
+
+def is_run_summary_stale(summary: dict[str, Any], path: Path) -> bool:
+	stat = path.stat()
+	return summary["file"] != path.name or summary["mtime-ns"] != stat.st_mtime_ns or summary["size"] != stat.st_size
+
+def load_training_index(directory: Path) -> dict[str, Any]:
+	index_path = directory.joinpath(TRAINING_INDEX_FILENAME)
+	if index_path.exists():
+		with open(index_path, "r") as fp:
+			index = json.load(fp)
+		if index["version"] == TRAINING_INDEX_VERSION:
+			return index
+	return {"version" : TRAINING_INDEX_VERSION, "best-run" : None, "runs" : {}}
+
+def update_training_index(directory: Path) -> dict[str, Any]:
+	index = load_training_index(directory)
+	runs = {}
+	for path in get_training_data_paths(directory):
+		if path.stem in index["runs"] and not is_run_summary_stale(index["runs"][path.stem], path):
+			runs[path.stem] = index["runs"][path.stem]
+		elif "type" not in load_training_header_from_file(path):
+			# Not a training result
+			continue
+		else:
+			runs[path.stem] = summarize_training_run(path)
+	if runs == index["runs"]:
+		return index
+
+	index["runs"] = runs
+	index["best-run"] = max(runs, key=lambda run_id: runs[run_id]["average-performance"]) if runs else None
+	index_path = directory.joinpath(TRAINING_INDEX_FILENAME)
+	temp_path = index_path.with_suffix(f".{getpid()}.tmp")
+	with open(temp_path, "w") as fp:
+		json.dump(index, fp, separators=(',', ':'))
+	replace(temp_path, index_path)
+	return index
\ No newline at end of file
@@ -12,6 +12,17 @@ from typing	import Any, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
 	from src.agent.brain		import Brain
 	from src.training.replay	import GraphData
+	from src.utils				import RenderQueue
+
+
+def render_training_replay_graph(data: GraphData, path: str) -> None:
+	_, ax = plt.subplots()
+	ax.plot([i for i in range(len(data["data"]))], data["data"])
+	plt.xlabel(data["x-label"])
+	plt.ylabel(data["y-label"])
+	plt.title(data["title"])
+	plt.savefig(path + f"_{data['filename']}.png")
+	plt.close('all')
 
 
 class TrainingReplay(Loadable):
@@ -53,6 +64,7 @@ class TrainingReplay(Loadable):
 		self.see_poisonous_food				: Optional[bool]	= None
 		self.see_walls						: Optional[bool]	= None
 		self.n_freq							: Optional[int]		= None
+		self.run_key						: Optional[str]		= None
 	
 	def generate_simulation_parameters(self, brain: Brain) -> dict[str, Any]:
 		simulation_params = get_simulation_parameters(self.simulation_type)
@@ -83,17 +95,14 @@ class TrainingReplay(Loadable):
 		return params
 	
 	def create_graph(self, data: GraphData, path: str) -> None:
-		_, ax = plt.subplots()
-		ax.plot([i for i in range(len(data["data"]))], data["data"])
-		plt.xlabel(data["x-label"])
-		plt.ylabel(data["y-label"])
-		plt.title(data["title"])
-		plt.savefig(path + f"_{data['filename']}.png")
-		plt.close('all')
+		render_training_replay_graph(data, path)
 	
-	def create_graphs(self, path: str) -> None:
+	def create_graphs(self, path: str, render_queue: Optional[RenderQueue] = None) -> None:
 		for graph_data in self.get_graphs_data():
-			self.create_graph(graph_data, path)
+			if render_queue == None:
+				self.create_graph(graph_data, path)
+			else:
+				render_queue.submit(render_training_replay_graph, graph_data, path)
 	
 	@abstractmethod
 	def get_graphs_data(self) -> list[GraphData]:
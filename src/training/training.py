@@ -1,15 +1,16 @@
 from __future__	import annotations
 
 from src.agent.brain.perception_processors	import get_perception_processor_parameters
-from src.simulation							import get_simulation_parameters
+from src.simulation							import SIMULATION_POOL, get_simulation_parameters
 from src.utils								import CreatableFromParameters
 
 from abc	import abstractmethod
 from typing import Any, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
-	from src.agent.brain						import Brain
+	from src.agent.brain						import Brain, BrainStore
 	from src.agent.brain.perception_processors	import PerceptionProcessor
+	from src.simulation							import Simulation
 
 
 class Training(CreatableFromParameters):
@@ -106,8 +107,15 @@ class Training(CreatableFromParameters):
 		if "poisonous-perception-distance" in simulation_params and self.poisonous_perception_distance != None:
 			params["poisonous-perception-distance"] = self.poisonous_perception_distance
 		return params
+
+	def start_simulation(self, brain: Brain) -> Simulation:
+		# Simulations of a training only differ in their brain, so finished worlds are reset from the
+		# process pool, which also validates the parameters once
+		return SIMULATION_POOL.acquire(self.simulation_type, self.generate_simulation_parameters(brain), brain)
+	def release_simulation(self, sim: Simulation) -> None:
+		SIMULATION_POOL.release(sim)
 	
-	def to_dict(self) -> dict[str, Any]:
+	def to_dict(self, brain_store: Optional[BrainStore] = None) -> dict[str, Any]:
 		data = {
 			"n-generations"					: self.n_generations,
 			"width"							: self.width,
@@ -130,7 +138,8 @@ class Training(CreatableFromParameters):
 		if self.n_food != None: data |= {"n-food" : self.n_food}
 		if self.poisonous_food_rate != None: data |= {"poisonous-food-rate" : self.poisonous_food_rate}
 		if self.poisonous_perception_distance != None: data |= {"poisonous-perception-distance" : self.poisonous_perception_distance}
-		if self.brain != None: data |= {"brain" : self.brain.to_dict()}
+		if self.brain != None:
+			data |= {"brain" : self.brain.to_dict() if brain_store == None else brain_store.add(self.brain.to_dict())}
 		if self.normalized != None: data |= {"normalized" : self.normalized}
 		if self.n_cones != None: data |= {"n-cones" : self.n_cones}
 		if self.fov != None: data |= {"fov" : self.fov}
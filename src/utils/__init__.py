@@ -1,2 +1,10 @@
 from src.utils.creatable_from_parameters	import CreatableFromParameters
-from src.utils.loadable						import Loadable
\ No newline at end of file
+from src.utils.histogram					import Histogram
+from src.utils.loadable						import Loadable
+from src.utils.render_queue					import RenderQueue
+from src.utils.result_writer					import ResultWriter, write_json_atomically
+from src.utils.shared_arrays				import SharedArrays, SharedArraysHandle
+from src.utils.task_graph					import TaskGraph
+from src.utils.trial_statistics				import (
+	FITNESS_AGGREGATIONS, aggregate_trials, get_standard_error, get_variance
+)
\ No newline at end of file
@@ -1,14 +1,54 @@
-from abc import ABC, abstractmethod
-from typing import Any
+from abc	import ABC, abstractmethod
+from typing	import Any
 
 
 class CreatableFromParameters(ABC):
+	# Classes by category and type name, filled in by register
+	registry	: dict[str, dict[str, type['CreatableFromParameters']]]	= {}
+	# get_parameters of every class, computed once
+	schemas		: dict[type, tuple[tuple[str, type], ...]]				= {}
+
 	@staticmethod
 	@abstractmethod
 	def get_parameters() -> tuple[tuple[str, type], ...]:
 		raise NotImplementedError(f"{__class__.__name__}: 'get_parameters' must be implemented in subclasses")
-	
+
 	@staticmethod
 	@abstractmethod
 	def create_from_parameters(params: dict[str, Any]) -> 'CreatableFromParameters':
-		raise NotImplementedError(f"{__class__.__name__}: 'create_from_parameters' must be implemented in subclasses")
\ No newline at end of file
+		raise NotImplementedError(f"{__class__.__name__}: 'create_from_parameters' must be implemented in subclasses")
+
+	@classmethod
+	def create_trusted(cls, params: dict[str, Any]) -> 'CreatableFromParameters':
+		# Builds from parameters that already passed validate_parameters, subclasses override this to skip the checks
+		return cls.create_from_parameters(params)
+
+	@classmethod
+	def get_schema(cls) -> tuple[tuple[str, type], ...]:
+		if cls not in CreatableFromParameters.schemas:
+			CreatableFromParameters.schemas[cls] = tuple(cls.get_parameters())
+		return CreatableFromParameters.schemas[cls]
+
+	@classmethod
+	def validate_parameters(cls, params: dict[str, Any]) -> None:
+		for key, param_type in cls.get_schema():
+			if key not in params:
+				raise Exception(f"{cls.__name__}: Missing required parameter: {key}")
+			if not isinstance(params[key], param_type):
+				raise Exception(
+					f"{cls.__name__}: Invalid type for parameter '{key}': expected {param_type}, got {type(params[key])}"
+				)
+
+	@staticmethod
+	def register(category: str, type_name: str, creatable: type['CreatableFromParameters']) -> None:
+		CreatableFromParameters.registry.setdefault(category, {})[type_name] = creatable
+
+	@staticmethod
+	def get_registered_class(category: str, type_name: str) -> type['CreatableFromParameters']:
+		if type_name not in CreatableFromParameters.registry.get(category, {}):
+			raise Exception(f"Invalid {category} type: {type_name}")
+		return CreatableFromParameters.registry[category][type_name]
+
+	@staticmethod
+	def get_registered_types(category: str) -> list[str]:
+		return list(CreatableFromParameters.registry.get(category, {}).keys())
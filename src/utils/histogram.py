@@ -0,0 +1,44 @@
+from __future__	import annotations
+
+import numpy	as np
+from os			import getpid, replace
+from pathlib	import Path
+
+
+class Histogram(object):
+	# Fixed-width bins over [0, upper) for a number of series, values outside are dropped.
+	def __init__(self, n_series: int, bin_width: float, upper: float):
+		self.bin_width	: float			= bin_width
+		self.upper		: float			= upper
+		self.counts		: np.ndarray	= np.zeros((n_series, int(np.ceil(upper / bin_width))), dtype=np.int64)
+
+	def get_n_bins(self) -> int:
+		return self.counts.shape[1]
+	def get_bin_edges(self) -> np.ndarray:
+		return np.arange(self.get_n_bins() + 1) * self.bin_width
+	def get_bin_centers(self) -> np.ndarray:
+		return (np.arange(self.get_n_bins()) + 0.5) * self.bin_width
+
+	def add(self, series: np.ndarray, values: np.ndarray) -> None:
+		series = np.asarray(series, dtype=np.int64); values = np.asarray(values, dtype=np.float64)
+		inside = (values >= 0) & (values < self.upper)
+		bins = series[inside] * self.get_n_bins() + (values[inside] // self.bin_width).astype(np.int64)
+		self.counts += np.bincount(bins, minlength=self.counts.size).reshape(self.counts.shape)
+
+	def merge(self, other: Histogram) -> None:
+		if self.counts.shape != other.counts.shape or self.bin_width != other.bin_width or self.upper != other.upper:
+			raise Exception(f"{self.__class__.__name__}: Cannot merge histograms with different bins")
+		self.counts += other.counts
+
+	def save(self, path: Path) -> None:
+		path.parent.mkdir(parents=True, exist_ok=True)
+		with open(path.with_name(f".{path.name}.{getpid()}.tmp"), "wb") as fp:
+			np.savez_compressed(fp, **{"counts" : self.counts, "bin-width" : self.bin_width, "upper" : self.upper})
+		replace(path.with_name(f".{path.name}.{getpid()}.tmp"), path)
+
+	@staticmethod
+	def load(path: Path) -> 'Histogram':
+		with np.load(path, allow_pickle=False) as fp:
+			histogram = Histogram(fp["counts"].shape[0], float(fp["bin-width"]), float(fp["upper"]))
+			histogram.counts = fp["counts"]
+		return histogram
@@ -0,0 +1,38 @@
+from __future__	import annotations
+
+from concurrent.futures	import Future, ProcessPoolExecutor
+from traceback			import print_exception
+from typing				import Any, Callable, Optional
+
+
+class RenderQueue(object):
+	def __init__(self, n_workers: int = 2):
+		self.n_workers	: int							= n_workers
+		self.executor	: Optional[ProcessPoolExecutor]	= None
+		self.futures	: list[Future]					= []
+
+	def submit(self, function: Callable[..., Any], *args: Any) -> None:
+		if self.n_workers <= 0:
+			function(*args)
+			return
+		if self.executor == None:
+			self.executor = ProcessPoolExecutor(max_workers=self.n_workers)
+		self.futures += [self.executor.submit(function, *args)]
+
+	def wait(self) -> None:
+		failed = 0
+		for future in self.futures:
+			if future.exception() != None:
+				print(f"Render failed:")
+				print_exception(future.exception())
+				failed += 1
+		self.futures = []
+		if self.executor != None:
+			self.executor.shutdown()
+			self.executor = None
+		if failed > 0:
+			raise Exception(f"{self.__class__.__name__}: {failed} render(s) failed")
+
+	def __getstate__(self) -> dict[str, Any]:
+		# A copy sent to another process renders inline, that process is already off the critical path.
+		return {"n_workers" : 0, "executor" : None, "futures" : []}
@@ -0,0 +1,77 @@
+from __future__	import annotations
+
+import json
+from concurrent.futures	import Future, ProcessPoolExecutor
+from os					import getpid, replace
+from pathlib			import Path
+from threading			import BoundedSemaphore
+from traceback			import print_exception
+from typing				import Any, Callable, Optional
+
+
+def write_json_atomically(path: Path, data: Any, indent: Optional[int] = None) -> None:
+	# Readers of the directory never see a partial file, a failed write leaves the previous one in place
+	temp_path = path.with_name(f".{path.name}.{getpid()}.tmp")
+	try:
+		with open(temp_path, "w+") as fp:
+			json.dump(data, fp, indent=indent, separators=(',', ':') if indent == None else None)
+		replace(temp_path, path)
+	except BaseException:
+		temp_path.unlink(missing_ok=True)
+		raise
+
+
+class ResultWriter(object):
+	# Runs result writes in a process of their own, in submission order, so that serializing a finished
+	# training overlaps with the next one. At most max_pending writes are queued, submit blocks beyond that.
+	# The arguments are pickled after submit returns, so they must not be changed afterwards.
+	def __init__(self, max_pending: int = 2, inline: bool = False):
+		self.max_pending	: int							= max_pending
+		self.inline			: bool							= inline
+		self.executor		: Optional[ProcessPoolExecutor]	= None
+		self.slots			: BoundedSemaphore				= BoundedSemaphore(max_pending)
+		self.futures		: list[Future]					= []
+
+	def submit(self, function: Callable[..., Any], *args: Any) -> Optional[Future]:
+		# Returns None when the write already happened, its exceptions are raised here
+		if self.inline:
+			function(*args)
+			return None
+		if self.executor == None:
+			self.executor = ProcessPoolExecutor(max_workers=1)
+		self.slots.acquire()
+		try:
+			future = self.executor.submit(function, *args)
+		except BaseException:
+			self.slots.release()
+			raise
+		future.add_done_callback(lambda _: self.slots.release())
+		self.futures += [future]
+		return future
+
+	def flush(self) -> None:
+		failed = 0
+		for future in self.futures:
+			if future.exception() != None:
+				print(f"Result write failed:")
+				print_exception(future.exception())
+				failed += 1
+		self.futures = []
+		if failed > 0:
+			raise Exception(f"{self.__class__.__name__}: {failed} write(s) failed")
+
+	def close(self) -> None:
+		try:
+			self.flush()
+		finally:
+			if self.executor != None:
+				self.executor.shutdown()
+				self.executor = None
+
+	def __getstate__(self) -> dict[str, Any]:
+		# A copy sent to a task worker writes inline, its task must not finish before its results are on disk
+		return {"max_pending" : self.max_pending, "inline" : True, "executor" : None, "futures" : []}
+
+	def __setstate__(self, state: dict[str, Any]) -> None:
+		self.__dict__.update(state)
+		self.slots = BoundedSemaphore(self.max_pending)
@@ -0,0 +1,79 @@
+from __future__	import annotations
+
+import numpy						as np
+from multiprocessing				import resource_tracker
+from multiprocessing.shared_memory	import SharedMemory
+from typing							import Optional
+from weakref						import finalize
+
+
+# Segment name, then the dtype, shape and byte offset of every array
+type SharedArraysHandle = tuple[str, dict[str, tuple[str, tuple[int, ...], int]]]
+
+ALIGNMENT = 64
+
+
+def close_segment(segment: SharedMemory) -> None:
+	segment.close()
+
+
+class SharedArrays(object):
+	# Named arrays in one shared memory segment, so that recordings reach the parent process without
+	# being pickled. The worker creates and fills the segment, closes its own mapping and returns
+	# get_handle(). The parent attaches to the handle and owns the segment from then on: attaching
+	# unlinks the name, and the mapping is closed when the last array view of it is gone.
+	def __init__(self, segment: SharedMemory, layout: dict[str, tuple[str, tuple[int, ...], int]]):
+		self.segment	: Optional[SharedMemory]						= segment
+		self.layout		: dict[str, tuple[str, tuple[int, ...], int]]	= layout
+
+	def get_arrays(self) -> dict[str, np.ndarray]:
+		if self.segment == None:
+			raise Exception(f"{self.__class__.__name__}: get_arrays: Segment is closed")
+		return SharedArrays.get_views(np.frombuffer(self.segment.buf, dtype=np.uint8), self.layout)
+
+	def get_handle(self) -> SharedArraysHandle:
+		if self.segment == None:
+			raise Exception(f"{self.__class__.__name__}: get_handle: Segment is closed")
+		return self.segment.name, self.layout
+
+	def close(self) -> None:
+		# Views from get_arrays must be dropped first
+		if self.segment != None:
+			self.segment.close()
+			self.segment = None
+
+	@staticmethod
+	def get_views(buffer: np.ndarray, layout: dict[str, tuple[str, tuple[int, ...], int]]) -> dict[str, np.ndarray]:
+		return {
+			key : buffer[offset:offset + np.dtype(dtype).itemsize * int(np.prod(shape))].view(dtype).reshape(shape)
+			for key, (dtype, shape, offset) in layout.items()
+		}
+
+	@staticmethod
+	def create_from_arrays(arrays: dict[str, np.ndarray]) -> 'SharedArrays':
+		layout = {}
+		size = 0
+		for key, array in arrays.items():
+			layout[key] = (array.dtype.str, array.shape, size)
+			size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+		shared_arrays = SharedArrays(SharedMemory(create=True, size=max(size, 1)), layout)
+		for key, view in shared_arrays.get_arrays().items():
+			view[...] = arrays[key]
+		return shared_arrays
+
+	@staticmethod
+	def attach(handle: SharedArraysHandle) -> dict[str, np.ndarray]:
+		name, layout = handle
+		segment = SharedMemory(name=name)
+		segment.unlink()
+		buffer = np.frombuffer(segment.buf, dtype=np.uint8)
+		# Every view shares the memoryview numpy took of the segment, it goes away with the last of them
+		closer = finalize(buffer.base, close_segment, segment)
+		closer.atexit = False
+		return SharedArrays.get_views(buffer, layout)
+
+	@staticmethod
+	def ensure_tracker() -> None:
+		# Called by the parent before starting its workers, so they share its resource tracker. A worker
+		# with a tracker of its own would have the segments it created unlinked when it exits.
+		resource_tracker.ensure_running()
@@ -0,0 +1,130 @@
+from __future__	import annotations
+
+import json
+from concurrent.futures	import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from os					import replace
+from pathlib			import Path
+from traceback			import print_exception
+from typing				import Any, Callable, Optional
+
+
+class TaskGraph(object):
+	def __init__(self, state_path: Optional[Path] = None, key: str = ""):
+		self.state_path		: Optional[Path]										= state_path
+		self.key			: str													= key
+		self.tasks			: dict[str, tuple[Callable[..., Any], tuple[Any, ...]]]	= {}
+		self.dependencies	: dict[str, list[str]]									= {}
+		# Ready tasks of a higher priority start first
+		self.priorities		: dict[str, int]										= {}
+		self.done			: set[str]												= set()
+		self.failed			: set[str]												= set()
+
+		self.load_state()
+
+	def add_task(
+		self, task_id: str, function: Callable[..., Any], args: tuple[Any, ...] = (),
+		dependencies: list[str] = [], priority: int = 0
+	) -> None:
+		if task_id in self.tasks:
+			raise Exception(f"{self.__class__.__name__}: Duplicate task: {task_id}")
+		for dependency in dependencies:
+			if dependency not in self.tasks:
+				raise Exception(f"{self.__class__.__name__}: Unknown dependency of {task_id}: {dependency}")
+		self.tasks[task_id] = (function, args)
+		self.dependencies[task_id] = list(dependencies)
+		self.priorities[task_id] = priority
+
+	def load_state(self) -> None:
+		if self.state_path == None or not self.state_path.exists():
+			return
+		with open(self.state_path, "r") as fp:
+			state = json.load(fp)
+		if state["key"] == self.key:
+			self.done = set(state["done"])
+	def save_state(self) -> None:
+		if self.state_path == None:
+			return
+		self.state_path.parent.mkdir(parents=True, exist_ok=True)
+		with open(self.state_path.with_suffix(".tmp"), "w") as fp:
+			json.dump({"key" : self.key, "done" : sorted(self.done)}, fp, indent=2)
+		replace(self.state_path.with_suffix(".tmp"), self.state_path)
+	def reset_state(self) -> None:
+		self.done = set()
+		self.save_state()
+
+	def get_ready_tasks(self, pending: list[str]) -> list[str]:
+		ready = []
+		for task_id in pending:
+			if any(dependency in self.failed for dependency in self.dependencies[task_id]):
+				print(f"Skipping task {task_id}: a dependency failed")
+				self.failed.add(task_id)
+			elif all(dependency in self.done for dependency in self.dependencies[task_id]):
+				ready += [task_id]
+		return sorted(ready, key=lambda task_id: -self.priorities[task_id])
+
+	def is_unblocked_by(self, pending: list[str], running: list[str], priority: int) -> bool:
+		# Whether a pending task of a higher priority only waits on running tasks
+		return any(
+			self.priorities[task_id] > priority and
+			all(dependency in self.done or dependency in running for dependency in self.dependencies[task_id])
+			for task_id in pending
+		)
+
+	def finish_task(self, task_id: str, exception: Optional[BaseException]) -> None:
+		if exception != None:
+			print(f"Task {task_id} failed:")
+			print_exception(exception)
+			self.failed.add(task_id)
+		else:
+			self.done.add(task_id)
+			self.save_state()
+
+	def run(self, n_workers: int = 1) -> None:
+		pending = [task_id for task_id in self.tasks if task_id not in self.done]
+		if n_workers <= 1:
+			# A task may return a Future for work it left running in the background, it is only done,
+			# and its dependents only start, once that completes
+			writing : dict[Future, str] = {}
+			while pending or writing:
+				for future in [future for future in writing if future.done()]:
+					self.finish_task(writing.pop(future), future.exception())
+				ready = self.get_ready_tasks(pending)
+				# A write that unblocks a preferred task is waited for before another task starts
+				if ready and writing and self.is_unblocked_by(pending, list(writing.values()), self.priorities[ready[0]]):
+					ready = []
+				if ready:
+					pending.remove(ready[0])
+					function, args = self.tasks[ready[0]]
+					try:
+						result = function(*args)
+						if isinstance(result, Future):
+							writing[result] = ready[0]
+						else:
+							self.finish_task(ready[0], None)
+					except Exception as e:
+						self.finish_task(ready[0], e)
+				elif writing:
+					finished, _ = wait(writing, return_when=FIRST_COMPLETED)
+					for future in finished:
+						self.finish_task(writing.pop(future), future.exception())
+				else:
+					break
+				pending = [task_id for task_id in pending if task_id not in self.failed]
+		else:
+			running : dict[Future, str] = {}
+			with ProcessPoolExecutor(max_workers=n_workers) as executor:
+				while pending or running:
+					# Only keep n_workers tasks in flight so that newly unblocked tasks
+					# are not queued behind every independent task.
+					for task_id in self.get_ready_tasks(pending)[:n_workers - len(running)]:
+						pending.remove(task_id)
+						function, args = self.tasks[task_id]
+						running[executor.submit(function, *args)] = task_id
+					pending = [task_id for task_id in pending if task_id not in self.failed]
+					if not running:
+						break
+					finished, _ = wait(running, return_when=FIRST_COMPLETED)
+					for future in finished:
+						self.finish_task(running.pop(future), future.exception())
+		if self.failed:
+			raise Exception(f"{self.__class__.__name__}: {len(self.failed)} task(s) failed: {sorted(self.failed)}")
\ No newline at end of file
@@ -0,0 +1,32 @@
+from __future__	import annotations
+
+from math		import sqrt
+from statistics	import median
+
+
+FITNESS_AGGREGATIONS = ("mean", "median", "trimmed-mean")
+
+
+def get_variance(values: list[int] | list[float]) -> float:
+	if len(values) < 2:
+		return 0.0
+	mean = sum(values) / len(values)
+	return sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+
+def get_standard_error(values: list[int] | list[float]) -> float:
+	if len(values) < 2:
+		return float('inf')
+	return sqrt(get_variance(values) / len(values))
+
+def aggregate_trials(values: list[int] | list[float], aggregation: str = "mean", trim_fraction: float = 0.25) -> float:
+	if aggregation == "mean":
+		return sum(values) / len(values)
+	elif aggregation == "median":
+		return median(values)
+	elif aggregation == "trimmed-mean":
+		# Drops trim_fraction of the trials at each end, trim_fraction is below 0.5 so one always remains
+		n_trimmed = int(len(values) * trim_fraction)
+		kept = sorted(values)[n_trimmed:len(values) - n_trimmed]
+		return sum(kept) / len(kept)
+	else:
+		raise Exception(f"Invalid trial aggregation: {aggregation}")
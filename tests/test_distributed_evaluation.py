@@ -0,0 +1,122 @@
+import socket
+import unittest
+from threading	import Event, Thread
+from typing		import Any
+
+from src.training.distributed			import EvaluationServer, EvaluationWorker
+from src.training.distributed.protocol	import WORKER_ROLE, MessageChannel
+
+
+KEY = b"k" * 32
+
+
+def square(x: int) -> int:
+	if x < 0:
+		raise ValueError(f"Negative payload: {x}")
+	return x * x
+
+
+def take_task(server: EvaluationServer, name: str) -> tuple[socket.socket, tuple[Any, ...]]:
+	# Registers like a worker and waits for a task, which it never completes
+	connection = socket.create_connection(server.address)
+	channel = MessageChannel(connection, KEY, WORKER_ROLE)
+	channel.handshake()
+	channel.send(("register", name))
+	channel.receive()
+	channel.send(("ready",))
+	return connection, channel.receive()
+
+
+class TestDistributedEvaluation(unittest.TestCase):
+	def setUp(self):
+		self.server = EvaluationServer(KEY, heartbeat_timeout=0.5, worker_timeout=1.0)
+		self.server.start()
+		self.threads : list[Thread] = []
+
+	def tearDown(self):
+		self.server.stop()
+		for thread in self.threads:
+			thread.join(5.0)
+
+	def start_worker(self, name: str, key: bytes = KEY) -> EvaluationWorker:
+		worker = EvaluationWorker(key, *self.server.address, name=name, connect_timeout=5.0, evaluate=square)
+		self.threads += [Thread(target=worker.run, daemon=True)]
+		self.threads[-1].start()
+		return worker
+
+	def test_map_returns_results_in_order(self):
+		self.start_worker("a"); self.start_worker("b")
+		self.assertEqual(self.server.map([(i,) for i in range(40)]), [i * i for i in range(40)])
+		stats = self.server.get_stats()
+		self.assertEqual(sum(worker["completed"] for worker in stats), 40)
+		self.assertTrue(all(worker["bytes-sent"] > 0 for worker in stats if worker["completed"] > 0))
+
+	def test_task_of_a_killed_worker_is_requeued(self):
+		killed = Event()
+		def kill_mid_task() -> None:
+			connection, message = take_task(self.server, "killed")
+			self.assertEqual(message[0], "task")
+			connection.close()
+			killed.set()
+			self.start_worker("a")
+		self.threads += [Thread(target=kill_mid_task, daemon=True)]
+		self.threads[-1].start()
+		self.assertEqual(self.server.map([(i,) for i in range(4)]), [0, 1, 4, 9])
+		self.assertTrue(killed.is_set())
+		stats = {worker["name"] : worker for worker in self.server.get_stats()}
+		self.assertEqual(stats["killed"]["requeued"], 1)
+		self.assertFalse(stats["killed"]["connected"])
+
+	def test_task_without_heartbeats_is_requeued(self):
+		connections = []
+		def stall_mid_task() -> None:
+			connections.append(take_task(self.server, "stalled")[0])
+			self.start_worker("a")
+		self.threads += [Thread(target=stall_mid_task, daemon=True)]
+		self.threads[-1].start()
+		self.assertEqual(self.server.map([(i,) for i in range(4)]), [0, 1, 4, 9])
+		stats = {worker["name"] : worker for worker in self.server.get_stats()}
+		self.assertEqual(stats["stalled"]["requeued"], 1)
+		for connection in connections:
+			connection.close()
+
+	def test_worker_with_a_wrong_key_is_rejected(self):
+		worker = EvaluationWorker(b"x" * 32, *self.server.address, name="intruder", connect_timeout=5.0, evaluate=square)
+		with self.assertRaises(OSError):
+			worker.run()
+		self.assertEqual(self.server.get_stats(), [])
+
+	def test_raising_payload_is_reported(self):
+		self.start_worker("a")
+		with self.assertRaises(Exception) as context:
+			self.server.map([(1,), (-1,), (2,)])
+		self.assertIn("ValueError: Negative payload: -1", str(context.exception))
+		# The worker survives the failed task
+		self.assertEqual(self.server.map([(3,)]), [9])
+
+	def test_idle_workers_are_stopped_with_the_server(self):
+		worker = EvaluationWorker(KEY, *self.server.address, name="a", connect_timeout=5.0, evaluate=square)
+		errors = []
+		def run() -> None:
+			try:
+				worker.run()
+			except Exception as e:
+				errors.append(e)
+		thread = Thread(target=run, daemon=True)
+		thread.start()
+		self.assertEqual(self.server.map([(2,)]), [4])
+		self.server.stop()
+		# The process may exit once stop returns, so the worker must have been told to stop by then
+		self.assertFalse(any(handler.is_alive() for handler in self.server.handlers))
+		thread.join(5.0)
+		self.assertFalse(thread.is_alive())
+		self.assertEqual(errors, [])
+
+	def test_map_fails_without_workers(self):
+		with self.assertRaises(Exception) as context:
+			self.server.map([(1,)])
+		self.assertIn("No evaluation worker connected", str(context.exception))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,43 @@
+import json
+import unittest
+from pathlib	import Path
+from tempfile	import TemporaryDirectory
+
+from src.training.replay						import load_training_header_from_file
+from src.training.replay.json_training_header	import BULK_LAST_KEY, load_json_training_header, order_training_data
+
+
+DATA = {
+	"type"					: "neat-training",
+	"simulations"			: {"0" : {"0" : {"duration" : 12, "agents" : [], "food" : []}}},
+	"perception-nodes"		: ["angle-distance-perception-node"],
+	"brains"				: {"abc" : {"type" : "neat-brain"}},
+	"average-performance"	: 123.456789,
+	"max-performance"		: 1234567,
+	"run-key"				: "a \"quoted\" key, with a comma }"
+}
+HEADER = {key: val for key, val in DATA.items() if key not in ("simulations", "brains")}
+
+
+class TestJsonTrainingHeader(unittest.TestCase):
+	def test_header_stops_before_the_bulk(self):
+		with TemporaryDirectory() as directory:
+			path = Path(directory).joinpath("0.json")
+			with open(path, "w") as fp:
+				json.dump(order_training_data(DATA), fp, indent=1)
+			# Chunks of every size split keys, numbers and strings at every position
+			for chunk_size in range(1, 40):
+				self.assertEqual(load_json_training_header(path, chunk_size), HEADER | {BULK_LAST_KEY : True})
+			self.assertEqual(load_training_header_from_file(path), HEADER)
+
+	def test_members_after_the_bulk_need_a_full_parse(self):
+		with TemporaryDirectory() as directory:
+			path = Path(directory).joinpath("0.json")
+			with open(path, "w") as fp:
+				json.dump(DATA, fp)
+			self.assertEqual(load_json_training_header(path), None)
+			self.assertEqual(load_training_header_from_file(path), HEADER)
+
+
+if __name__ == "__main__":
+	unittest.main()
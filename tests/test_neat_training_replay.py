@@ -0,0 +1,77 @@
+import json
+import unittest
+from pathlib	import Path
+from tempfile	import TemporaryDirectory
+from typing		import Any
+
+from src.training								import create_training
+from src.training.replay						import NeatTrainingReplay, load_training_replay_from_data
+from src.training.replay.columnar_training_data	import load_columnar_training_data, save_columnar_training_data
+
+
+def run_training(overrides: dict[str, Any]) -> dict[str, Any]:
+	with open("saved_parameters/default_params.json", "r") as fp:
+		params = json.load(fp)["default-params"]
+	params |= {"n-generations" : 3, "n-agents" : 4, "max-time-steps" : 150, "eating-number" : 1} | overrides
+	training = create_training("neat-training", params)
+	training.quiet = True
+	training.start_training()
+	return training.to_dict() | {"duration" : 0.0, "average-performance" : 0.0, "max-performance" : 0}
+
+
+def get_series_per_generation(training_replay: NeatTrainingReplay) -> dict[str, list[float]]:
+	# The graph series as they were computed before they were vectorised, from every SimulationReplay
+	gens = [gen for _, gen in training_replay.simulations.items()]
+	return {
+		"fitness"	: [
+			sum([
+				sum([1 for food in sim.food if food["eaten"] and food["poisonous"] == False])
+				for sim in gen.values()
+			]) / len(gen.values())
+			for gen in gens
+		],
+		"nodes"		: [sum([sim.get_n_nodes() for sim in gen.values()]) / len(gen.values()) for gen in gens],
+		"duration"	: [sum([sim.duration for sim in gen.values()]) / len(gen.values()) for gen in gens],
+		"food"		: [
+			sum([
+				sum([
+					len([1 for food in sim.food if food["first-time-step"] <= i and food["last-time-step"] > i])
+					for sim in gen.values()
+				]) for gen in gens
+			]) / sum([len([1 for sim in gen.values() if sim.duration > i]) for gen in gens])
+			for i in range(max([max([sim.duration for sim in gen.values()]) for gen in gens]))
+		]
+	}
+
+
+class TestNeatTrainingReplayGraphs(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.results = [
+			run_training({"simulation-type" : "fixed-food-simulation"}),
+			run_training({
+				"simulation-type" : "poisonous-food-simulation", "poisonous-food-rate" : 0.4, "see-poisonous-food" : True
+			})
+		]
+
+	def assert_series_match(self, data: dict[str, Any]) -> None:
+		graphs = {graph["filename"] : graph["data"] for graph in load_training_replay_from_data(data).get_graphs_data()}
+		# Compared exactly, the vectorised series must reproduce the old ones bit for bit
+		self.assertEqual(graphs, get_series_per_generation(load_training_replay_from_data(data)))
+
+	def test_series_match_the_per_generation_loops(self):
+		for data in self.results:
+			with self.subTest(simulation_type=data["simulation-type"]):
+				self.assert_series_match(data)
+
+	def test_series_match_from_the_columnar_format(self):
+		with TemporaryDirectory() as directory:
+			for data in self.results:
+				path = Path(directory).joinpath(f"{data['simulation-type']}.npz")
+				save_columnar_training_data(data, path)
+				with self.subTest(simulation_type=data["simulation-type"]):
+					self.assert_series_match(load_columnar_training_data(path))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+import numpy	as np
+
+from src.training.replay.sound_analysis	import accumulate_sound_follow_distances
+
+
+def create_world(listener_positions: list[tuple[float, float]], listener_last_time_step: int) -> dict[str, np.ndarray]:
+	# Agent 0 stands still at the origin and sounds once at step 1, agent 1 listens
+	n_ticks = len(listener_positions)
+	positions = np.zeros((2, n_ticks, 2), dtype=np.float32)
+	positions[1] = listener_positions
+	return {
+		"agent-ids"				: np.array([0, 1], dtype=np.int32),
+		"agent-last-time-step"	: np.array([n_ticks - 1, listener_last_time_step], dtype=np.int32),
+		"agent-positions"		: positions,
+		"sound-time-steps"		: np.array([1], dtype=np.int32),
+		"sound-agent-ids"		: np.array([0], dtype=np.int32),
+		"sound-positions"		: np.zeros((1, 2), dtype=np.float32),
+		"sound-codes"			: np.array([[1]], dtype=np.int8)
+	}
+
+
+class TestAccumulateSoundFollowDistances(unittest.TestCase):
+	def test_lag_zero_is_the_position_after_the_emitting_step(self):
+		# A sound of step t is emitted from positions[:, t + 1], the listener moves 10 units per step
+		world = create_world([(10.0 * tick, 0.0) for tick in range(6)], 5)
+		numerators, denominators = accumulate_sound_follow_distances(world, 1, 3)
+		distances = numerators[1] / denominators[1]
+		np.testing.assert_allclose(distances, [20.0, 30.0, 40.0])
+
+	def test_dead_listeners_are_skipped_after_their_last_step(self):
+		# Dead at step 3, its last move is stored at index 3
+		world = create_world([(10.0 * tick, 0.0) for tick in range(6)], 3)
+		numerators, denominators = accumulate_sound_follow_distances(world, 1, 3)
+		np.testing.assert_array_equal(denominators[1] > 0, [True, True, False])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from concurrent.futures	import Future, ThreadPoolExecutor
+from pathlib			import Path
+from tempfile			import TemporaryDirectory
+from time				import sleep
+
+from src.utils.task_graph	import TaskGraph
+
+
+def record_start(path: str, task_id: str) -> None:
+	# Module level so that the process pool can pickle it
+	with open(path, "a") as fp:
+		fp.write(task_id + "\n")
+	sleep(0.2 if task_id.startswith("train/") else 0.0)
+
+
+def add_grid(task_graph: TaskGraph, function, args) -> None:
+	# Two cells of two repeats each, graphed per cell and then summarised, like TerminalApplication.create_task_graph
+	for cell in ["a", "b"]:
+		for id in range(2):
+			task_graph.add_task(f"train/{cell}/{id}", function, args(f"train/{cell}/{id}"))
+	for cell in ["a", "b"]:
+		task_graph.add_task(f"graphs/{cell}", function, args(f"graphs/{cell}"), [f"train/{cell}/0", f"train/{cell}/1"], 1)
+	task_graph.add_task("performance", function, args("performance"), ["graphs/a", "graphs/b"], 1)
+
+
+class TestTaskGraph(unittest.TestCase):
+	def test_serial_runs_a_cell_graph_before_the_next_training(self):
+		order = []
+		task_graph = TaskGraph()
+		add_grid(task_graph, order.append, lambda task_id: (task_id,))
+		task_graph.run()
+		self.assertEqual(order, [
+			"train/a/0", "train/a/1", "graphs/a", "train/b/0", "train/b/1", "graphs/b", "performance"
+		])
+
+	def test_serial_waits_for_the_write_that_unblocks_a_graph(self):
+		order = []
+		with ThreadPoolExecutor(max_workers=1) as writer:
+			def run(task_id: str) -> Future | None:
+				order.append(task_id)
+				# Trainings leave their results writing in the background
+				return writer.submit(sleep, 0.05) if task_id.startswith("train/") else None
+			task_graph = TaskGraph()
+			add_grid(task_graph, run, lambda task_id: (task_id,))
+			task_graph.run()
+		self.assertEqual(order.index("graphs/a"), 2)
+
+	def test_parallel_starts_a_cell_graph_before_the_remaining_trainings(self):
+		with TemporaryDirectory() as directory:
+			path = str(Path(directory).joinpath("order.txt"))
+			task_graph = TaskGraph()
+			add_grid(task_graph, record_start, lambda task_id: (path, task_id))
+			task_graph.run(2)
+			with open(path, "r") as fp:
+				order = fp.read().split()
+		self.assertLess(order.index("graphs/a"), order.index("train/b/1"))
+		self.assertEqual(order[-1], "performance")
+
+	def test_state_skips_done_tasks(self):
+		with TemporaryDirectory() as directory:
+			path = Path(directory).joinpath("state.json")
+			order = []
+			task_graph = TaskGraph(path, "key")
+			add_grid(task_graph, order.append, lambda task_id: (task_id,))
+			task_graph.run()
+			order.clear()
+			task_graph = TaskGraph(path, "key")
+			add_grid(task_graph, order.append, lambda task_id: (task_id,))
+			task_graph.run()
+		self.assertEqual(order, [])
+
+
+if __name__ == "__main__":
+	unittest.main()